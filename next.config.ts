@@ -1,4 +1,5 @@
 import type { NextConfig } from "next";
+import assetManifest from "./src/lib/asset-manifest.json";
 
 const securityHeaders = [
   {
@@ -53,7 +54,30 @@ const securityHeaders = [
   },
 ];
 
+// Content-hash names published by scripts/fingerprint-assets.py (name.<10 hex>.ext);
+// a changed asset gets a new name, so these never change in place
+const fingerprintedAsset = "[^/]+\\.[0-9a-f]{10}\\.\\w+";
+const fingerprintedAssetDirs = ["images", "videos", "videos/web"];
+
+// Logical names of fingerprinted assets are left out of the deploy
+// (.vercelignore, written by the same script); old links to them still resolve
+const assetRewrites = Object.entries(assetManifest as Record<string, string>).map(
+  ([source, destination]) => ({ source, destination })
+);
+
+const immutableHeaders = [
+  {
+    key: "Cache-Control",
+    value: "public, max-age=31536000, immutable",
+  },
+];
+
 const nextConfig: NextConfig = {
+  images: {
+    // next/image negotiates the format per request; AVIF first, then WebP
+    formats: ["image/avif", "image/webp"],
+  },
+  rewrites: async () => assetRewrites,
   headers: async () => {
     return [
       {
@@ -61,6 +85,10 @@ const nextConfig: NextConfig = {
         source: "/:path*",
         headers: securityHeaders,
       },
+      ...fingerprintedAssetDirs.map((dir) => ({
+        source: `/${dir}/:file(${fingerprintedAsset})`,
+        headers: immutableHeaders,
+      })),
     ];
   },
 };
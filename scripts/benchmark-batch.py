@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark the batch generation loops against the local Gemini/Veo stand-in.
+
+Runs the full IMAGES_TO_GENERATE and VIDEOS lists through the same functions
+generate-batch.py and generate-videos-batch.py use, with a FakeClient in
+place of the API, once per latency profile, concurrency level and number of
+API keys (more than one runs through a KeyPool, one stand-in per key). Nothing is
+billed and nothing under public/ is written: outputs, manifests, the journal
+and rate-limit state live in a temporary directory per run.
+
+Latencies, rate-limit refills and poll intervals are shrunk by --scale so an
+hour-long batch finishes in seconds. Reported times are scaled back up to API
+time, so runs at different scales stay comparable.
+
+Requirements:
+    pip install -U "google-genai>=1.44.0"
+
+Usage:
+    python scripts/benchmark-batch.py [--kinds images,videos] [--profiles typical,congested]
+                                      [--concurrency 1,4,8] [--keys 1,2] [--scale 0.01]
+                                      [--json out.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+import warnings
+from concurrent.futures import wait
+from pathlib import Path
+
+# Suppress urllib3 OpenSSL warning (doesn't affect functionality)
+warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")
+
+from pipeline.fake_genai import PROFILES, FakeClient
+from pipeline.journal import OperationJournal
+from pipeline.keypool import KeyPool
+from pipeline.manifest import Manifest
+from pipeline.polling import PollHistory, PollPolicy
+from pipeline.ratelimit import RateLimiter
+from pipeline.scripts import load_script
+
+KINDS = ("images", "videos")
+
+
+class TimedManifest(Manifest):
+    """Manifest that remembers when the first asset was recorded."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.first_recorded = None
+
+    def record(self, output_path, key):
+        if self.first_recorded is None:
+            self.first_recorded = time.monotonic()
+        return super().record(output_path, key)
+
+
+@contextlib.contextmanager
+def patched(module, **values):
+    """Temporarily override module-level constants (output dirs)."""
+    saved = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield module
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def run_images(client, limiter, workdir, concurrency, scale):
+    """Generate every image once. Returns (model, total, failed, manifest, started)."""
+    script = load_script("generate-batch")
+    output_dir = workdir / "images"
+    output_dir.mkdir()
+    manifest = TimedManifest(workdir / "images.json")
+    args = argparse.Namespace(
+        workers=concurrency, ref_max_side=None, context_cache=False, context_cache_ttl=1800,
+    )
+
+    with patched(script, IMAGES_DIR=output_dir):
+        jobs = [
+            (filename, aspect_ratio, prompt, script.image_key(aspect_ratio, prompt))
+            for filename, aspect_ratio, prompt in script.IMAGES_TO_GENERATE
+        ]
+        with script.image_session(client, args, jobs) as session:
+            request_pool, save_pool, contents_for, cached_content = session
+            started = time.monotonic()
+            results = script.start_images(
+                client, limiter, manifest, jobs, request_pool, save_pool,
+                contents_for, cached_content,
+            )
+            wait(results.values())
+
+    failed = [filename for filename, future in results.items() if future.exception()]
+    return script.MODEL, len(jobs), failed, manifest, started
+
+
+def run_videos(client, limiter, workdir, concurrency, scale):
+    """Generate every video once. Returns (model, total, failed, manifest, started)."""
+    script = load_script("generate-videos-batch")
+    output_dir = workdir / "videos"
+    output_dir.mkdir()
+    manifest = TimedManifest(workdir / "videos.json")
+    journal = OperationJournal(workdir / "operations.sqlite")
+    # Fresh history per run: every run starts from the default window
+    poller = PollPolicy(PollHistory(workdir / "polls.sqlite"), time_scale=scale)
+
+    with patched(script, VIDEOS_DIR=output_dir):
+        started = time.monotonic()
+        _, failed = script.run_batch(
+            client, limiter, manifest, list(script.VIDEOS),
+            max_in_flight=concurrency, journal=journal, poller=poller,
+        )
+    return script.MODEL, len(script.VIDEOS), failed, manifest, started
+
+
+RUNNERS = {"images": run_images, "videos": run_videos}
+
+
+def benchmark(kind, profile, concurrency, scale, seed, keys=1):
+    """One run; returns a result dict with times in API seconds."""
+    with tempfile.TemporaryDirectory(prefix="genai-bench-") as tmp:
+        limiter = RateLimiter(Path(tmp) / "ratelimit.sqlite", time_scale=scale)
+        if keys > 1:
+            client = limiter = KeyPool(
+                [f"fake-key-{n}" for n in range(keys)], limiter,
+                client_factory=lambda key: FakeClient(
+                    profile, time_scale=scale, seed=f"{seed}-{key}", api_key=key,
+                ),
+            )
+            clients = client.clients
+        else:
+            client = FakeClient(profile, time_scale=scale, seed=seed)
+            clients = [client]
+
+        # The batch loops narrate every job; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, total, failed, manifest, start = RUNNERS[kind](
+                client, limiter, Path(tmp), concurrency, scale
+            )
+        # Timed from the first request: one-off setup (reading references,
+        # hashing) does not shrink with --scale and would be inflated by it
+        elapsed = time.monotonic() - start
+
+    counts = {}
+    for _, event, event_model in (event for c in clients for event in c.events):
+        if event_model in (None, model):
+            counts[event] = counts.get(event, 0) + 1
+
+    wall = elapsed / scale
+    first = manifest.first_recorded
+    return {
+        "kind": kind,
+        "profile": profile,
+        "concurrency": concurrency,
+        "keys": keys,
+        "assets": total - len(failed),
+        "failed": len(failed),
+        "wall_seconds": round(wall, 1),
+        "requests": counts.get("request", 0),
+        "requests_per_minute": round(counts.get("request", 0) / (wall / 60), 2) if wall else 0.0,
+        "first_asset_seconds": round((first - start) / scale, 1) if first else None,
+        "rate_limited": counts.get("rate_limited", 0),
+        "server_errors": counts.get("server_error", 0),
+        "polls": counts.get("poll", 0),
+        "real_seconds": round(elapsed, 2),
+    }
+
+
+def print_table(results, scale):
+    print(f"\n{'='*101}")
+    print(f"BENCHMARK (times in API seconds, run at scale {scale})")
+    print(f"{'kind':<7} {'profile':<10} {'conc':>4} {'keys':>4} {'wall':>8} {'req/min':>8} "
+          f"{'first':>8} {'ok':>4} {'failed':>6} {'429':>4} {'5xx':>4} {'polls':>6} {'real':>7}")
+    print("-" * 101)
+    for r in results:
+        first = f"{r['first_asset_seconds']:.1f}" if r["first_asset_seconds"] is not None else "-"
+        print(f"{r['kind']:<7} {r['profile']:<10} {r['concurrency']:>4} {r['keys']:>4} "
+              f"{r['wall_seconds']:>8.1f} "
+              f"{r['requests_per_minute']:>8.2f} {first:>8} {r['assets']:>4} {r['failed']:>6} "
+              f"{r['rate_limited']:>4} {r['server_errors']:>4} {r['polls']:>6} "
+              f"{r['real_seconds']:>6.2f}s")
+    print(f"{'='*101}")
+
+
+def csv_list(value):
+    return [item for item in value.split(",") if item]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the batch scripts against a local stand-in.")
+    parser.add_argument("--kinds", type=csv_list, default=list(KINDS),
+                        help=f"Comma-separated batches to run (default: {','.join(KINDS)})")
+    parser.add_argument("--profiles", type=csv_list, default=["typical", "congested"],
+                        help=f"Comma-separated latency profiles: {', '.join(PROFILES)} "
+                             f"(default: typical,congested)")
+    parser.add_argument("--concurrency", type=csv_list, default=["1", "4", "8"],
+                        help="Comma-separated workers / max in flight (default: 1,4,8)")
+    parser.add_argument("--keys", type=csv_list, default=["1"],
+                        help="Comma-separated numbers of API keys to spread the load over (default: 1)")
+    parser.add_argument("--scale", type=float, default=0.01,
+                        help="Multiplier applied to every latency and delay (default: 0.01)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the stand-in")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    unknown = [k for k in args.kinds if k not in KINDS] + [p for p in args.profiles if p not in PROFILES]
+    if unknown:
+        print(f"Error: Unknown kind/profile: {', '.join(unknown)}")
+        return 1
+
+    results = []
+    for kind in args.kinds:
+        for profile in args.profiles:
+            for concurrency in args.concurrency:
+                for keys in args.keys:
+                    print(f"Running {kind} / {profile} / concurrency {concurrency} / {keys} keys...")
+                    results.append(benchmark(
+                        kind, profile, int(concurrency), args.scale, args.seed, int(keys),
+                    ))
+
+    print_table(results, args.scale)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Find the assets in public/images and public/videos that the site never uses.
+
+Indexes every /images/... and /videos/... reference in the TypeScript and
+TSX under src/ (tests excepted), cross-references it with the files on disk and the
+specs in IMAGES_TO_GENERATE and VIDEOS (see pipeline/usage.py), and reports:
+
+- orphaned files: not referenced, not generated, not a generation input;
+- unused specs: generated assets nothing references (drop the spec to stop
+  regenerating them);
+- missing files: references that match nothing on disk.
+
+With --prune PATH... the listed orphaned files are deleted; paths that are
+not orphaned are refused. Nothing is deleted without an explicit list, as
+docs and one-off scripts may use files the site does not. Rerun
+transcode-videos.py and fingerprint-assets.py afterwards to drop their
+derived files.
+
+Usage:
+    python scripts/check-asset-usage.py [--json PATH]
+    python scripts/check-asset-usage.py --prune /images/old-a.png /images/old-b.png
+"""
+
+import argparse
+import json
+
+from pipeline.output import write_atomic
+from pipeline.scripts import load_script
+from pipeline.usage import (
+    prune, scan_sources, site_assets, spec_inputs, spec_outputs, usage_report,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find assets the site never uses.")
+    parser.add_argument("--prune", nargs="+", default=[], metavar="PATH",
+                        help="Delete these orphaned files (public paths, e.g. /images/old.png)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="Also write the reference index and report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    images = load_script("generate-batch")
+    videos = load_script("generate-videos-batch")
+    video = load_script("generate-video")
+
+    index = scan_sources()
+    assets = site_assets()
+    outputs = spec_outputs(images.IMAGES_TO_GENERATE, videos.VIDEOS)
+    inputs = spec_inputs(
+        (images.INPUT_BUS_IMAGE, images.INPUT_LOGO_IMAGE,
+         video.REFERENCE_BUS, video.REFERENCE_LOGO, video.START_FRAME),
+        videos.VIDEOS,
+    )
+    report = usage_report(index, assets, outputs, inputs)
+
+    print(f"Indexed {sum(map(len, index.values()))} references to {len(index)} paths; "
+          f"{len(set(assets) & set(report['referenced']))} of {len(assets)} assets are referenced")
+    if report["missing"]:
+        print("\nReferenced but missing:")
+        for reference, locations in sorted(report["missing"].items()):
+            note = ", not generated yet" if reference in outputs else ""
+            print(f"  ✗ {reference} ({', '.join(locations)}{note})")
+    if report["unused_specs"]:
+        print("\nGenerated but never referenced (drop the spec to stop regenerating it):")
+        for path in report["unused_specs"]:
+            print(f"  - {path} ({outputs[path]} spec)")
+    if report["orphaned"]:
+        print("\nOrphaned (not referenced, not generated):")
+        for path in report["orphaned"]:
+            print(f"  - {path}")
+
+    refused = [path for path in args.prune if path not in report["orphaned"]]
+    for path in refused:
+        print(f"  Not pruning {path}: it is not orphaned")
+    removed = prune([path for path in args.prune if path in report["orphaned"]])
+    if args.json_path:
+        data = json.dumps({"index": index, **report, "pruned": removed}, indent=2, sort_keys=True)
+        write_atomic(args.json_path, (data + "\n").encode())
+
+    print(f"\n{'='*50}")
+    print(f"Orphaned: {len(report['orphaned'])}, unused specs: {len(report['unused_specs'])}, "
+          f"missing: {len(report['missing'])}")
+    if removed:
+        print(f"Pruned: {', '.join(removed)}")
+    problems = len(report["orphaned"]) - len(removed) + len(report["unused_specs"])
+    return 0 if not (problems or report["missing"] or refused) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
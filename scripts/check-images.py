@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Score the generated images in public/images against the brand.
+
+Runs the same checks as generate-batch.py --qa (cream background, Van Blue
+share, palette drift, similarity to hero-bus-front.png; see pipeline/qa.py)
+over the images listed in IMAGES_TO_GENERATE and reports the ones that
+fail, without regenerating anything.
+
+Requirements:
+    pip install -U "Pillow>=11.3" numpy
+
+Usage:
+    python scripts/check-images.py [image.png ...]
+"""
+
+import argparse
+
+from pipeline.paths import IMAGES_DIR
+from pipeline.qa import ImageQA
+from pipeline.scripts import load_script
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score generated images against the brand.")
+    parser.add_argument("images", nargs="*", help="Image filenames to check (default: all)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    specs = load_script("generate-batch").IMAGES_TO_GENERATE
+    prompts = {filename: prompt for filename, _, prompt in specs}
+    unknown = [name for name in args.images if name not in prompts]
+    if unknown:
+        print(f"Error: Not in IMAGES_TO_GENERATE: {', '.join(unknown)}")
+        return 1
+
+    qa = ImageQA()
+    names = [name for name in args.images or prompts if (IMAGES_DIR / name).exists()]
+    failed = []
+    for name in names:
+        report = qa.score((IMAGES_DIR / name).read_bytes(), prompts[name])
+        mark = "✓" if report.passed else "✗"
+        print(f"  {mark} {name}: score {report.score:.2f} ({report})")
+        if not report.passed:
+            failed.append(name)
+
+    print(f"\n{'='*50}")
+    print(f"Passed: {len(names) - len(failed)}/{len(names)}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
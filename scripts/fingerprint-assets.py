@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Publish public/images and public/videos under content-hash fingerprinted names.
+
+Every asset (including the web renditions of the videos) gets a second
+name carrying a prefix of its SHA-256, e.g. hero-bus-front.3f9a1c2b4d.png,
+and src/lib/asset-manifest.json maps each logical path to it for the site
+to resolve (see pipeline/fingerprint.py). The logical names are listed in
+.vercelignore so only the fingerprinted copies are deployed. Fingerprinted
+names that are no longer current are removed once they have been retired
+for --retention-days.
+
+Run it last, after quantize-images.py and transcode-videos.py.
+
+Usage:
+    python scripts/fingerprint-assets.py [--retention-days N]
+"""
+
+import argparse
+
+from pipeline.fingerprint import RETENTION, fingerprint_all
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Publish assets under fingerprinted names.")
+    parser.add_argument("--retention-days", type=float, default=RETENTION / 86400,
+                        help="Keep superseded fingerprinted files this long "
+                             f"(default: {RETENTION / 86400:.0f})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("Fingerprinting assets...")
+    published, unchanged, removed = fingerprint_all(retention=args.retention_days * 86400)
+
+    print(f"\n{'='*50}")
+    print(f"Published: {len(published)}, unchanged: {len(unchanged)}, "
+          f"retired and removed: {len(removed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
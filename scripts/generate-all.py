@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Generate images and videos for The AI Struggle Bus as one dependency graph.
+
+Videos whose start frame is an image from IMAGES_TO_GENERATE are linked to
+that image job: each video is submitted the moment its start frame has been
+saved, while the remaining images are still generating. Videos that do not
+depend on a pending image start straight away. When an image is regenerated,
+every video that uses it as a start frame is regenerated too.
+
+Usage:
+    python scripts/generate-all.py [--workers N] [--max-in-flight N] [--queue PATH]
+    python scripts/generate-all.py --quantize --transcode --fingerprint
+    python scripts/generate-all.py --plan
+"""
+
+import argparse
+import os
+import warnings
+from concurrent.futures import wait
+
+# Suppress urllib3 OpenSSL warning (doesn't affect functionality)
+warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")
+
+from pipeline.client import api_keys, connect
+from pipeline.fingerprint import add_fingerprint_argument
+from pipeline.journal import OperationJournal
+from pipeline.manifest import IMAGES_MANIFEST, VIDEOS_MANIFEST, Manifest
+from pipeline.metrics import start_run
+from pipeline.output import clean_partial
+from pipeline.paths import IMAGES_DIR, VIDEOS_DIR
+from pipeline.ratelimit import RateLimiter
+from pipeline.scripts import load_script
+from pipeline.stages import run_stages
+from pipeline.workqueue import JobFailed, JobTaken, add_queue_argument, open_queue
+
+# Loading the batch scripts also loads .env.local
+images = load_script("generate-batch")
+videos = load_script("generate-videos-batch")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate images and videos as one job graph.")
+    images.add_image_arguments(parser, short_flags=False)
+    videos.add_video_arguments(parser, short_flags=False)
+    add_queue_argument(parser)
+    add_fingerprint_argument(parser)
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Only print what would be generated and why, then exit",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not images.INPUT_BUS_IMAGE.exists() or not images.INPUT_LOGO_IMAGE.exists():
+        print("Error: Input images not found")
+        return 1
+
+    # Plan before touching the SDK: an up-to-date run never imports it
+    image_manifest = Manifest(IMAGES_MANIFEST)
+    video_manifest = Manifest(VIDEOS_MANIFEST)
+    print("Images:")
+    pending_images, images_ok = images.plan_images(image_manifest, args.ref_max_side, dry_run=args.plan)
+    regenerating = {filename for filename, *_ in pending_images}
+    print("\nVideos:")
+    pending_videos, videos_ok = videos.plan_videos(video_manifest, regenerating, dry_run=args.plan)
+
+    if args.plan:
+        print(f"\nPlan: {len(pending_images)} images and {len(pending_videos)} videos to generate")
+        return 0
+    if not (pending_images or pending_videos):
+        print(f"\nAll {images_ok} images and {videos_ok} videos up to date")
+        return 0 if not run_stages(args.quantize, args.transcode, args.fingerprint) else 1
+
+    keys = api_keys()
+    if not keys:
+        print("Error: Please set GEMINI_API_KEY (or GEMINI_API_KEYS for several projects)")
+        return 1
+    try:
+        video_qa = videos.video_qa(args)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+
+    client, limiter = connect(keys, RateLimiter())
+    journal = OperationJournal()
+    journal.prune()
+    metrics = start_run("generate-all")
+    work_queue = open_queue(args.queue)
+
+    VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
+    clean_partial(IMAGES_DIR)
+    clean_partial(VIDEOS_DIR)
+
+    waiting = [v["name"] for v in pending_videos if v.get("start_frame") in regenerating]
+    print(f"\nGenerating {len(pending_images)} images and {len(pending_videos)} videos "
+          f"({len(waiting)} waiting on a start frame)...")
+
+    image_failed = []
+    image_taken = []
+
+    def report_image(future, filename):
+        try:
+            output_path = future.result()
+        except JobFailed as e:
+            print(f"  ✗ {filename}: {e}")
+            image_failed.append(filename)
+        except JobTaken as e:
+            print(f"  - {filename}: {e}")
+            image_taken.append(filename)
+        except Exception as e:
+            print(f"  ✗ {filename}: {e}")
+            image_failed.append(filename)
+        else:
+            print(f"  ✓ Saved: {output_path}")
+
+    with images.image_session(client, args, pending_images) as session:
+        request_pool, save_pool, contents_for, cached_content = session
+        image_results = images.start_images(
+            client, limiter, image_manifest, pending_images, request_pool, save_pool,
+            contents_for, cached_content, metrics, work_queue,
+            qa=images.image_qa(args), candidates=args.candidates,
+        )
+        for filename, future in image_results.items():
+            future.add_done_callback(lambda f, filename=filename: report_image(f, filename))
+
+        # Each video waits only on its own start frame
+        dependencies = {
+            v["name"]: image_results[v["start_frame"]]
+            for v in pending_videos if v.get("start_frame") in image_results
+        }
+        video_success, video_failed = videos.run_batch(
+            client, limiter, video_manifest, pending_videos,
+            max_in_flight=max(1, args.max_in_flight), dependencies=dependencies, journal=journal, metrics=metrics,
+            work_queue=work_queue, download_workers=max(1, args.download_workers), qa=video_qa,
+        )
+        wait(image_results.values())
+    if work_queue is not None:
+        work_queue.close()
+    stage_failed = run_stages(args.quantize, args.transcode, args.fingerprint)
+
+    print(f"\n{'='*60}")
+    print(f"ALL COMPLETE")
+    print(f"  Images: {len(pending_images) - len(image_failed) - len(image_taken)} generated, "
+          f"{images_ok} up to date, {len(image_failed)} failed")
+    if image_taken:
+        print(f"  Left to other workers: {len(image_taken)} images")
+    print(f"  Videos: {video_success} generated, {videos_ok} up to date, "
+          f"{len(video_failed)} failed")
+    failed = image_failed + video_failed + stage_failed
+    if failed:
+        print(f"  Failed: {', '.join(failed)}")
+    if video_qa is not None and video_qa.flagged:
+        print(f"  Flagged by QA: {', '.join(sorted(video_qa.flagged))}")
+    print(f"{'='*60}")
+    metrics.close()
+
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,19 +1,66 @@
 #!/usr/bin/env python3
 """
 Batch generate images for The AI Struggle Bus website.
+
+With --batch-api every pending image is packed into one asynchronous Gemini
+Batch API job (half the price, results usually within the hour). The job is
+polled until it finishes, each result is matched back to its file, and
+failed entries are retried in a follow-up batch under the same policies as
+synchronous requests. Submitted batches are journaled so an interrupted run
+picks the same batch up again instead of paying for it twice.
+
+Several copies (on one machine or many) can share the work through a job
+queue on shared storage; each image is claimed by exactly one of them.
+
+With --qa every image is scored against the brand before it is saved
+(pipeline/qa.py) and regenerated if it fails; --candidates N requests N
+images per job at once and keeps the best-scoring one.
+
+Usage:
+    python scripts/generate-batch.py [--workers N] [--context-cache] [--quantize]
+    python scripts/generate-batch.py --quantize --fingerprint
+    python scripts/generate-batch.py --qa --candidates 2
+    python scripts/generate-batch.py --batch-api
+    python scripts/generate-batch.py --queue /shared/genai-queue.sqlite
+    python scripts/generate-batch.py --plan
 """
 
+import argparse
 import os
+import threading
+import time
 import warnings
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 
 # Suppress urllib3 OpenSSL warning (doesn't affect functionality)
 warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")
 
-from google import genai
-from google.genai import types
-from PIL import Image
-import time
+from pipeline.client import api_keys, connect
+from pipeline.context_cache import SharedContext, shared_lines, strip_lines
+from pipeline.errors import (
+    FATAL,
+    POLICIES,
+    RETRYABLE,
+    BatchEntryError,
+    EmptyResponseError,
+    GenerationError,
+    call_with_retries,
+    check_batch_response,
+    check_image_response,
+    classify,
+    describe,
+)
+from pipeline.fingerprint import add_fingerprint_argument
+from pipeline.journal import DONE, EXPIRED, SAVED, OperationJournal
+from pipeline.manifest import FRESH, IMAGES_MANIFEST, STALE, UNTRACKED, Manifest, job_key
+from pipeline.metrics import JobMetrics, RunMetrics, start_run
+from pipeline.output import clean_partial, save_image_part
+from pipeline.ratelimit import RateLimiter
+from pipeline.references import load_reference
+from pipeline.stages import run_stages
+from pipeline.workqueue import JobFailed, JobTaken, add_queue_argument, open_queue
 
 # Load environment variables from .env.local
 SCRIPT_DIR = Path(__file__).parent
@@ -32,6 +79,18 @@ IMAGES_DIR = PROJECT_ROOT / "public" / "images"
 INPUT_BUS_IMAGE = IMAGES_DIR / "hero-bus-front.png"
 INPUT_LOGO_IMAGE = IMAGES_DIR / "logo.png"
 
+MODEL = "gemini-2.5-flash-image"
+
+# Image requests kept in flight at once (override with --workers or IMAGE_WORKERS)
+DEFAULT_WORKERS = 4
+
+# Batch API (--batch-api): seconds between status checks, and how long a
+# batch may take before it is cancelled (the API's own limit is 24 hours)
+BATCH_POLL_INTERVAL = 30
+BATCH_DEADLINE = 24 * 3600
+BATCH_SUCCEEDED = {"JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"}
+BATCH_FINISHED = BATCH_SUCCEEDED | {"JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
 # Image definitions: (filename, aspect_ratio, prompt)
 IMAGES_TO_GENERATE = [
     # Solutions Page
@@ -389,69 +448,666 @@ Requirements:
 ]
 
 
-def main():
-    api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        print("Error: Please set GEMINI_API_KEY environment variable")
-        return 1
+def image_key(aspect_ratio, prompt, ref_max_side=None):
+    """Cache key over everything that shapes a generated image."""
+    inputs = {"model": MODEL, "prompt": prompt, "aspect_ratio": aspect_ratio}
+    if ref_max_side:
+        inputs["reference_max_side"] = ref_max_side
+    return job_key(inputs, {"bus": INPUT_BUS_IMAGE, "logo": INPUT_LOGO_IMAGE})
+
+
+def generate_image(client, contents, aspect_ratio, cached_content=None):
+    """Request a single image and return its first image part.
+
+    Raises EmptyResponseError / ContentFilteredError when there is none.
+    """
+    from google.genai import types
+
+    response = client.models.generate_content(
+        model=MODEL,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            response_modalities=["Image"],
+            image_config=types.ImageConfig(aspect_ratio=aspect_ratio),
+            cached_content=cached_content,
+        )
+    )
+
+    return check_image_response(response)
+
+
+def generate_candidates(client, limiter, contents, aspect_ratio, cached_content, count, qa,
+                        filename, prompt):
+    """Request ``count`` images at once and return the best-scoring part and its QAReport.
+
+    The caller has already waited for the rate limiter once; the first
+    candidate uses that slot (and, with a KeyPool, the caller's key), each
+    further candidate waits for its own. Raises the first error if no
+    candidate came back.
+    """
+    pinned = limiter.pinned() if hasattr(limiter, "pinned") else None
+
+    def candidate(index):
+        if index:
+            limiter.acquire(MODEL)
+        elif pinned is not None:
+            limiter.pin(pinned)
+        return generate_image(client, contents, aspect_ratio, cached_content)
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(candidate, index) for index in range(count)]
+    parts, errors = [], []
+    for future in futures:
+        try:
+            parts.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    if not parts:
+        raise errors[0]
+
+    reports = [qa.score(part.inline_data.data, prompt) for part in parts]
+    best = max(range(len(parts)), key=lambda i: (reports[i].passed, reports[i].score))
+    passed = sum(report.passed for report in reports)
+    print(f"    {filename}: {passed}/{len(parts)} candidates passed QA, "
+          f"keeping the best (score {reports[best].score:.2f})")
+    return parts[best], reports[best]
+
+
+def request_image(client, limiter, filename, contents, aspect_ratio, cached_content=None,
+                  timing=None, stop=None, qa=None, prompt="", candidates=1):
+    """Worker: generate one image under the shared retry policies.
+
+    Returns the image part or raises GenerationError. Jobs that start after
+    ``stop`` is set (a fatal error elsewhere in the batch) give up at once.
+    With ``qa`` an image that fails the brand checks for ``prompt`` is
+    regenerated (the REJECTED policy); ``candidates`` > 1 requests that many
+    per attempt and keeps the best.
+    """
+    if stop is not None and stop.is_set():
+        raise GenerationError("Skipped after a fatal error", FATAL)
+    timing = timing or JobMetrics(filename, MODEL, aspect_ratio)
+
+    def attempt():
+        started = time.monotonic()
+        report = None
+        if qa is not None and candidates > 1:
+            part, report = generate_candidates(
+                client, limiter, contents, aspect_ratio, cached_content, candidates, qa,
+                filename, prompt,
+            )
+        else:
+            part = generate_image(client, contents, aspect_ratio, cached_content)
+        timing.generation_time = time.monotonic() - started
+        if qa is not None:
+            qa.check(filename, part.inline_data.data, prompt, report=report)
+        return part
 
-    if not INPUT_BUS_IMAGE.exists() or not INPUT_LOGO_IMAGE.exists():
-        print("Error: Input images not found")
-        return 1
+    return call_with_retries(attempt, limiter, MODEL, filename, timing=timing)
 
-    print("Loading reference images...")
-    bus_image = Image.open(INPUT_BUS_IMAGE)
-    logo_image = Image.open(INPUT_LOGO_IMAGE)
 
-    client = genai.Client(api_key=api_key)
+def plan_images(manifest, ref_max_side=None, dry_run=False):
+    """Decide which images need generating, printing why for each.
 
+    Needs only stat calls and file hashes. With ``dry_run`` nothing is
+    written (pre-manifest files are reported, not adopted). Returns
+    (pending, up_to_date) where pending is a list of
+    (filename, aspect_ratio, prompt, key) tuples.
+    """
     total = len(IMAGES_TO_GENERATE)
-    success = 0
-    failed = []
+    pending = []
+    up_to_date = 0
 
     for i, (filename, aspect_ratio, prompt) in enumerate(IMAGES_TO_GENERATE, 1):
         output_path = IMAGES_DIR / filename
+        key = image_key(aspect_ratio, prompt, ref_max_side)
+        status = manifest.status(output_path, key)
 
-        # Skip if already exists
-        if output_path.exists():
-            print(f"[{i}/{total}] Skipping {filename} (already exists)")
-            success += 1
+        # Skip if generated from the current prompt and references
+        if status == FRESH:
+            print(f"[{i}/{total}] Skipping {filename} (up to date)")
+            up_to_date += 1
             continue
+        if status == UNTRACKED:
+            # Pre-manifest asset: assume it matches the current spec
+            if dry_run:
+                print(f"[{i}/{total}] Skipping {filename} (already exists, would be tracked)")
+            else:
+                manifest.record(output_path, key)
+                print(f"[{i}/{total}] Skipping {filename} (already exists, now tracked)")
+            up_to_date += 1
+            continue
+        if status == STALE:
+            action = "would regenerate" if dry_run else "regenerating"
+            print(f"[{i}/{total}] {filename} inputs changed, {action}")
+        else:
+            action = "would generate" if dry_run else "generating"
+            print(f"[{i}/{total}] {filename} missing, {action}")
+
+        pending.append((filename, aspect_ratio, prompt, key))
+
+    return pending, up_to_date
+
+
+def save_image(part, path, timing):
+    """Saver: write one image part, recording how long it took."""
+    with timing.timed("download_time"):
+        return save_image_part(part, path)
+
+
+def start_images(client, limiter, manifest, jobs, request_pool, save_pool, contents_for,
+                 cached_content=None, metrics=None, work_queue=None, qa=None, candidates=1):
+    """Submit image jobs and return {filename: Future} for each saved path.
+
+    Requests run on ``request_pool``; each response is handed to ``save_pool``
+    so request slots free up immediately. A future fails with GenerationError
+    (or the save error) if the image could not be produced; after a fatal
+    error the jobs that have not started yet fail without a request. Each
+    job's timings are recorded in ``metrics``. With a ``work_queue`` each job
+    is claimed just before its first request; jobs another worker owns fail
+    with JobTaken (JobFailed if the queue gave up on them). ``qa`` and
+    ``candidates`` are passed to ``request_image``.
+    """
+    metrics = metrics or RunMetrics("generate-batch")
+    stop = threading.Event()
+    results = {}
+
+    for filename, aspect_ratio, prompt, key in jobs:
+        result = Future()
+        results[filename] = result
+        timing = metrics.job(filename, MODEL, aspect_ratio)
+
+        def request(filename=filename, aspect_ratio=aspect_ratio, prompt=prompt, key=key,
+                    timing=timing):
+            if work_queue is not None and not stop.is_set():
+                work_queue.claim("image", filename, key, IMAGES_DIR / filename)
+            return request_image(
+                client, limiter, filename, contents_for(prompt), aspect_ratio, cached_content,
+                timing=timing, stop=stop, qa=qa, prompt=prompt, candidates=candidates,
+            )
 
-        print(f"\n[{i}/{total}] Generating {filename} ({aspect_ratio})...")
-
+        def on_saved(save_future, result=result, filename=filename, key=key, timing=timing):
+            try:
+                output_path = save_future.result()
+            except Exception as e:
+                if work_queue is not None:
+                    work_queue.release("image", filename)
+                metrics.finish(timing, "failed")
+                result.set_exception(e)
+                return
+            manifest.record(output_path, key)
+            if work_queue is not None:
+                work_queue.complete("image", filename)
+            metrics.finish(timing, "ok", output_path)
+            result.set_result(output_path)
+
+        def on_response(request_future, result=result, filename=filename, timing=timing,
+                        on_saved=on_saved):
+            try:
+                part = request_future.result()
+            except JobTaken as e:
+                result.set_exception(e)
+                return
+            except GenerationError as e:
+                if e.kind == FATAL:
+                    stop.set()
+                if work_queue is not None:
+                    work_queue.release("image", filename)
+                metrics.finish(timing, e.kind)
+                result.set_exception(e)
+                return
+            save_pool.submit(
+                save_image, part, IMAGES_DIR / filename, timing
+            ).add_done_callback(on_saved)
+
+        request_pool.submit(request).add_done_callback(on_response)
+
+    return results
+
+
+def batch_requests(client, jobs, ref_max_side=None):
+    """One inlined Batch API request per job, tagged with its filename.
+
+    The references are uploaded once through the Files API: inlined, the
+    pair would be sent with every entry and push the batch over its 20 MB
+    request limit.
+    """
+    from google.genai import types
+
+    references = [
+        load_reference(INPUT_BUS_IMAGE, ref_max_side).as_uploaded_part(client),
+        load_reference(INPUT_LOGO_IMAGE, ref_max_side).as_uploaded_part(client),
+    ]
+    return [
+        types.InlinedRequest(
+            model=MODEL,
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt), *references])],
+            metadata={"filename": filename},
+            config=types.GenerateContentConfig(
+                response_modalities=["Image"],
+                image_config=types.ImageConfig(aspect_ratio=aspect_ratio),
+            ),
+        )
+        for filename, aspect_ratio, prompt, _ in jobs
+    ]
+
+
+def batch_entries(batch, jobs):
+    """{filename: inlined response} for a finished batch.
+
+    Entries are matched by the filename in their metadata; responses without
+    one fall back to request order, which the API preserves.
+    """
+    responses = list(getattr(batch.dest, "inlined_responses", None) or [])
+    entries = {}
+    for index, response in enumerate(responses):
+        filename = (response.metadata or {}).get("filename")
+        if filename is None and index < len(jobs):
+            filename = jobs[index][0]
+        entries[filename] = response
+    return entries
+
+
+def wait_for_batch(client, name, timings, deadline_at):
+    """Poll batch ``name`` until it finishes; returns the final BatchJob.
+
+    Transient polling errors are retried on the next poll; anything else
+    (including an unknown batch) is raised.
+    """
+    state = None
+    while True:
         try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash-image",
-                contents=[prompt, bus_image, logo_image],
-                config=types.GenerateContentConfig(
-                    response_modalities=["Image"],
-                    image_config=types.ImageConfig(aspect_ratio=aspect_ratio)
+            batch = client.batches.get(name=name)
+        except Exception as e:
+            if classify(e) != RETRYABLE:
+                raise
+            print(f"    Poll failed for {name} ({describe(e)}), retrying")
+        else:
+            for timing in timings:
+                timing.polls += 1
+            if batch.state != state:
+                state = batch.state
+                print(f"  {name}: {getattr(state, 'value', state)}")
+            if getattr(state, "value", state) in BATCH_FINISHED:
+                return batch
+
+        if time.monotonic() + BATCH_POLL_INTERVAL > deadline_at:
+            client.batches.cancel(name=name)
+            raise GenerationError(f"Batch {name} did not finish in time (cancelled)", RETRYABLE)
+        time.sleep(BATCH_POLL_INTERVAL)
+
+
+def run_batch_api(client, limiter, manifest, jobs, save_pool, ref_max_side=None, metrics=None,
+                  journal=None, deadline=BATCH_DEADLINE, work_queue=None, qa=None):
+    """Generate ``jobs`` through the Batch API and return {filename: Future}.
+
+    Each round packs every job still pending into one batch job and waits
+    for it. Successful entries are handed to ``save_pool`` as soon as the
+    batch finishes; failed ones are classified like synchronous errors and
+    go into the next round while their class has attempts left. A fatal
+    error ends the run. With a ``journal``, a batch submitted for the same
+    set of jobs by an interrupted run is resumed instead of resubmitted.
+    With a ``work_queue`` only the jobs this worker can claim are batched;
+    the others fail with JobTaken. With ``qa`` entries that fail the brand
+    checks go into the next round like other retryable failures.
+    """
+    from google.genai import types
+
+    metrics = metrics or RunMetrics("generate-batch")
+    results = {filename: Future() for filename, *_ in jobs}
+    if work_queue is not None:
+        claimed = []
+        for job in jobs:
+            try:
+                work_queue.claim("image", job[0], job[3], IMAGES_DIR / job[0])
+            except JobTaken as e:
+                results[job[0]].set_exception(e)
+            else:
+                claimed.append(job)
+        jobs = claimed
+    timings = {
+        filename: metrics.job(filename, MODEL, aspect_ratio)
+        for filename, aspect_ratio, *_ in jobs
+    }
+    attempts = {filename: {} for filename, *_ in jobs}
+    deadline_at = time.monotonic() + deadline
+    requests = {}
+    pending = list(jobs)
+
+    def give_up(filename, error):
+        if work_queue is not None:
+            work_queue.release("image", filename)
+        metrics.finish(timings[filename], error.kind)
+        results[filename].set_exception(error)
+
+    def on_saved(save_future, filename, key):
+        try:
+            output_path = save_future.result()
+        except Exception as e:
+            if work_queue is not None:
+                work_queue.release("image", filename)
+            metrics.finish(timings[filename], "failed")
+            results[filename].set_exception(e)
+            return
+        manifest.record(output_path, key)
+        if work_queue is not None:
+            work_queue.complete("image", filename)
+        metrics.finish(timings[filename], "ok", output_path)
+        results[filename].set_result(output_path)
+
+    while pending:
+        batch_key = job_key({"model": MODEL, "batch": sorted(job[3] for job in pending)})
+        name = journal.live(batch_key) if journal else None
+        resumed = name is not None
+        try:
+            if resumed:
+                print(f"Resuming batch job {name} ({len(pending)} images)")
+            else:
+                if not requests:
+                    built = batch_requests(client, jobs, ref_max_side)
+                    requests = {job[0]: request for job, request in zip(jobs, built)}
+                batch = call_with_retries(
+                    lambda: client.batches.create(
+                        model=MODEL,
+                        src=[requests[job[0]] for job in pending],
+                        config=types.CreateBatchJobConfig(display_name=f"generate-batch-{len(pending)}"),
+                    ),
+                    limiter, MODEL, "batch job",
                 )
+                name = batch.name
+                if journal:
+                    journal.submitted(name, f"batch of {len(pending)} images", batch_key)
+                print(f"Submitted batch job {name} ({len(pending)} images)")
+            for job in pending:
+                timings[job[0]].started()
+                timings[job[0]].generation_started()
+            batch = wait_for_batch(
+                client, name, [timings[job[0]] for job in pending], deadline_at,
+            )
+        except Exception as e:
+            if resumed and getattr(e, "code", None) == 404:
+                # The server no longer knows the batch: submit a fresh one
+                print(f"  {name} expired, resubmitting")
+                journal.update(name, EXPIRED)
+                continue
+            error = e if isinstance(e, GenerationError) else GenerationError(describe(e), classify(e))
+            for job in pending:
+                give_up(job[0], error)
+            break
+
+        if journal:
+            journal.update(name, DONE)
+        state = getattr(batch.state, "value", batch.state)
+        if state in BATCH_SUCCEEDED:
+            entries = batch_entries(batch, pending)
+            failure = EmptyResponseError("Missing from batch results")
+        else:
+            # The whole batch failed: every entry shares its error
+            entries = {}
+            failure = BatchEntryError(
+                getattr(batch.error, "code", None),
+                getattr(batch.error, "message", None) or f"Batch ended in {state}",
             )
 
-            for part in response.parts:
-                if image := part.as_image():
-                    image.save(output_path)
-                    print(f"    ✓ Saved: {output_path}")
-                    success += 1
-                    break
-            else:
-                print(f"    ✗ No image generated")
-                failed.append(filename)
+        retry, saves, fatal, delay = [], [], None, 0.0
+        for job in pending:
+            filename, _, prompt, key = job
+            timing = timings[filename]
+            timing.generation_finished()
+            try:
+                entry = entries.get(filename)
+                if entry is None:
+                    raise failure
+                part = check_batch_response(entry)
+                if qa is not None:
+                    qa.check(filename, part.inline_data.data, prompt)
+            except Exception as e:
+                kind = classify(e)
+                count = attempts[filename][kind] = attempts[filename].get(kind, 0) + 1
+                policy = POLICIES[kind]
+                if kind == FATAL:
+                    fatal = fatal or GenerationError(describe(e), kind)
+                if kind == FATAL or count >= policy.max_attempts:
+                    print(f"  ✗ {filename}: {describe(e)}")
+                    give_up(filename, GenerationError(describe(e), kind))
+                    continue
+                timing.retries += 1
+                delay = max(delay, policy.delay(count - 1) * limiter.time_scale)
+                print(f"    {kind.capitalize()} error on {filename} "
+                      f"(attempt {count}/{policy.max_attempts}, {describe(e)}), retrying in next batch")
+                retry.append(job)
+                continue
+            save = save_pool.submit(save_image, part, IMAGES_DIR / filename, timing)
+            save.add_done_callback(
+                lambda future, filename=filename, key=key: on_saved(future, filename, key)
+            )
+            saves.append(save)
+
+        # Only mark the batch saved once its results are on disk
+        wait(saves)
+        if journal:
+            journal.update(name, SAVED)
+
+        if fatal:
+            for job in retry:
+                give_up(job[0], GenerationError("Skipped after a fatal error", FATAL))
+            break
+        if retry and time.monotonic() + delay > deadline_at:
+            for job in retry:
+                give_up(job[0], GenerationError("Deadline exceeded", RETRYABLE))
+            break
+        pending = retry
+        if pending and delay:
+            time.sleep(delay)
+
+    return results
+
+
+@contextmanager
+def image_session(client, args, jobs):
+    """Pools and shared request context for a run of image jobs.
+
+    Yields ``(request_pool, save_pool, contents_for, cached_content)``.
+    """
+    # Encoded once and shared by every request and retry in the run
+    references = [
+        load_reference(INPUT_BUS_IMAGE, args.ref_max_side).as_part(),
+        load_reference(INPUT_LOGO_IMAGE, args.ref_max_side).as_part(),
+    ]
+    if args.context_cache and jobs:
+        shared = SharedContext(
+            client, MODEL, references,
+            instruction_lines=shared_lines(job[2] for job in jobs),
+            ttl_seconds=args.context_cache_ttl,
+        )
+    else:
+        shared = nullcontext()
+
+    # A single saver keeps disk writes off the request threads
+    with shared, ThreadPoolExecutor(max_workers=1) as save_pool, \
+            ThreadPoolExecutor(max_workers=max(1, args.workers)) as request_pool:
+        cached_content = getattr(shared, "name", None)
+
+        def contents_for(prompt):
+            if cached_content:
+                # References and shared lines already live in the cache
+                return [strip_lines(prompt, shared.instruction_lines)]
+            return [prompt, *references]
+
+        yield request_pool, save_pool, contents_for, cached_content
+
+
+def image_qa(args):
+    """The run's ImageQA when --qa or --candidates asks for one, else None."""
+    if not args.qa and args.candidates <= 1:
+        return None
+    from pipeline.qa import ImageQA
+
+    return ImageQA()
+
+
+def add_image_arguments(parser, short_flags=True):
+    """Image options shared by generate-batch.py and generate-all.py."""
+    parser.add_argument(
+        *(["-j"] if short_flags else []), "--workers",
+        type=int,
+        default=int(os.environ.get("IMAGE_WORKERS", DEFAULT_WORKERS)),
+        help=f"Number of image requests kept in flight (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--ref-max-side",
+        type=int,
+        default=None,
+        help="Downscale reference images to this many pixels on the long side "
+             "before upload (default: send the original files)",
+    )
+    parser.add_argument(
+        "--context-cache",
+        action="store_true",
+        help="Upload the shared references and style lines once as a Gemini "
+             "cached-content entry and send only each job's own prompt lines",
+    )
+    parser.add_argument(
+        "--context-cache-ttl",
+        type=int,
+        default=1800,
+        help="Lifetime of the context cache in seconds (default: 1800)",
+    )
+    parser.add_argument(
+        "--qa",
+        action="store_true",
+        help="Score each image against the brand (cream background, Van Blue, palette "
+             "drift, similarity to hero-bus-front.png) and regenerate it if it fails",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=1,
+        help="Request this many images per job at once and keep the best-scoring "
+             "one (implies --qa; default: 1)",
+    )
+    parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help="Rewrite changed images as indexed brand-palette PNGs after the batch",
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    add_image_arguments(parser)
+    add_queue_argument(parser)
+    add_fingerprint_argument(parser)
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Only print what would be generated and why, then exit",
+    )
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Submit all pending images as one asynchronous Batch API job "
+             "(cheaper, but results take minutes to hours)",
+    )
+    args = parser.parse_args()
+    if args.batch_api and args.context_cache:
+        parser.error("--context-cache cannot be combined with --batch-api")
+    if args.batch_api and args.candidates > 1:
+        parser.error("--candidates cannot be combined with --batch-api")
+    return args
 
-            # Rate limiting - wait between requests
-            time.sleep(2)
 
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
-            failed.append(filename)
-            time.sleep(5)  # Longer wait on error
+def main():
+    args = parse_args()
+
+    if not INPUT_BUS_IMAGE.exists() or not INPUT_LOGO_IMAGE.exists():
+        print("Error: Input images not found")
+        return 1
+
+    # Plan before touching the SDK: an up-to-date run never imports it
+    manifest = Manifest(IMAGES_MANIFEST)
+    total = len(IMAGES_TO_GENERATE)
+    pending, success = plan_images(manifest, args.ref_max_side, dry_run=args.plan)
+    if args.plan:
+        print(f"\nPlan: {len(pending)} of {total} images to generate")
+        return 0
+    if not pending:
+        print(f"\nAll {total} images up to date")
+        return 0 if not run_stages(args.quantize, fingerprint=args.fingerprint) else 1
+
+    keys = api_keys()
+    if not keys:
+        print("Error: Please set GEMINI_API_KEY (or GEMINI_API_KEYS for several projects)")
+        return 1
+
+    client, limiter = connect(keys, RateLimiter())
+    metrics = start_run("generate-batch")
+    work_queue = open_queue(args.queue)
+    qa = image_qa(args)
+    failed = []
+
+    if args.batch_api:
+        print(f"\nGenerating {len(pending)} images through the Batch API...")
+    else:
+        print(f"\nGenerating {len(pending)} images with {max(1, args.workers)} workers...")
+
+    clean_partial(IMAGES_DIR)
+    done = total - len(pending)
+    taken = 0
+    fatal = None
+    with image_session(client, args, pending) as (request_pool, save_pool, contents_for, cached_content):
+        if args.batch_api:
+            journal = OperationJournal()
+            journal.prune()
+            results = run_batch_api(
+                client, limiter, manifest, pending, save_pool, args.ref_max_side, metrics, journal,
+                work_queue=work_queue, qa=qa,
+            )
+        else:
+            results = start_images(
+                client, limiter, manifest, pending, request_pool, save_pool,
+                contents_for, cached_content, metrics, work_queue, qa, args.candidates,
+            )
+        filenames = {future: filename for filename, future in results.items()}
+
+        for future in as_completed(filenames):
+            filename = filenames[future]
+            done += 1
+            try:
+                output_path = future.result()
+            except JobFailed as e:
+                print(f"[{done}/{total}] ✗ {filename}: {e}")
+                failed.append(filename)
+            except JobTaken as e:
+                print(f"[{done}/{total}] Skipping {filename} ({e})")
+                taken += 1
+            except GenerationError as e:
+                print(f"[{done}/{total}] ✗ {filename}: {e}")
+                failed.append(filename)
+                if e.kind == FATAL and fatal is None:
+                    fatal = e
+                    print("Fatal error - cancelling the remaining images")
+            except Exception as e:
+                print(f"[{done}/{total}] ✗ {filename}: Save failed: {e}")
+                failed.append(filename)
+            else:
+                print(f"[{done}/{total}] ✓ Saved: {output_path}")
+                success += 1
+    if work_queue is not None:
+        work_queue.close()
+
+    # Stage failures belong in the summary below
+    if not fatal:
+        failed.extend(run_stages(args.quantize, fingerprint=args.fingerprint))
 
     print(f"\n{'='*50}")
     print(f"Complete: {success}/{total} images generated")
+    if taken:
+        print(f"Left to other workers: {taken}")
     if failed:
         print(f"Failed: {', '.join(failed)}")
+    if fatal:
+        print(f"Stopped early: {fatal}")
+    metrics.close()
 
     return 0 if not failed else 1
 
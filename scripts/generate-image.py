@@ -3,7 +3,7 @@
 Generate images for The AI Struggle Bus using Gemini's native image generation.
 
 Requirements:
-    pip install -U "google-genai>=1.40.0" Pillow
+    pip install -U "google-genai>=1.40.0"
 
 Usage:
     1. Edit OUTPUT_IMAGE, prompt, and aspect_ratio below
@@ -11,15 +11,19 @@ Usage:
 """
 
 import os
+import time
 import warnings
 from pathlib import Path
 
 # Suppress urllib3 OpenSSL warning (doesn't affect functionality)
 warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")
 
-from google import genai
-from google.genai import types
-from PIL import Image
+from pipeline.client import api_keys, connect
+from pipeline.errors import GenerationError, call_with_retries, check_image_response
+from pipeline.metrics import start_run
+from pipeline.output import save_image_part
+from pipeline.ratelimit import RateLimiter
+from pipeline.references import load_reference
 
 # Load environment variables from .env.local
 SCRIPT_DIR = Path(__file__).parent
@@ -35,6 +39,7 @@ if ENV_FILE.exists():
                 os.environ.setdefault(key.strip(), value.strip())
 
 # Configuration
+MODEL = "gemini-2.5-flash-image"
 IMAGES_DIR = PROJECT_ROOT / "public" / "images"
 
 INPUT_BUS_IMAGE = IMAGES_DIR / "hero-bus-front.png"
@@ -66,9 +71,9 @@ Requirements:
 
 def main():
     # Check for API key
-    api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        print("Error: Please set GEMINI_API_KEY or GOOGLE_API_KEY environment variable")
+    keys = api_keys()
+    if not keys:
+        print("Error: Please set GEMINI_API_KEY (or GEMINI_API_KEYS for several projects)")
         print("Get your API key at: https://aistudio.google.com/apikey")
         return 1
 
@@ -80,23 +85,29 @@ def main():
         print(f"Error: Reference logo image not found: {INPUT_LOGO_IMAGE}")
         return 1
 
-    # Load reference images
+    # Imported only once there is a request to make
+    from google.genai import types
+
+    # Load reference images (original bytes, encoded once for all retries)
     print("Loading reference images...")
-    bus_image = Image.open(INPUT_BUS_IMAGE)
-    logo_image = Image.open(INPUT_LOGO_IMAGE)
+    bus_image = load_reference(INPUT_BUS_IMAGE).as_part()
+    logo_image = load_reference(INPUT_LOGO_IMAGE).as_part()
 
     # Initialize Gemini client
-    client = genai.Client(api_key=api_key)
+    client, limiter = connect(keys, RateLimiter())
+    metrics = start_run("generate-image")
+    job = metrics.job(OUTPUT_IMAGE.name, MODEL, ASPECT_RATIO)
 
     print(f"Output: {OUTPUT_IMAGE.name}")
     print(f"Aspect ratio: {ASPECT_RATIO}")
     print(f"\nGenerating image with Gemini (using reference images)...")
     print(f"This may take a moment...\n")
 
-    try:
+    def generate():
+        started = time.monotonic()
         # Using gemini-2.5-flash-image with reference images for consistency
         response = client.models.generate_content(
-            model="gemini-2.5-flash-image",
+            model=MODEL,
             contents=[PROMPT, bus_image, logo_image],
             config=types.GenerateContentConfig(
                 response_modalities=["Image"],
@@ -105,23 +116,34 @@ def main():
                 )
             )
         )
+        job.generation_time = time.monotonic() - started
+        return check_image_response(response)
+
+    status = "failed"
+    try:
+        # Retries transient and filtered failures; auth/argument errors raise at once
+        part = call_with_retries(generate, limiter, MODEL, OUTPUT_IMAGE.name, timing=job)
 
         # Save the generated image
-        for part in response.parts:
-            if image := part.as_image():
-                image.save(OUTPUT_IMAGE)
-                print(f"Success! Image saved to: {OUTPUT_IMAGE}")
-                return 0
-
-        print("Error: No image was generated in the response")
-        if response.text:
-            print(f"Response text: {response.text}")
+        with job.timed("download_time"):
+            save_image_part(part, OUTPUT_IMAGE)
+        status = "ok"
+        print(f"Success! Image saved to: {OUTPUT_IMAGE}")
+        return 0
+
+    except GenerationError as e:
+        status = e.kind
+        print(f"Error generating image ({e.kind}): {e}")
         return 1
 
     except Exception as e:
         print(f"Error generating image: {e}")
         return 1
 
+    finally:
+        metrics.finish(job, status, OUTPUT_IMAGE if status == "ok" else None)
+        metrics.close()
+
 
 if __name__ == "__main__":
     exit(main())
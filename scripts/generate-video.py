@@ -3,7 +3,7 @@
 Generate videos for The AI Struggle Bus using Veo 3.1.
 
 Requirements:
-    pip install -U "google-genai>=1.44.0" Pillow
+    pip install -U "google-genai>=1.44.0"
 
 Usage:
     python scripts/generate-video.py
@@ -17,9 +17,13 @@ from pathlib import Path
 # Suppress urllib3 OpenSSL warning (doesn't affect functionality)
 warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")
 
-from google import genai
-from google.genai import types
-from PIL import Image
+from pipeline.client import api_keys, connect
+from pipeline.errors import GenerationError, call_with_retries, check_video_operation, classify
+from pipeline.metrics import start_run
+from pipeline.download import save_video
+from pipeline.polling import PollPolicy
+from pipeline.ratelimit import RateLimiter
+from pipeline.references import load_reference
 
 # Load environment variables from .env.local
 SCRIPT_DIR = Path(__file__).parent
@@ -35,6 +39,7 @@ if ENV_FILE.exists():
                 os.environ.setdefault(key.strip(), value.strip())
 
 # Configuration
+MODEL = "veo-3.1-generate-preview"
 IMAGES_DIR = PROJECT_ROOT / "public" / "images"
 VIDEOS_DIR = PROJECT_ROOT / "public" / "videos"
 
@@ -74,9 +79,9 @@ DURATION = 8  # 4, 6, or 8 seconds
 
 def main():
     # Check for API key
-    api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        print("Error: Please set GEMINI_API_KEY or GOOGLE_API_KEY environment variable")
+    keys = api_keys()
+    if not keys:
+        print("Error: Please set GEMINI_API_KEY (or GEMINI_API_KEYS for several projects)")
         print("Get your API key at: https://aistudio.google.com/apikey")
         return 1
 
@@ -84,7 +89,9 @@ def main():
     VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
     # Initialize Gemini client
-    client = genai.Client(api_key=api_key)
+    client, limiter = connect(keys, RateLimiter())
+    metrics = start_run("generate-video")
+    job = metrics.job(OUTPUT_VIDEO.name, MODEL, ASPECT_RATIO)
 
     print(f"Output: {OUTPUT_VIDEO.name}")
     print(f"Aspect ratio: {ASPECT_RATIO}")
@@ -92,6 +99,8 @@ def main():
     print(f"Duration: {DURATION}s")
 
     # Prepare the generation config
+    from google.genai import types
+
     config = types.GenerateVideosConfig(
         aspect_ratio=ASPECT_RATIO,
         resolution=RESOLUTION,
@@ -99,64 +108,73 @@ def main():
         negative_prompt="text, words, letters, writing, signs with text, readable text, realistic, photorealistic, 3D, eyes on bus, faces, people inside bus, cartoon eyes, low quality, blurry, VW logo",
     )
 
-    # Load starting frame if specified
-    start_image = None
+    # Load starting frame if specified (original bytes, encoded once for all retries)
+    image = None
     if START_FRAME and START_FRAME.exists():
         print(f"\nUsing starting frame: {START_FRAME.name}")
-        start_image = Image.open(START_FRAME)
+        image = load_reference(START_FRAME).as_image()
 
     print(f"\nGenerating video with Veo 3.1...")
     print(f"This may take 1-3 minutes...\n")
 
-    try:
-        # Generate video
-        if start_image:
-            # Image-to-video generation
-            import io
-            image_bytes_io = io.BytesIO()
-            start_image.save(image_bytes_io, format="PNG")
-            image_bytes = image_bytes_io.getvalue()
-
-            operation = client.models.generate_videos(
-                model="veo-3.1-generate-preview",
-                prompt=PROMPT,
-                image=types.Image(image_bytes=image_bytes, mime_type="image/png"),
-                config=config,
-            )
-        else:
-            # Text-to-video generation
-            operation = client.models.generate_videos(
-                model="veo-3.1-generate-preview",
+    def submit():
+        # Generate video (text-to-video when there is no starting frame)
+        with job.timed("submit_latency"):
+            return client.models.generate_videos(
+                model=MODEL,
                 prompt=PROMPT,
+                image=image,
                 config=config,
             )
 
-        # Poll until complete
-        poll_count = 0
+    status = "failed"
+    try:
+        # Retries transient failures; auth/argument errors raise at once
+        operation = call_with_retries(submit, limiter, MODEL, OUTPUT_VIDEO.name, timing=job)
+
+        # Poll until complete, on a schedule learned from earlier runs
+        job.generation_started()
+        poller = PollPolicy(time_scale=limiter.time_scale)
+        submitted = time.monotonic()
+        schedule = poller.schedule(MODEL, DURATION, RESOLUTION, submitted)
         while not operation.done:
-            poll_count += 1
-            print(f"  Waiting... ({poll_count * 20}s)")
-            time.sleep(20)
+            time.sleep(max(0.0, schedule.due_at - time.monotonic()))
+            print(f"  Waiting... ({int(time.monotonic() - submitted)}s)")
+            job.polls += 1
             operation = client.operations.get(operation)
-
-        # Check for errors
-        if not operation.result or not operation.result.generated_videos:
-            print("Error: No video was generated")
-            if hasattr(operation, 'error') and operation.error:
-                print(f"Error details: {operation.error}")
+            schedule.polled(time.monotonic())
+        poller.finished(MODEL, DURATION, RESOLUTION, time.monotonic() - submitted)
+        job.generation_finished()
+
+        # Check for errors (filtered, failed or empty operations)
+        try:
+            generated_videos = check_video_operation(operation)
+        except Exception as e:
+            status = classify(e)
+            print(f"Error: No video was generated ({status}): {e}")
             return 1
 
         # Download and save the video
-        for generated_video in operation.result.generated_videos:
-            client.files.download(file=generated_video.video)
-            generated_video.video.save(str(OUTPUT_VIDEO))
+        for generated_video in generated_videos:
+            with job.timed("download_time"):
+                save_video(client, generated_video.video, OUTPUT_VIDEO, duration=DURATION)
+            status = "ok"
             print(f"\nSuccess! Video saved to: {OUTPUT_VIDEO}")
             return 0
 
+    except GenerationError as e:
+        status = e.kind
+        print(f"Error generating video ({e.kind}): {e}")
+        return 1
+
     except Exception as e:
         print(f"Error generating video: {e}")
         return 1
 
+    finally:
+        metrics.finish(job, status, OUTPUT_VIDEO if status == "ok" else None)
+        metrics.close()
+
 
 if __name__ == "__main__":
     exit(main())
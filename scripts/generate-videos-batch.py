@@ -2,25 +2,48 @@
 """
 Batch generate videos for The AI Struggle Bus using Veo 3.1.
 
+With --video-qa each downloaded clip is checked against its start frame
+(pipeline/qa.py) before it replaces the old one; failing clips are
+resubmitted while the batch is still running, or only flagged with
+--video-qa flag.
+
 Requirements:
-    pip install -U "google-genai>=1.44.0" Pillow
+    pip install -U "google-genai>=1.44.0"
 
 Usage:
-    python scripts/generate-videos-batch.py
+    python scripts/generate-videos-batch.py [--max-in-flight N] [--video-qa] [--transcode]
+    python scripts/generate-videos-batch.py --transcode --fingerprint
+    python scripts/generate-videos-batch.py --queue /shared/genai-queue.sqlite
+    python scripts/generate-videos-batch.py --plan
 """
 
+import argparse
 import os
 import time
 import warnings
-import io
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 # Suppress urllib3 OpenSSL warning
 warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")
 
-from google import genai
-from google.genai import types
-from PIL import Image
+from pipeline.client import api_keys, connect
+from pipeline.errors import (
+    FATAL, POLICIES, REJECTED, RETRYABLE, check_video_operation, classify, describe,
+)
+from pipeline.journal import DONE, EXPIRED, FAILED, SAVED, OperationJournal
+from pipeline.manifest import FRESH, STALE, UNTRACKED, VIDEOS_MANIFEST, Manifest, job_key
+from pipeline.metrics import RunMetrics, start_run
+from pipeline.download import save_video
+from pipeline.fingerprint import add_fingerprint_argument
+from pipeline.output import clean_partial
+from pipeline.polling import MAX_INTERVAL, PollPolicy
+from pipeline.ratelimit import RateLimiter, is_rate_limited
+from pipeline.references import load_reference
+from pipeline.stages import run_stages
+from pipeline.workqueue import JobFailed, JobTaken, add_queue_argument, open_queue
 
 # Load environment variables from .env.local
 SCRIPT_DIR = Path(__file__).parent
@@ -39,6 +62,17 @@ if ENV_FILE.exists():
 IMAGES_DIR = PROJECT_ROOT / "public" / "images"
 VIDEOS_DIR = PROJECT_ROOT / "public" / "videos"
 
+MODEL = "veo-3.1-generate-preview"
+RESOLUTION = "720p"
+
+# Scheduling: operations running at once and parallel downloads. Poll
+# timing comes from recorded completion times (pipeline.polling).
+DEFAULT_MAX_IN_FLIGHT = 4
+DOWNLOAD_WORKERS = 4
+
+# Stop retrying a video this long after its first submission
+VIDEO_DEADLINE = 45 * 60
+
 # Common negative prompt for all videos
 NEGATIVE_PROMPT = "realistic, photorealistic, 3D, eyes on bus, faces, people inside bus, cartoon eyes, low quality, blurry, VW logo, Volkswagen"
 
@@ -195,151 +229,637 @@ Sound: professional ambiance, paper organizing, productive meeting sounds."""
 ]
 
 
-def generate_video(client, video_config, max_retries=5):
-    """Generate a single video with rate limit retry logic."""
-    name = video_config["name"]
+def video_key(video_config):
+    """Cache key over everything that shapes a generated video."""
     start_frame_name = video_config.get("start_frame")
-    aspect_ratio = video_config.get("aspect_ratio", "16:9")
-    duration = video_config.get("duration", 8)
-    prompt = video_config["prompt"]
+    return job_key(
+        {
+            "model": MODEL,
+            "prompt": video_config["prompt"],
+            "aspect_ratio": video_config.get("aspect_ratio", "16:9"),
+            "duration": video_config.get("duration", 8),
+            "resolution": RESOLUTION,
+            "negative_prompt": NEGATIVE_PROMPT,
+        },
+        {"start_frame": IMAGES_DIR / start_frame_name if start_frame_name else None},
+    )
 
-    output_path = VIDEOS_DIR / f"{name}.mp4"
 
-    # Skip if already exists
-    if output_path.exists():
-        print(f"  Skipping {name} - already exists")
-        return True, False  # (success, was_rate_limited)
+def submit_video(client, video_config):
+    """Submit a single video generation and return the pending operation."""
+    from google.genai import types
 
-    print(f"\n{'='*60}")
-    print(f"Generating: {name}.mp4")
-    print(f"  Aspect: {aspect_ratio}, Duration: {duration}s")
+    start_frame_name = video_config.get("start_frame")
+    aspect_ratio = video_config.get("aspect_ratio", "16:9")
+    duration = video_config.get("duration", 8)
+    prompt = video_config["prompt"]
 
-    # Load starting frame
+    # Starting frame bytes are read once and reused across retries
     start_image = None
     if start_frame_name:
         start_frame_path = IMAGES_DIR / start_frame_name
         if start_frame_path.exists():
-            print(f"  Start frame: {start_frame_name}")
-            start_image = Image.open(start_frame_path)
+            start_image = load_reference(start_frame_path).as_image()
         else:
             print(f"  Warning: Start frame not found: {start_frame_name}")
 
     config = types.GenerateVideosConfig(
         aspect_ratio=aspect_ratio,
-        resolution="720p",
+        resolution=RESOLUTION,
         duration_seconds=duration,
         negative_prompt=NEGATIVE_PROMPT,
     )
 
-    # Retry logic with exponential backoff for rate limits
-    for attempt in range(max_retries):
+    if start_image:
+        # Image-to-video
+        return client.models.generate_videos(
+            model=MODEL,
+            prompt=prompt,
+            image=start_image,
+            config=config,
+        )
+
+    # Text-to-video
+    return client.models.generate_videos(
+        model=MODEL,
+        prompt=prompt,
+        config=config,
+    )
+
+
+def download_video(client, operation, output_path, timing=None, duration=None, check=None):
+    """Stream the first generated video of a finished operation to disk, verified.
+
+    ``check`` (e.g. the video QA gate) sees the clip before it lands.
+    """
+    for generated_video in operation.result.generated_videos:
+        with timing.timed("download_time") if timing else nullcontext():
+            return save_video(
+                client, generated_video.video, output_path, duration=duration, check=check,
+            )
+
+
+def start_frame_path(video_config):
+    """Path of a video's start frame, or None for text-to-video."""
+    start_frame_name = video_config.get("start_frame")
+    return IMAGES_DIR / start_frame_name if start_frame_name else None
+
+
+def is_not_found(error):
+    """True if the server no longer knows an operation (e.g. it expired)."""
+    return getattr(error, "code", None) == 404 or "NOT_FOUND" in str(error)
+
+
+def run_batch(client, limiter, manifest, video_configs, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+              dependencies=None, journal=None, metrics=None, deadline=VIDEO_DEADLINE,
+              work_queue=None, poller=None, download_workers=DOWNLOAD_WORKERS, qa=None):
+    """Submit many videos and poll all pending operations in a single loop.
+
+    Up to ``max_in_flight`` operations run at once. Each finished operation is
+    handed to one of ``download_workers`` download threads straight away so
+    polling and new submissions carry on while it streams to disk; a clip is
+    recorded only once its container checks out (``pipeline.download``). ``dependencies`` maps a video name to a Future
+    (e.g. its start frame being generated); the video is held back until that
+    future succeeds and fails if it fails.
+
+    Every submitted operation is written to ``journal`` straight away. Before
+    submitting a video the journal is checked for a live operation with the
+    same job key (left behind by a crashed or interrupted run); if there is
+    one the loop re-attaches to it instead of paying for a new generation.
+    Failed submissions and operations are retried per ``pipeline.errors``
+    policies until ``deadline`` seconds after a video's first attempt; a
+    fatal error cancels every video not yet submitted while the running
+    ones finish. An operation whose polls fail fatally, or keep failing for
+    ``deadline`` seconds, is marked failed and given up on. Per-video
+    timings go to ``metrics``.
+
+    With a ``work_queue`` a video is claimed right before it is submitted or
+    resumed; videos another worker owns are skipped (not failed), videos the
+    queue gave up on count as failed, and an operation left behind by a dead
+    worker is re-attached to.
+
+    Operations are polled on a ``poller`` schedule (``PollPolicy``): quiet
+    until recent history says the clip could be ready, frequent inside that
+    window, backing off past it. Every completion is added to the history.
+
+    With ``qa`` (a ``VideoQA``) every clip is checked against its start frame
+    before it is saved; a rejected clip is resubmitted under the REJECTED
+    retry policy, like a failed operation.
+    Returns (success_count, failed_names).
+    """
+    from google.genai import types
+
+    dependencies = dependencies or {}
+    journal = journal or OperationJournal()
+    metrics = metrics or RunMetrics("generate-videos-batch")
+    poller = poller or PollPolicy(time_scale=limiter.time_scale)
+    timings = {
+        video_config["name"]: metrics.job(
+            video_config["name"], MODEL, video_config.get("aspect_ratio", "16:9")
+        )
+        for video_config in video_configs
+    }
+    queue = deque(video_configs)
+    # Keys are taken at submit time so a start frame edited mid-run stays stale
+    keys = {}
+    in_flight = {}   # name -> {"config", "operation", "submitted", "schedule", "resumed"}
+    downloads = {}   # future -> (name, operation name, config)
+    attempts = {}       # name -> {error class: count}
+    first_attempt = {}  # name -> monotonic time of the first submission
+    retry_at = {}       # name -> earliest monotonic time to resubmit
+    looked_up = set()   # names already checked against the journal
+    next_submit_at = 0.0
+    success_count = 0
+    failed = []
+    fatal = None
+
+    def give_up(name, kind):
+        if work_queue is not None:
+            work_queue.release("video", name)
+        metrics.finish(timings[name], kind)
+        failed.append(name)
+
+    def claim(video_config):
+        """Claim a video in the work queue; returns (ok, operation to re-attach to)."""
+        if work_queue is None:
+            return True, None
+        name = video_config["name"]
         try:
-            if start_image:
-                # Image-to-video
-                image_bytes_io = io.BytesIO()
-                start_image.save(image_bytes_io, format="PNG")
-                image_bytes = image_bytes_io.getvalue()
-
-                operation = client.models.generate_videos(
-                    model="veo-3.1-generate-preview",
-                    prompt=prompt,
-                    image=types.Image(image_bytes=image_bytes, mime_type="image/png"),
-                    config=config,
+            return True, work_queue.claim("video", name, keys[name], VIDEOS_DIR / f"{name}.mp4")
+        except JobFailed as e:
+            print(f"  ERROR: {name}: {e}")
+            metrics.finish(timings[name], "failed")
+            failed.append(name)
+            queue.remove(video_config)
+            return False, None
+        except JobTaken as e:
+            print(f"  Skipping {name}: {e}")
+            queue.remove(video_config)
+            return False, None
+
+    def poll_schedule(video_config, now, quiet=True):
+        return poller.schedule(
+            MODEL, video_config.get("duration", 8), RESOLUTION, now, quiet=quiet,
+        )
+
+    def resume(video_config, operation_name, now):
+        """Poll an operation that is already running instead of submitting."""
+        name = video_config["name"]
+        first_attempt[name] = now
+        timings[name].started()
+        timings[name].generation_started()
+        queue.remove(video_config)
+        in_flight[name] = {
+            "config": video_config,
+            "operation": types.GenerateVideosOperation(name=operation_name),
+            "submitted": now,
+            "schedule": poll_schedule(video_config, now, quiet=False),
+            "resumed": True,
+        }
+
+    def schedule_retry(video_config, error):
+        """Requeue after a retryable/filtered failure; returns the delay or None."""
+        name = video_config["name"]
+        kind = classify(error)
+        counts = attempts.setdefault(name, {})
+        counts[kind] = counts.get(kind, 0) + 1
+        policy = POLICIES[kind]
+        if counts[kind] >= policy.max_attempts:
+            return None
+        if is_rate_limited(error):
+            # Honour Retry-After, else jittered backoff; pauses every process
+            delay = limiter.backoff(MODEL, error, counts[kind] - 1)
+        else:
+            delay = policy.delay(counts[kind] - 1) * limiter.time_scale
+        if time.monotonic() - first_attempt[name] + delay > deadline:
+            return None
+        retry_at[name] = time.monotonic() + delay
+        timings[name].retries += 1
+        queue.append(video_config)
+        return delay
+
+    def stop_batch(error):
+        """Fatal error: cancel everything that has not been submitted yet."""
+        nonlocal fatal
+        fatal = error
+        if queue:
+            print(f"  Fatal error - cancelling {len(queue)} videos not yet submitted")
+        for video_config in queue:
+            give_up(video_config["name"], FATAL)
+        queue.clear()
+
+    with ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="download") as download_pool:
+        while queue or in_flight or downloads:
+            now = time.monotonic()
+
+            # Drop videos whose start frame could not be produced
+            for video_config in list(queue):
+                dependency = dependencies.get(video_config["name"])
+                if dependency is not None and dependency.done() and dependency.exception():
+                    if (isinstance(dependency.exception(), JobTaken)
+                            and not isinstance(dependency.exception(), JobFailed)):
+                        # Whoever makes the start frame makes the video after it
+                        print(f"  Skipping {video_config['name']}: start frame "
+                              f"{video_config.get('start_frame')} belongs to another worker")
+                        queue.remove(video_config)
+                        continue
+                    print(f"  ERROR: {video_config['name']}: start frame "
+                          f"{video_config.get('start_frame')} failed, not submitting")
+                    give_up(video_config["name"], classify(dependency.exception()))
+                    queue.remove(video_config)
+
+            ready = [
+                video_config for video_config in queue
+                if (dependencies.get(video_config["name"]) is None
+                    or dependencies[video_config["name"]].done())
+                and retry_at.get(video_config["name"], 0.0) <= now
+            ]
+
+            # Re-attach to operations an earlier run submitted but never saved.
+            # They are already running server-side, so they skip the budget
+            # and the in-flight cap.
+            for video_config in list(ready):
+                name = video_config["name"]
+                if name in looked_up:
+                    continue
+                looked_up.add(name)
+                keys[name] = video_key(video_config)
+                operation_name = journal.live(keys[name])
+                if operation_name is None:
+                    continue
+                ready.remove(video_config)
+                if not claim(video_config)[0]:
+                    continue
+                print(f"  Resuming: {name}.mp4 ({operation_name})")
+                resume(video_config, operation_name, now)
+
+            # Fill free slots while the shared rate limiter has budget
+            while ready and len(in_flight) < max_in_flight and now >= next_submit_at:
+                keys[ready[0]["name"]] = video_key(ready[0])
+                claimed, attached = claim(ready[0])
+                if not claimed or attached:
+                    video_config = ready.pop(0)
+                    if attached:
+                        print(f"  Resuming: {video_config['name']}.mp4 ({attached}, "
+                              f"left by another worker)")
+                        resume(video_config, attached, now)
+                    continue
+
+                wait_time = limiter.reserve(MODEL)
+                if wait_time:
+                    next_submit_at = now + wait_time
+                    break
+
+                video_config = ready.pop(0)
+                queue.remove(video_config)
+                name = video_config["name"]
+                keys[name] = video_key(video_config)
+                timing = timings[name]
+                timing.started()
+                first_attempt.setdefault(name, now)
+                try:
+                    with timing.timed("submit_latency"):
+                        operation = submit_video(client, video_config)
+                except Exception as e:
+                    kind = classify(e)
+                    if kind == FATAL:
+                        print(f"  ERROR: {name}: {describe(e)}")
+                        give_up(name, kind)
+                        stop_batch(e)
+                        break
+
+                    delay = schedule_retry(video_config, e)
+                    if delay is None:
+                        print(f"  ERROR: {name}: giving up after {kind} error: {describe(e)}")
+                        give_up(name, kind)
+                        continue
+                    print(f"  {kind.capitalize()} error submitting {name} ({describe(e)}), "
+                          f"retrying in {delay:.0f}s...")
+                    if is_rate_limited(e):
+                        # The whole model is paused, not just this video
+                        next_submit_at = now + delay
+                        break
+                    continue
+
+                journal.submitted(operation.name, name, keys[name])
+                if work_queue is not None:
+                    work_queue.attach("video", name, operation.name)
+                timing.generation_started()
+                print(f"  Submitted: {name}.mp4 ({len(in_flight) + 1} in flight)")
+                in_flight[name] = {
+                    "config": video_config,
+                    "operation": operation,
+                    "submitted": now,
+                    "schedule": poll_schedule(video_config, now),
+                    "resumed": False,
+                }
+
+            # Refresh every operation that is due for a poll
+            polled = False
+            for name, job in list(in_flight.items()):
+                if now < job["schedule"].due_at:
+                    continue
+                polled = True
+                timings[name].polls += 1
+                try:
+                    operation = client.operations.get(job["operation"])
+                except Exception as e:
+                    if job["resumed"] and is_not_found(e):
+                        # Journalled operation is gone; generate it afresh
+                        print(f"  Operation for {name} has expired, resubmitting")
+                        journal.update(job["operation"].name, EXPIRED)
+                        if work_queue is not None:
+                            work_queue.attach("video", name, None)
+                        del in_flight[name]
+                        queue.append(job["config"])
+                        continue
+                    kind = classify(e)
+                    failing_since = job.setdefault("poll_failing_since", now)
+                    if kind == FATAL or now - failing_since > deadline:
+                        # Revoked key, permanent 403, unreadable operation:
+                        # polling again will not help
+                        print(f"  ERROR: Giving up on {name}, polling keeps failing: {e}")
+                        journal.update(job["operation"].name, FAILED)
+                        if work_queue is not None:
+                            work_queue.attach("video", name, None)
+                        del in_flight[name]
+                        give_up(name, kind)
+                        if kind == FATAL and not fatal:
+                            stop_batch(e)
+                        continue
+                    print(f"  Warning: poll failed for {name}: {e}")
+                    job["schedule"].polled(now)
+                    continue
+
+                job.pop("poll_failing_since", None)
+                job["operation"] = operation
+                if not operation.done:
+                    job["schedule"].polled(now)
+                    continue
+
+                del in_flight[name]
+                timings[name].generation_finished()
+                elapsed = int(now - job["submitted"])
+                if not job["resumed"]:
+                    # Resumed jobs were submitted before this run; their age is unknown
+                    poller.finished(
+                        MODEL, job["config"].get("duration", 8), RESOLUTION, now - job["submitted"],
+                    )
+                try:
+                    check_video_operation(operation)
+                except Exception as e:
+                    journal.update(operation.name, FAILED)
+                    if work_queue is not None:
+                        work_queue.attach("video", name, None)
+                    kind = classify(e)
+                    delay = schedule_retry(job["config"], e) if kind != FATAL and not fatal else None
+                    if delay is not None:
+                        print(f"  {kind.capitalize()} failure for {name} after {elapsed}s ({e}), "
+                              f"resubmitting in {delay:.0f}s...")
+                        continue
+                    print(f"  ERROR: No video generated for {name} ({elapsed}s): {e}")
+                    give_up(name, kind)
+                    if kind == FATAL and not fatal:
+                        stop_batch(e)
+                    continue
+
+                journal.update(operation.name, DONE)
+                print(f"  Finished: {name} ({elapsed}s), downloading...")
+                check = None
+                if qa is not None:
+                    start_frame = start_frame_path(job["config"])
+                    def check(clip, name=name, start_frame=start_frame):
+                        return qa.check(name, clip, start_frame)
+                future = download_pool.submit(
+                    download_video, client, operation, VIDEOS_DIR / f"{name}.mp4", timings[name],
+                    job["config"].get("duration", 8), check,
                 )
-            else:
-                # Text-to-video
-                operation = client.models.generate_videos(
-                    model="veo-3.1-generate-preview",
-                    prompt=prompt,
-                    config=config,
+                downloads[future] = (name, operation.name, job["config"])
+
+            if polled and in_flight:
+                waiting = ", ".join(
+                    f"{name} ({int(now - job['submitted'])}s)" for name, job in in_flight.items()
                 )
+                print(f"  Waiting on {len(in_flight)}: {waiting}")
+
+            # Sleep until the next poll, submission, download or unblocked video
+            wake_at = min(
+                [job["schedule"].due_at for job in in_flight.values()]
+                + ([max(next_submit_at, now)] if ready and len(in_flight) < max_in_flight else [])
+                + [retry_at[v["name"]] for v in queue if retry_at.get(v["name"], 0.0) > now]
+                + [now + MAX_INTERVAL * poller.time_scale]
+            )
+            timeout = max(0.0, wake_at - time.monotonic())
+            blocked = {
+                dependencies[video_config["name"]] for video_config in queue
+                if video_config["name"] in dependencies
+                and not dependencies[video_config["name"]].done()
+            }
+            if downloads or blocked:
+                wait(set(downloads) | blocked, timeout=timeout, return_when=FIRST_COMPLETED)
+            elif queue or in_flight:
+                time.sleep(timeout)
+            finished = [future for future in downloads if future.done()]
+
+            for future in finished:
+                name, operation_name, video_config = downloads.pop(future)
+                try:
+                    output_path = future.result()
+                except Exception as e:
+                    if classify(e) == REJECTED:
+                        # Never re-download it: the next attempt is a new generation
+                        journal.update(operation_name, FAILED)
+                        if work_queue is not None:
+                            work_queue.attach("video", name, None)
+                        delay = schedule_retry(video_config, e) if not fatal else None
+                        if delay is not None:
+                            print(f"  Rejected clip for {name} ({e}), resubmitting in {delay:.0f}s...")
+                            continue
+                        print(f"  ERROR: {name}: {e}")
+                        give_up(name, REJECTED)
+                        continue
+                    # Left as done in the journal so the next run re-downloads
+                    print(f"  ERROR: Download failed for {name}: {e}")
+                    give_up(name, RETRYABLE)
+                else:
+                    if qa is not None and name in qa.flagged:
+                        print(f"  FLAGGED by QA: {name} ({qa.flagged[name]})")
+                    manifest.record(output_path, keys[name])
+                    journal.update(operation_name, SAVED)
+                    if work_queue is not None:
+                        work_queue.complete("video", name)
+                    metrics.finish(timings[name], "ok", output_path)
+                    print(f"  SUCCESS: {output_path}")
+                    success_count += 1
+
+    return success_count, failed
+
+
+def plan_videos(manifest, regenerating=(), dry_run=False):
+    """Decide which videos need generating, printing why for each.
+
+    ``regenerating`` names images that are about to be regenerated; videos
+    using one of them as a start frame are stale even if their key matches.
+    Needs only stat calls and file hashes; with ``dry_run`` nothing is
+    written. Returns (pending, up_to_date).
+    """
+    pending = []
+    up_to_date = 0
 
-            # Poll until complete
-            poll_count = 0
-            while not operation.done:
-                poll_count += 1
-                print(f"  Waiting... ({poll_count * 20}s)")
-                time.sleep(20)
-                operation = client.operations.get(operation)
-
-            # Check for errors
-            if not operation.result or not operation.result.generated_videos:
-                print(f"  ERROR: No video generated for {name}")
-                return False, False
-
-            # Save video
-            for generated_video in operation.result.generated_videos:
-                client.files.download(file=generated_video.video)
-                generated_video.video.save(str(output_path))
-                print(f"  SUCCESS: {output_path}")
-                return True, False
-
-        except Exception as e:
-            error_str = str(e)
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                # Rate limited - use exponential backoff
-                wait_time = 60 * (2 ** attempt)  # 60s, 120s, 240s, 480s, 960s
-                print(f"  Rate limited (attempt {attempt + 1}/{max_retries}). Waiting {wait_time}s...")
-                time.sleep(wait_time)
-                continue
+    for i, video_config in enumerate(VIDEOS, 1):
+        name = video_config["name"]
+        output_path = VIDEOS_DIR / f"{name}.mp4"
+        status = manifest.status(output_path, video_key(video_config))
+
+        if video_config.get("start_frame") in regenerating:
+            print(f"[{i}/{len(VIDEOS)}] {name}: start frame {video_config['start_frame']} "
+                  f"is being regenerated")
+            pending.append(video_config)
+            continue
+        if status == FRESH:
+            print(f"[{i}/{len(VIDEOS)}] {name}: Skipping - up to date")
+            up_to_date += 1
+            continue
+        if status == UNTRACKED:
+            # Pre-manifest asset: assume it matches the current spec
+            if dry_run:
+                print(f"[{i}/{len(VIDEOS)}] {name}: Skipping - already exists, would be tracked")
             else:
-                print(f"  ERROR: {e}")
-                return False, False
+                manifest.record(output_path, video_key(video_config))
+                print(f"[{i}/{len(VIDEOS)}] {name}: Skipping - already exists, now tracked")
+            up_to_date += 1
+            continue
+        if status == STALE:
+            action = "would regenerate" if dry_run else "regenerating"
+            print(f"[{i}/{len(VIDEOS)}] {name}: inputs changed, {action}")
+        else:
+            action = "would generate" if dry_run else "generating"
+            print(f"[{i}/{len(VIDEOS)}] {name}: missing, {action}")
+        pending.append(video_config)
 
-    print(f"  ERROR: Max retries exceeded for {name}")
-    return False, True  # (failed, was_rate_limited)
+    return pending, up_to_date
 
 
-def main():
-    # Check for API key
-    api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        print("Error: Please set GEMINI_API_KEY or GOOGLE_API_KEY environment variable")
-        return 1
+def add_video_arguments(parser, short_flags=True):
+    """Video options shared by generate-videos-batch.py and generate-all.py."""
+    parser.add_argument(
+        *(["-j"] if short_flags else []), "--max-in-flight",
+        type=int,
+        default=int(os.environ.get("VIDEO_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+        help=f"Veo operations kept running at once (default: {DEFAULT_MAX_IN_FLIGHT})",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=int(os.environ.get("VIDEO_DOWNLOAD_WORKERS", DOWNLOAD_WORKERS)),
+        help=f"Finished clips downloaded at once, alongside polling (default: {DOWNLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--video-qa",
+        nargs="?",
+        const="resubmit",
+        choices=("resubmit", "flag"),
+        default=None,
+        help="Check each clip against its start frame (palette, SSIM / perceptual "
+             "hash, cuts) before saving it and resubmit failures, or only flag "
+             "them with 'flag' (needs ffmpeg)",
+    )
+    parser.add_argument(
+        "--transcode",
+        action="store_true",
+        help="Transcode changed clips into web renditions and posters after the batch",
+    )
 
-    # Create videos directory
-    VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Initialize client
-    client = genai.Client(api_key=api_key)
+def video_qa(args):
+    """The run's VideoQA when --video-qa asks for one, else None.
+
+    Raises RuntimeError if ffmpeg is missing.
+    """
+    if not args.video_qa:
+        return None
+    from pipeline.qa import VideoQA
+
+    return VideoQA(resubmit=args.video_qa == "resubmit")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batch generate videos with Veo 3.1.")
+    add_video_arguments(parser)
+    add_queue_argument(parser)
+    add_fingerprint_argument(parser)
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Only print what would be generated and why, then exit",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
 
     print(f"Batch Video Generation")
     print(f"Total videos to generate: {len(VIDEOS)}")
     print(f"Output directory: {VIDEOS_DIR}")
 
-    # Track results
-    success_count = 0
-    fail_count = 0
-    skip_count = 0
+    # Plan before touching the SDK: an up-to-date run never imports it
+    manifest = Manifest(VIDEOS_MANIFEST)
+    pending, skip_count = plan_videos(manifest, dry_run=args.plan)
+    if args.plan:
+        print(f"\nPlan: {len(pending)} of {len(VIDEOS)} videos to generate")
+        return 0
+    if not pending:
+        print(f"\nAll {len(VIDEOS)} videos up to date")
+        return 0 if not run_stages(transcode=args.transcode, fingerprint=args.fingerprint) else 1
 
-    for i, video_config in enumerate(VIDEOS, 1):
-        print(f"\n[{i}/{len(VIDEOS)}] {video_config['name']}")
+    # Check for API key
+    keys = api_keys()
+    if not keys:
+        print("Error: Please set GEMINI_API_KEY (or GEMINI_API_KEYS for several projects)")
+        return 1
 
-        output_path = VIDEOS_DIR / f"{video_config['name']}.mp4"
-        if output_path.exists():
-            print(f"  Skipping - already exists")
-            skip_count += 1
-            continue
+    try:
+        qa = video_qa(args)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
 
-        success, _ = generate_video(client, video_config)
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
+    # Create videos directory
+    VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Small delay between requests
-        if i < len(VIDEOS):
-            time.sleep(5)
+    # Initialize client
+    client, limiter = connect(keys, RateLimiter())
+    journal = OperationJournal()
+    journal.prune()
+    metrics = start_run("generate-videos-batch")
+    work_queue = open_queue(args.queue)
+
+    clean_partial(VIDEOS_DIR)
+    print(f"\nSubmitting {len(pending)} videos, up to {max(1, args.max_in_flight)} at a time...")
+    success_count, failed = run_batch(
+        client, limiter, manifest, pending, max_in_flight=max(1, args.max_in_flight),
+        journal=journal, metrics=metrics, work_queue=work_queue,
+        download_workers=max(1, args.download_workers), qa=qa,
+    )
+    if work_queue is not None:
+        work_queue.close()
+    failed.extend(run_stages(transcode=args.transcode, fingerprint=args.fingerprint))
 
     # Summary
     print(f"\n{'='*60}")
     print(f"BATCH COMPLETE")
     print(f"  Success: {success_count}")
     print(f"  Skipped: {skip_count}")
-    print(f"  Failed:  {fail_count}")
+    print(f"  Failed:  {len(failed)}")
+    if failed:
+        print(f"  Failed videos: {', '.join(failed)}")
+    if qa is not None and qa.flagged:
+        print(f"  Flagged by QA: {', '.join(sorted(qa.flagged))}")
     print(f"{'='*60}")
+    metrics.close()
 
-    return 0 if fail_count == 0 else 1
+    return 0 if not failed else 1
 
 
 if __name__ == "__main__":
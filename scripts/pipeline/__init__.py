@@ -0,0 +1,6 @@
+"""
+Shared helpers for The AI Struggle Bus asset generation scripts.
+
+The scripts in ``scripts/`` run as plain files (``python scripts/x.py``), so
+this package is importable from any of them as ``pipeline``.
+"""
@@ -0,0 +1,57 @@
+"""
+Client construction for the generation scripts.
+
+``create_client`` returns a real ``genai.Client`` unless ``GENAI_FAKE`` names
+a profile from ``pipeline.fake_genai.PROFILES``, in which case every script
+runs against the local stand-in instead (any API key value works)::
+
+    GENAI_FAKE=typical GENAI_FAKE_SCALE=0.01 GEMINI_API_KEY=x \\
+        python scripts/generate-videos-batch.py
+
+Keys come from ``GEMINI_API_KEYS`` (comma-separated, one per project) or the
+single ``GEMINI_API_KEY`` / ``GOOGLE_API_KEY``. With more than one key
+``connect`` returns a ``pipeline.keypool.KeyPool`` that spreads requests
+across them.
+"""
+
+import os
+
+
+def create_client(api_key):
+    """A ``genai.Client`` for ``api_key``, or the stand-in when ``GENAI_FAKE`` is set."""
+    profile = os.environ.get("GENAI_FAKE")
+    if profile:
+        from .fake_genai import FakeClient
+
+        scale = float(os.environ.get("GENAI_FAKE_SCALE", 1.0))
+        return FakeClient(profile, time_scale=scale, api_key=api_key)
+
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+
+def api_keys():
+    """Configured API keys: ``GEMINI_API_KEYS`` if set, else the single key."""
+    pool = os.environ.get("GEMINI_API_KEYS", "")
+    keys = [key.strip() for key in pool.split(",") if key.strip()]
+    if keys:
+        # Keep order, drop repeats (the same project twice has one quota)
+        return list(dict.fromkeys(keys))
+    single = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+    return [single] if single else []
+
+
+def connect(keys, limiter):
+    """``(client, limiter)`` for ``keys``.
+
+    One key gives a plain client and ``limiter``; several give a ``KeyPool``
+    that acts as both, with per-key budgets in ``limiter``'s state file.
+    """
+    if len(keys) == 1:
+        return create_client(keys[0]), limiter
+
+    from .keypool import KeyPool
+
+    pool = KeyPool(keys, limiter)
+    return pool, pool
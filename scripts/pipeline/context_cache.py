@@ -0,0 +1,110 @@
+"""
+Server-side context caching for the prefix shared by every image request.
+
+All image jobs send the same reference images and repeat the same style
+requirements. ``SharedContext`` uploads that prefix once per run as a Gemini
+cached-content entry with a TTL, lets each request point at it and carry only
+its own prompt lines, and deletes the entry when the run ends. While the run
+is live the TTL is extended every ``REFRESH_FRACTION`` of it, so a run slowed
+by backoff or QA retries never outlives its cache.
+
+Creating the cache can fail (model without caching support, prefix below the
+minimum token count, quota); requests then fall back to sending everything
+inline, exactly as without caching.
+"""
+
+import threading
+
+# Extend the cache's TTL after this fraction of it has passed
+REFRESH_FRACTION = 0.5
+
+
+def shared_lines(prompts):
+    """Requirement lines ("- ...") that appear in every prompt, in first-prompt order."""
+    prompts = list(prompts)
+    if not prompts:
+        return []
+    common = set(line.strip() for line in prompts[0].splitlines() if line.strip().startswith("- "))
+    for prompt in prompts[1:]:
+        common &= set(line.strip() for line in prompt.splitlines())
+    seen = []
+    for line in prompts[0].splitlines():
+        if line.strip() in common and line.strip() not in seen:
+            seen.append(line.strip())
+    return seen
+
+
+def strip_lines(prompt, lines):
+    """``prompt`` without any of ``lines`` (compared stripped)."""
+    drop = set(lines)
+    return "\n".join(line for line in prompt.splitlines() if line.strip() not in drop)
+
+
+class SharedContext:
+    """Context manager owning one cached-content entry for a run.
+
+    ``name`` is the cache resource name, or ``None`` when caching is off or
+    could not be set up.
+    """
+
+    def __init__(self, client, model, parts, instruction_lines=(), ttl_seconds=1800,
+                 display_name="struggle-bus-shared-context"):
+        self.client = client
+        self.model = model
+        self.parts = list(parts)
+        self.instruction_lines = list(instruction_lines)
+        self.ttl_seconds = ttl_seconds
+        self.display_name = display_name
+        self.name = None
+        self._stop = threading.Event()
+        self._keeper = None
+
+    def __enter__(self):
+        from google.genai import types
+
+        config = types.CreateCachedContentConfig(
+            display_name=self.display_name,
+            contents=[types.Content(role="user", parts=self.parts)],
+            ttl=f"{int(self.ttl_seconds)}s",
+        )
+        if self.instruction_lines:
+            config.system_instruction = "\n".join(self.instruction_lines)
+
+        try:
+            cache = self.client.caches.create(model=self.model, config=config)
+        except Exception as e:
+            print(f"Warning: context cache unavailable, sending references inline ({e})")
+            return self
+
+        self.name = cache.name
+        print(f"Created context cache {self.name} (ttl {int(self.ttl_seconds)}s)")
+        self._keeper = threading.Thread(
+            target=self._keep_alive, name="context-cache-ttl", daemon=True
+        )
+        self._keeper.start()
+        return self
+
+    def _keep_alive(self):
+        """Push the expiry out by a full TTL until the run ends."""
+        from google.genai import types
+
+        while not self._stop.wait(self.ttl_seconds * REFRESH_FRACTION):
+            try:
+                self.client.caches.update(
+                    name=self.name,
+                    config=types.UpdateCachedContentConfig(ttl=f"{int(self.ttl_seconds)}s"),
+                )
+            except Exception as e:
+                print(f"Warning: could not extend context cache {self.name} ({e})")
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._keeper is not None:
+            self._keeper.join()
+        if self.name:
+            try:
+                self.client.caches.delete(name=self.name)
+            except Exception as e:
+                print(f"Warning: could not delete context cache {self.name} ({e}); "
+                      f"it expires on its own after the TTL")
+        return False
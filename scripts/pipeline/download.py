@@ -0,0 +1,161 @@
+"""
+Streaming, verified downloads of generated Veo videos.
+
+``save_video`` streams a clip from the Files API straight into a temporary
+file next to its destination (the SDK writes it in 1 MiB chunks), so memory
+stays flat however long the clip is. Before the file is renamed into place it must pass
+``probe_mp4``, a cheap check that reads box headers only:
+
+- the top-level boxes start with ``ftyp``, include ``moov`` and account for
+  every byte of the file (a transfer cut short fails this size check),
+- ``moov/mvhd`` declares a duration, which must match the requested clip
+  length within ``DURATION_TOLERANCE`` seconds when one is given.
+
+A transfer that breaks off is resumed with an HTTP ``Range`` request from
+the last byte written, up to ``DOWNLOAD_ATTEMPTS`` times. If the resumed
+file does not verify (a server that ignores ``Range`` sends the whole clip
+again), the next attempt starts over from the first byte.
+
+With an installed SDK that cannot stream to a file object (no
+``destination`` argument, checked once) clips are downloaded in memory
+instead; the result is verified the same way. A ``check`` callback (the
+video QA gate) gets the verified file before it is moved into place.
+"""
+
+import functools
+import inspect
+import struct
+import time
+from pathlib import Path
+
+from .errors import IncompleteDownloadError, RETRYABLE, classify, describe
+from .output import open_atomic
+
+DOWNLOAD_ATTEMPTS = 4
+DURATION_TOLERANCE = 1.0
+
+# Pause between attempts (seconds, doubled each time)
+RETRY_DELAY = 1.0
+
+
+def _boxes(f, start, end):
+    """Yield (type, payload offset, box end) for the boxes in ``f[start:end]``."""
+    offset = start
+    while offset < end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            raise IncompleteDownloadError(f"Truncated box header at byte {offset}")
+        size, kind = struct.unpack(">I4s", header)
+        if not all(0x20 <= byte < 0x7F for byte in kind):
+            raise IncompleteDownloadError(f"No valid box at byte {offset}")
+        payload = offset + 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                raise IncompleteDownloadError(f"Truncated box header at byte {offset}")
+            size = struct.unpack(">Q", large)[0]
+            payload += 8
+        elif size == 0:
+            size = end - offset  # Box runs to the end of its parent
+        if size < payload - offset or offset + size > end:
+            raise IncompleteDownloadError(
+                f"{kind.decode('latin-1')} box at byte {offset} runs past the end "
+                f"({offset + size} > {end} bytes)"
+            )
+        yield kind, payload, offset + size
+        offset += size
+
+
+def probe_mp4(f, size):
+    """Duration in seconds of the MP4 in binary file ``f`` of ``size`` bytes.
+
+    Raises IncompleteDownloadError if the container is truncated or malformed.
+    """
+    boxes = list(_boxes(f, 0, size))
+    if not boxes or boxes[0][0] != b"ftyp":
+        raise IncompleteDownloadError("Not an MP4 file (no leading ftyp box)")
+    moov = next(((start, end) for kind, start, end in boxes if kind == b"moov"), None)
+    if moov is None:
+        raise IncompleteDownloadError("MP4 has no moov box")
+    mvhd = next((start for kind, start, _ in _boxes(f, *moov) if kind == b"mvhd"), None)
+    if mvhd is None:
+        raise IncompleteDownloadError("MP4 has no mvhd box")
+
+    f.seek(mvhd)
+    version = f.read(4)[:1]
+    if version == b"\x01":
+        timescale, duration = struct.unpack(">16xIQ", f.read(28))
+    else:
+        timescale, duration = struct.unpack(">8xII", f.read(16))
+    if not timescale:
+        raise IncompleteDownloadError("MP4 has a zero timescale")
+    return duration / timescale
+
+
+@functools.cache
+def _sdk_streams():
+    """True if the installed google-genai can download into a file object."""
+    from google.genai.files import Files
+
+    return "destination" in inspect.signature(Files.download).parameters
+
+
+def _fetch(client, video, f, offset):
+    """Stream ``video`` into ``f`` from byte ``offset``."""
+    if not getattr(video, "uri", None) and getattr(video, "video_bytes", None):
+        # Returned inline with the operation: nothing to transfer
+        f.write(video.video_bytes[offset:])
+        return
+    if not _sdk_streams():
+        # Whole clip in memory, every attempt
+        data = client.files.download(file=video)
+        if data is None:
+            data = video.video_bytes
+        f.seek(0)
+        f.truncate()
+        f.write(data)
+        return
+    config = {"http_options": {"headers": {"Range": f"bytes={offset}-"}}} if offset else None
+    client.files.download(file=video, destination=f, config=config)
+
+
+def save_video(client, video, path, duration=None, attempts=DOWNLOAD_ATTEMPTS, check=None):
+    """Stream a generated Veo video to ``path``, verify it and move it into place.
+
+    ``duration`` is the clip length that was requested, checked against the
+    container. ``check(temp_path)`` runs on the complete clip before it
+    replaces ``path``; whatever it raises leaves ``path`` untouched. Returns
+    ``path``; raises the last error once ``attempts`` are used up.
+    """
+    path = Path(path)
+    with open_atomic(path, mode="w+b") as f:
+        offset = 0
+        for attempt in range(attempts):
+            f.seek(offset)
+            f.truncate()
+            try:
+                _fetch(client, video, f, offset)
+                f.flush()
+                size = f.seek(0, 2)
+                seconds = probe_mp4(f, size)
+                break
+            except Exception as e:
+                if classify(e) != RETRYABLE or attempt + 1 == attempts:
+                    raise
+                # Resume where the bytes stop, unless a resumed file came out
+                # malformed (Range ignored): then start over
+                resumed, offset = offset, f.seek(0, 2)
+                if isinstance(e, IncompleteDownloadError) and resumed:
+                    offset = 0
+                print(f"    Download of {path.name} failed ({describe(e)}), "
+                      f"{f'resuming from byte {offset}' if offset else 'starting over'}...")
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+
+        if duration and abs(seconds - duration) > DURATION_TOLERANCE:
+            # The file is intact; downloading it again would not change it
+            raise IncompleteDownloadError(f"Clip is {seconds:.1f}s long, expected {duration}s")
+        if check is not None:
+            check(Path(f.name))
+        f.seek(size)
+    return path
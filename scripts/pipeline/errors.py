@@ -0,0 +1,236 @@
+"""
+Error taxonomy and retry policies shared by the generation scripts.
+
+Every failure is sorted into one of four classes:
+
+- ``RETRYABLE``: rate limits (429 / RESOURCE_EXHAUSTED), 5xx, timeouts and
+  connection drops, responses that came back without an image, and
+  downloads that arrived truncated. Worth
+  trying again after a jittered backoff.
+- ``FILTERED``: the prompt or output was blocked by a safety filter.
+  Generation is stochastic, so it gets one re-roll and then gives up.
+- ``REJECTED``: the output arrived but failed the brand QA gate
+  (``pipeline.qa``). It is regenerated straight away, a few times.
+- ``FATAL``: authentication, permission and invalid-argument errors, and
+  anything not recognised above (including bugs in our own code, such as
+  a ``KeyError``). These will fail the same way for every job, so the
+  batch stops instead of burning its remaining budget on them.
+
+``call_with_retries`` applies the policy for each class, honours the shared
+rate limiter for 429s, and gives up once a per-job deadline would be
+exceeded. Jobs that give up raise ``GenerationError`` carrying the class.
+"""
+
+import time
+
+from .ratelimit import backoff_delay, is_rate_limited
+
+RETRYABLE = "retryable"
+FILTERED = "filtered"
+REJECTED = "rejected"
+FATAL = "fatal"
+
+# Wall-clock budget for one job, including every retry and backoff
+DEFAULT_DEADLINE = 15 * 60
+
+# Finish / block reasons that mean a safety filter stopped the output
+FILTER_REASONS = {
+    "SAFETY", "BLOCKLIST", "PROHIBITED_CONTENT", "SPII", "RECITATION",
+    "IMAGE_SAFETY", "IMAGE_PROHIBITED_CONTENT", "IMAGE_RECITATION",
+    "MODEL_ARMOR", "JAILBREAK",
+}
+
+
+class RetryPolicy:
+    """How often and how patiently to retry one class of error."""
+
+    def __init__(self, max_attempts, base=2.0, cap=60.0):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+
+    def delay(self, attempt):
+        """Jittered exponential delay before retry number ``attempt`` (0-based)."""
+        return backoff_delay(attempt, base=self.base, cap=self.cap) if self.base else 0.0
+
+
+POLICIES = {
+    RETRYABLE: RetryPolicy(max_attempts=5, base=2.0, cap=60.0),
+    FILTERED: RetryPolicy(max_attempts=2, base=1.0, cap=1.0),
+    REJECTED: RetryPolicy(max_attempts=3, base=0.0),
+    FATAL: RetryPolicy(max_attempts=1),
+}
+
+
+class EmptyResponseError(Exception):
+    """The model answered but the response held no image or video."""
+
+
+class ContentFilteredError(Exception):
+    """A safety filter blocked the prompt or the generated output."""
+
+
+class IncompleteDownloadError(Exception):
+    """A downloaded file is truncated or is not the container it should be."""
+
+
+class RejectedOutputError(Exception):
+    """Generated output that failed QA; carries the ``report``."""
+
+    def __init__(self, message, report=None):
+        super().__init__(message)
+        self.report = report
+
+
+class BatchEntryError(Exception):
+    """One failed entry of a Batch API job; carries ``code`` like SDK errors."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}" if code else message)
+        self.code = code
+        self.message = message
+
+
+class GenerationError(Exception):
+    """A job that gave up; ``kind`` is the class of its last error."""
+
+    def __init__(self, message, kind):
+        super().__init__(message)
+        self.kind = kind
+
+
+def _is_transport_error(error):
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+def classify(error):
+    """RETRYABLE, FILTERED, REJECTED or FATAL for an exception."""
+    if isinstance(error, GenerationError):
+        return error.kind
+    if isinstance(error, RejectedOutputError):
+        return REJECTED
+    if isinstance(error, ContentFilteredError):
+        return FILTERED
+    if isinstance(error, (EmptyResponseError, IncompleteDownloadError)) or _is_transport_error(error):
+        return RETRYABLE
+    if is_rate_limited(error):
+        return RETRYABLE
+
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and (code >= 500 or code == 408):
+        return RETRYABLE
+    if code == 400 and any(reason in str(error).upper() for reason in FILTER_REASONS):
+        return FILTERED
+    # Auth, permission and argument errors, and anything unrecognised (a bug
+    # in our own code, a permanent condition): surface it now
+    return FATAL
+
+
+def check_image_response(response):
+    """Return the first image part, or raise why there isn't one."""
+    feedback = getattr(response, "prompt_feedback", None)
+    block_reason = getattr(feedback, "block_reason", None)
+    if block_reason and _reason_name(block_reason) != "BLOCKED_REASON_UNSPECIFIED":
+        raise ContentFilteredError(f"Prompt blocked ({_reason_name(block_reason)})")
+
+    for part in response.parts or []:
+        if part.inline_data and part.inline_data.data:
+            return part
+
+    for candidate in response.candidates or []:
+        reason = _reason_name(getattr(candidate, "finish_reason", None))
+        if reason in FILTER_REASONS:
+            raise ContentFilteredError(f"Output blocked ({reason})")
+    raise EmptyResponseError("No image generated")
+
+
+def check_batch_response(entry):
+    """Return the image part of one inlined Batch API response, or raise why not."""
+    error = getattr(entry, "error", None)
+    if error:
+        raise BatchEntryError(error.code, error.message or "Batch entry failed")
+    if entry.response is None:
+        raise EmptyResponseError("No response in batch entry")
+    return check_image_response(entry.response)
+
+
+def check_video_operation(operation):
+    """Return the generated videos of a finished operation, or raise why not."""
+    response = operation.result or getattr(operation, "response", None)
+    if response and response.generated_videos:
+        return response.generated_videos
+    if response and getattr(response, "rai_media_filtered_count", None):
+        reasons = ", ".join(response.rai_media_filtered_reasons or []) or "safety filter"
+        raise ContentFilteredError(f"Video blocked ({reasons})")
+
+    error = getattr(operation, "error", None)
+    if error:
+        code = error.get("code") if isinstance(error, dict) else None
+        message = error.get("message", error) if isinstance(error, dict) else error
+        if any(reason in str(message).upper() for reason in FILTER_REASONS):
+            raise ContentFilteredError(f"Video blocked ({message})")
+        if code in (400, 401, 403, 404):
+            raise GenerationError(f"Operation failed: {message}", FATAL)
+        raise EmptyResponseError(f"Operation failed: {message}")
+    raise EmptyResponseError("No video generated")
+
+
+def _reason_name(reason):
+    return getattr(reason, "name", None) or (str(reason) if reason else None)
+
+
+def describe(error):
+    """Short one-line description of an API error."""
+    message = getattr(error, "message", None)
+    code = getattr(error, "code", None)
+    if message and code:
+        status = getattr(error, "status", None)
+        return f"{code} {status}: {message}" if status else f"{code}: {message}"
+    return str(error) or type(error).__name__
+
+
+def call_with_retries(call, limiter, model, label, deadline=DEFAULT_DEADLINE, timing=None,
+                      policies=POLICIES):
+    """Run ``call()`` under the retry policy for whatever it raises.
+
+    Waits for the shared rate limiter before every attempt; 429s pause the
+    model for everyone via ``limiter.backoff``. Raises ``GenerationError``
+    once a class runs out of attempts or the next wait would pass
+    ``deadline`` seconds since the first attempt.
+    """
+    start = time.monotonic()
+    attempts = {}
+    while True:
+        limiter.acquire(model)
+        if timing:
+            timing.started()
+        try:
+            return call()
+        except Exception as e:
+            kind = classify(e)
+            attempts[kind] = attempts.get(kind, 0) + 1
+            policy = policies[kind]
+            if attempts[kind] >= policy.max_attempts:
+                raise GenerationError(describe(e), kind) from e
+
+            if is_rate_limited(e):
+                delay = limiter.backoff(model, e, attempts[kind] - 1)
+            else:
+                delay = policy.delay(attempts[kind] - 1) * limiter.time_scale
+            if time.monotonic() - start + delay > deadline:
+                raise GenerationError(f"Deadline exceeded ({describe(e)})", kind) from e
+
+            if timing:
+                timing.retries += 1
+            print(f"    {kind.capitalize()} error on {label} "
+                  f"(attempt {attempts[kind]}/{policy.max_attempts}, {describe(e)}), "
+                  f"retrying in {delay:.0f}s")
+            if not is_rate_limited(e):
+                # Rate-limit waits happen in limiter.acquire()
+                time.sleep(delay)
@@ -0,0 +1,509 @@
+"""
+Local stand-in for ``genai.Client``.
+
+``FakeClient`` implements the parts of the SDK the generation scripts call
+(``models.generate_content``, ``models.generate_videos``, ``operations.get``,
+``batches``, ``files.upload`` / ``files.download`` and ``caches``) and answers
+with canned PNG and MP4 payloads. Latencies are drawn from log-normal distributions and Veo
+operations and Batch API jobs stay pending for a sampled time, so the batch loops
+run exactly as they would against the API, just without a key or a bill.
+
+Profiles in ``PROFILES`` set the latencies and how often to inject
+429 RESOURCE_EXHAUSTED and 5xx errors, empty or safety-filtered responses,
+and auth failures (400 "API key not valid"), how often a video
+download breaks off part-way, and how often an image comes back off-brand
+(grey background, red bus) for the QA gate to catch; batch jobs apply the same rates to each of
+their entries. Downloads honour ``Range`` headers and stream into a
+``destination`` like the SDK. Extra keyword arguments to
+``FakeClient`` override single settings. ``time_scale`` shrinks every latency
+(0.01 runs a 90 s Veo job in under a second); error hints such as
+``retryDelay`` are scaled the same way.
+
+Any script can be pointed at the stand-in through ``GENAI_FAKE`` (see
+``pipeline.client``).
+"""
+
+import itertools
+import math
+import random
+import struct
+import threading
+import time
+import uuid
+import zlib
+
+# Latencies are (median seconds, log-normal sigma)
+PROFILES = {
+    "instant": {
+        "image_latency": (0.0, 0.0),
+        "submit_latency": (0.0, 0.0),
+        "video_latency": (0.0, 0.0),
+        "poll_latency": (0.0, 0.0),
+        "download_latency": (0.0, 0.0),
+        "batch_latency": (0.0, 0.0),
+        "rate_limit_rate": 0.0,
+        "server_error_rate": 0.0,
+        "empty_rate": 0.0,
+        "filtered_rate": 0.0,
+        "auth_error_rate": 0.0,
+        "dropped_transfer_rate": 0.0,
+        "off_brand_rate": 0.0,
+        "retry_delay": 30.0,
+    },
+    "typical": {
+        "image_latency": (9.0, 0.35),
+        "submit_latency": (1.5, 0.3),
+        "video_latency": (100.0, 0.45),
+        "poll_latency": (0.3, 0.3),
+        "download_latency": (3.0, 0.4),
+        "batch_latency": (900.0, 0.5),
+        "rate_limit_rate": 0.0,
+        "server_error_rate": 0.0,
+        "empty_rate": 0.0,
+        "filtered_rate": 0.0,
+        "auth_error_rate": 0.0,
+        "dropped_transfer_rate": 0.0,
+        "off_brand_rate": 0.0,
+        "retry_delay": 30.0,
+    },
+    "congested": {
+        "image_latency": (16.0, 0.6),
+        "submit_latency": (3.0, 0.5),
+        "video_latency": (220.0, 0.5),
+        "poll_latency": (0.8, 0.5),
+        "download_latency": (6.0, 0.6),
+        "batch_latency": (2400.0, 0.6),
+        "rate_limit_rate": 0.15,
+        "server_error_rate": 0.02,
+        "empty_rate": 0.02,
+        "filtered_rate": 0.02,
+        "auth_error_rate": 0.0,
+        "dropped_transfer_rate": 0.02,
+        "off_brand_rate": 0.05,
+        "retry_delay": 45.0,
+    },
+    "flaky": {
+        "image_latency": (9.0, 0.35),
+        "submit_latency": (1.5, 0.3),
+        "video_latency": (100.0, 0.45),
+        "poll_latency": (0.3, 0.3),
+        "download_latency": (3.0, 0.4),
+        "batch_latency": (900.0, 0.5),
+        "rate_limit_rate": 0.05,
+        "server_error_rate": 0.1,
+        "empty_rate": 0.05,
+        "filtered_rate": 0.05,
+        "auth_error_rate": 0.0,
+        "dropped_transfer_rate": 0.1,
+        "off_brand_rate": 0.1,
+        "retry_delay": 30.0,
+    },
+}
+
+_ASPECT_SIZES = {"1:1": (64, 64), "16:9": (64, 36), "9:16": (36, 64), "4:3": (64, 48)}
+
+
+def _png(width, height, scanlines):
+    """RGB PNG from filtered scanlines (each row prefixed with filter byte 0)."""
+    def chunk(tag, data):
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(scanlines))
+        + chunk(b"IEND", b"")
+    )
+
+
+def canned_illustration(width=64, height=64, off_brand=False):
+    """A flat bus-like PNG built without PIL: black-outlined body on cream,
+    pale windows above a Van Blue lower panel.
+
+    ``off_brand`` paints it red on grey, which the QA gate rejects.
+    """
+    background = (0xB4, 0xB4, 0xB4) if off_brand else (0xF5, 0xF0, 0xD7)
+    panel = (0xC0, 0x30, 0x30) if off_brand else (0x28, 0x72, 0xA6)
+    window = (0xD6, 0xEE, 0xF2)
+    left, right = width // 4, width - width // 4
+    top, bottom = height // 4, height - height // 4
+    waist = top + (bottom - top) * 2 // 5
+    line = max(1, min(width, height) // 32)
+    rows = []
+    for y in range(height):
+        row = bytearray(bytes(background) * width)
+        if top <= y < bottom:
+            for x in range(left, right):
+                if min(y - top, bottom - 1 - y, x - left, right - 1 - x) < line:
+                    color = (0, 0, 0)
+                else:
+                    color = window if y < waist else panel
+                row[3 * x:3 * x + 3] = bytes(color)
+        rows.append(b"\x00" + bytes(row))
+    return _png(width, height, b"".join(rows))
+
+
+def canned_mp4(duration=8.0, size=64 * 1024):
+    """A minimal MP4 (ftyp + moov/mvhd + mdat) declaring ``duration`` seconds."""
+    def box(tag, payload):
+        return struct.pack(">I", len(payload) + 8) + tag + payload
+
+    timescale = 1000
+    mvhd = (
+        b"\x00\x00\x00\x00"                        # version 0, flags
+        + struct.pack(">IIII", 0, 0, timescale, int(duration * timescale))
+        + struct.pack(">IH", 0x00010000, 0x0100)   # rate 1.0, volume 1.0
+        + b"\x00" * 10
+        + struct.pack(">9I", 0x00010000, 0, 0, 0, 0x00010000, 0, 0, 0, 0x40000000)
+        + b"\x00" * 24
+        + struct.pack(">I", 2)                     # next track id
+    )
+    head = box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2avc1mp41") + box(b"moov", box(b"mvhd", mvhd))
+    return head + box(b"mdat", b"\x00" * max(0, size - len(head) - 8))
+
+
+def _rate_limit_error(retry_delay):
+    from google.genai import errors
+
+    return errors.ClientError(429, {"error": {
+        "code": 429,
+        "status": "RESOURCE_EXHAUSTED",
+        "message": "Resource has been exhausted (e.g. check quota).",
+        "details": [{
+            "@type": "type.googleapis.com/google.rpc.RetryInfo",
+            "retryDelay": f"{retry_delay:.3f}s",
+        }],
+    }})
+
+
+def _server_error():
+    from google.genai import errors
+
+    return errors.ServerError(503, {"error": {
+        "code": 503,
+        "status": "UNAVAILABLE",
+        "message": "The model is overloaded. Please try again later.",
+    }})
+
+
+def _auth_error():
+    from google.genai import errors
+
+    return errors.ClientError(400, {"error": {
+        "code": 400,
+        "status": "INVALID_ARGUMENT",
+        "message": "API key not valid. Please pass a valid API key.",
+    }})
+
+
+def _not_found(name):
+    from google.genai import errors
+
+    return errors.ClientError(404, {"error": {
+        "code": 404,
+        "status": "NOT_FOUND",
+        "message": f"Operation {name} not found.",
+    }})
+
+
+class FakeClient:
+    """Drop-in for ``genai.Client`` backed by canned payloads.
+
+    ``events`` records ``(monotonic time, kind, model)`` for every call and
+    injected failure (kinds: ``request``, ``rate_limited``, ``server_error``,
+    ``auth_error``, ``empty``, ``filtered``, ``poll``, ``upload``, ``download``,
+    ``dropped_transfer``, ``off_brand``) so
+    benchmarks can derive throughput.
+    """
+
+    def __init__(self, profile="typical", time_scale=1.0, seed=None, api_key=None, **overrides):
+        settings = PROFILES[profile] if isinstance(profile, str) else profile
+        self.settings = {**settings, **overrides}
+        self.time_scale = time_scale
+        self.api_key = api_key
+        self.events = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # Names are unique across clients, like the API's (a KeyPool routes by them)
+        self._prefix = uuid.uuid4().hex[:6]
+        self._operations = {}  # name -> (ready_at, GenerateVideosResponse)
+        self._batches = {}  # name -> [ready_at, model, requests, BatchJob or None]
+
+        self.models = _Models(self)
+        self.operations = _Operations(self)
+        self.batches = _Batches(self)
+        self.files = _Files(self)
+        self.caches = _Caches(self)
+
+    def _record(self, kind, model=None):
+        with self._lock:
+            self.events.append((time.monotonic(), kind, model))
+
+    def _sample(self, name):
+        """Scaled latency in seconds for ``<name>_latency``."""
+        median, sigma = self.settings[f"{name}_latency"]
+        if median <= 0:
+            return 0.0
+        with self._lock:
+            value = median * math.exp(self._rng.gauss(0, sigma))
+        return value * self.time_scale
+
+    def _roll(self, name):
+        rate = self.settings[f"{name}_rate"]
+        with self._lock:
+            return rate > 0 and self._rng.random() < rate
+
+    def _sleep(self, name):
+        delay = self._sample(name)
+        if delay:
+            time.sleep(delay)
+
+    def _call(self, model, latency):
+        """Common request path: record, wait, maybe fail."""
+        self._record("request", model)
+        if self._roll("auth_error"):
+            self._record("auth_error", model)
+            raise _auth_error()
+        if self._roll("rate_limit"):
+            self._record("rate_limited", model)
+            raise _rate_limit_error(self.settings["retry_delay"] * self.time_scale)
+        self._sleep(latency)
+        if self._roll("server_error"):
+            self._record("server_error", model)
+            raise _server_error()
+
+    def _entry_response(self, model, request):
+        """Inlined result for one batch entry, with the per-request failure rates."""
+        from google.genai import types
+
+        self._record("request", model)
+        if self._roll("rate_limit"):
+            self._record("rate_limited", model)
+            return types.InlinedResponse(metadata=request.metadata, error=types.JobError(
+                code=429, message="Resource has been exhausted (e.g. check quota).",
+            ))
+        if self._roll("server_error"):
+            self._record("server_error", model)
+            return types.InlinedResponse(metadata=request.metadata, error=types.JobError(
+                code=503, message="The model is overloaded. Please try again later.",
+            ))
+        if self._roll("empty"):
+            self._record("empty", model)
+            response = types.GenerateContentResponse(candidates=[types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text="")]),
+            )])
+        elif self._roll("filtered"):
+            self._record("filtered", model)
+            response = types.GenerateContentResponse(candidates=[types.Candidate(
+                finish_reason=types.FinishReason.IMAGE_SAFETY,
+            )])
+        else:
+            part = self._image_part(model, request.config)
+            response = types.GenerateContentResponse(candidates=[types.Candidate(
+                content=types.Content(role="model", parts=[part]),
+            )])
+        return types.InlinedResponse(metadata=request.metadata, response=response)
+
+    def _image_part(self, model, config):
+        """Canned illustration sized for the requested aspect ratio."""
+        from google.genai import types
+
+        aspect_ratio = getattr(getattr(config, "image_config", None), "aspect_ratio", None)
+        width, height = _ASPECT_SIZES.get(aspect_ratio, (64, 64))
+        off_brand = self._roll("off_brand")
+        if off_brand:
+            self._record("off_brand", model)
+        data = canned_illustration(width, height, off_brand=off_brand)
+        return types.Part.from_bytes(data=data, mime_type="image/png")
+
+    def _next_name(self, kind):
+        return f"{kind}/fake-{self._prefix}-{next(self._ids):06d}"
+
+
+class _Models:
+    def __init__(self, client):
+        self._client = client
+
+    def generate_content(self, model, contents, config=None):
+        from google.genai import types
+
+        self._client._call(model, "image")
+        if self._client._roll("empty"):
+            self._client._record("empty", model)
+            return types.GenerateContentResponse(candidates=[types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text="")]),
+            )])
+        if self._client._roll("filtered"):
+            self._client._record("filtered", model)
+            return types.GenerateContentResponse(candidates=[types.Candidate(
+                finish_reason=types.FinishReason.IMAGE_SAFETY,
+            )])
+
+        part = self._client._image_part(model, config)
+        return types.GenerateContentResponse(candidates=[types.Candidate(
+            content=types.Content(role="model", parts=[part]),
+        )])
+
+    def generate_videos(self, model, prompt=None, image=None, config=None, **kwargs):
+        from google.genai import types
+
+        self._client._call(model, "submit")
+        duration = getattr(config, "duration_seconds", None) or 8
+        name = self._client._next_name(f"models/{model}/operations")
+        video = types.Video(
+            uri=f"https://fake.invalid/{name}.mp4",
+            video_bytes=canned_mp4(duration),
+            mime_type="video/mp4",
+        )
+        if self._client._roll("filtered"):
+            self._client._record("filtered", model)
+            response = types.GenerateVideosResponse(
+                rai_media_filtered_count=1,
+                rai_media_filtered_reasons=["The prompt could not be submitted (fake filter)."],
+            )
+        else:
+            response = types.GenerateVideosResponse(
+                generated_videos=[types.GeneratedVideo(video=video)]
+            )
+        ready_at = time.monotonic() + self._client._sample("video")
+        with self._client._lock:
+            self._client._operations[name] = (ready_at, response)
+        return types.GenerateVideosOperation(name=name, done=False)
+
+
+class _Operations:
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, operation, config=None):
+        from google.genai import types
+
+        name = operation.name
+        self._client._record("poll")
+        self._client._sleep("poll")
+        with self._client._lock:
+            entry = self._client._operations.get(name)
+        if entry is None:
+            raise _not_found(name)
+
+        ready_at, response = entry
+        if time.monotonic() < ready_at:
+            return types.GenerateVideosOperation(name=name, done=False)
+        return types.GenerateVideosOperation(name=name, done=True, response=response, result=response)
+
+
+class _Batches:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, model, src, config=None):
+        from google.genai import types
+
+        self._client._call(model, "submit")
+        name = self._client._next_name("batches")
+        requests = [
+            types.InlinedRequest.model_validate(request) if isinstance(request, dict) else request
+            for request in src
+        ]
+        ready_at = time.monotonic() + self._client._sample("batch")
+        with self._client._lock:
+            self._client._batches[name] = [ready_at, model, requests, None]
+        return types.BatchJob(name=name, model=model, state=types.JobState.JOB_STATE_PENDING)
+
+    def get(self, name, config=None):
+        from google.genai import types
+
+        self._client._record("poll")
+        self._client._sleep("poll")
+        with self._client._lock:
+            entry = self._client._batches.get(name)
+        if entry is None:
+            raise _not_found(name)
+
+        ready_at, model, requests, finished = entry
+        if finished is not None:
+            return finished
+        if time.monotonic() < ready_at:
+            return types.BatchJob(name=name, model=model, state=types.JobState.JOB_STATE_RUNNING)
+
+        # Entries are decided once, when the job first reports completion
+        responses = [self._client._entry_response(model, request) for request in requests]
+        finished = types.BatchJob(
+            name=name, model=model, state=types.JobState.JOB_STATE_SUCCEEDED,
+            dest=types.BatchJobDestination(inlined_responses=responses),
+        )
+        with self._client._lock:
+            entry[3] = finished
+        return finished
+
+    def cancel(self, name, config=None):
+        from google.genai import types
+
+        with self._client._lock:
+            entry = self._client._batches.get(name)
+            if entry is None:
+                raise _not_found(name)
+            if entry[3] is None:
+                entry[3] = types.BatchJob(
+                    name=name, model=entry[1], state=types.JobState.JOB_STATE_CANCELLED,
+                )
+
+
+class _Files:
+    def __init__(self, client):
+        self._client = client
+
+    def upload(self, file, config=None):
+        from google.genai import types
+
+        self._client._record("upload")
+        self._client._sleep("submit")
+        if isinstance(config, dict):
+            config = types.UploadFileConfig(**config)
+        name = self._client._next_name("files")
+        return types.File(
+            name=name,
+            uri=f"https://fake.invalid/v1beta/{name}",
+            mime_type=getattr(config, "mime_type", None) or "application/octet-stream",
+            state=types.FileState.ACTIVE,
+        )
+
+    def download(self, file, config=None, destination=None):
+        self._client._record("download")
+        self._client._sleep("download")
+        data = getattr(file, "video_bytes", None) or canned_mp4()
+        headers = ((config or {}).get("http_options") or {}).get("headers") or {}
+        start = int(headers.get("Range", "bytes=0-")[len("bytes="):].rstrip("-") or 0)
+        data = data[start:]
+        if destination is None:
+            return data
+        if self._client._roll("dropped_transfer"):
+            self._client._record("dropped_transfer")
+            with self._client._lock:
+                cut = self._client._rng.randrange(len(data))
+            destination.write(data[:cut])
+            raise ConnectionResetError("Connection reset by peer (fake dropped transfer)")
+        for offset in range(0, len(data), 16 * 1024):
+            destination.write(data[offset:offset + 16 * 1024])
+        return None
+
+
+class _Caches:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, model, config=None):
+        from google.genai import types
+
+        self._client._record("request", model)
+        return types.CachedContent(name=self._client._next_name("cachedContents"), model=model)
+
+    def update(self, name, config=None):
+        from google.genai import types
+
+        return types.CachedContent(name=name)
+
+    def delete(self, name, config=None):
+        return None
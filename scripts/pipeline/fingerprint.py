@@ -0,0 +1,161 @@
+"""
+Content-hash fingerprinted names for the assets in ``public/images`` and
+``public/videos``.
+
+Generated assets keep their logical names (``hero-bus-front.png``): the
+pipeline, its manifests and the specs all refer to them that way. Publishing
+adds a second name carrying the first ``HASH_LENGTH`` hex digits of the file's
+SHA-256 (``hero-bus-front.3f9a1c2b4d.png``), hardlinked to the same bytes
+where the filesystem allows it. A regenerated asset gets a new name, so the
+site can serve fingerprinted files with ``Cache-Control: immutable``
+(``next.config.ts``) and never needs ``?v=N`` cache busting.
+
+``src/lib/asset-manifest.json`` maps each logical path to its current
+fingerprinted path; ``src/lib/assets.ts`` resolves through it. Web
+renditions are fingerprinted too, as they are rebuilt under fixed names.
+
+The logical files stay on disk for the pipeline but are not deployed:
+``.vercelignore`` lists every one that has a fingerprinted name, so public/
+is not shipped twice, and ``next.config.ts`` rewrites requests for a logical
+path to its fingerprinted file.
+
+A name that is no longer current is kept for ``RETENTION`` so pages and CDN
+entries rendered before the change still resolve, then deleted. When each
+name was retired is recorded in ``STATE_DIR/manifests/fingerprints.json``.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from .manifest import MANIFESTS_DIR, file_digest
+from .output import write_atomic
+from .paths import IMAGES_DIR, PROJECT_ROOT, VIDEOS_DIR
+from .site import SITE_LIB_DIR, file_for, load_site_manifest, public_path, save_site_manifest
+
+SITE_MANIFEST = SITE_LIB_DIR / "asset-manifest.json"
+RETIRED_MANIFEST = MANIFESTS_DIR / "fingerprints.json"
+DEPLOY_IGNORE = PROJECT_ROOT / ".vercelignore"
+
+HASH_LENGTH = 10
+
+# How long a superseded fingerprinted file stays published
+RETENTION = 7 * 24 * 3600
+
+EXTENSIONS = {".png", ".jpg", ".webp", ".avif", ".mp4", ".webm"}
+
+FINGERPRINTED = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}(\.[^.]+)$")
+
+
+def is_fingerprinted(path):
+    return bool(FINGERPRINTED.search(Path(path).name))
+
+
+def fingerprinted_path(path, digest):
+    """``dir/name.<hash>.ext`` for a file whose SHA-256 is ``digest``."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}")
+
+
+def _assets(fingerprinted):
+    for root in (IMAGES_DIR, VIDEOS_DIR):
+        for path in sorted(root.rglob("*")):
+            if (path.suffix in EXTENSIONS and path.is_file() and not path.name.startswith(".")
+                    and is_fingerprinted(path) == fingerprinted):
+                yield path
+
+
+def publish(source):
+    """Create ``source``'s fingerprinted name if missing. Returns its path."""
+    target = fingerprinted_path(source, file_digest(source))
+    if not target.exists():
+        try:
+            os.link(source, target)
+        except OSError:
+            # Filesystem without hardlinks: a copy is just as immutable
+            write_atomic(target, Path(source).read_bytes())
+    return target
+
+
+def load_retired(path=RETIRED_MANIFEST):
+    return load_site_manifest(path).get("entries", {})
+
+
+def save_retired(entries, path=RETIRED_MANIFEST):
+    data = json.dumps({"version": 1, "entries": dict(sorted(entries.items()))}, indent=2)
+    write_atomic(path, (data + "\n").encode())
+
+
+def save_deploy_ignore(entries, path=DEPLOY_IGNORE):
+    """Leave the logical files in ``entries`` out of the deploy."""
+    lines = [
+        "# Written by scripts/fingerprint-assets.py: these assets are served under",
+        "# their fingerprinted names (src/lib/asset-manifest.json)",
+        *(f"/public{logical}" for logical in sorted(entries)),
+    ]
+    write_atomic(path, ("\n".join(lines) + "\n").encode())
+
+
+def fingerprint_all(retention=RETENTION, now=None):
+    """Publish every asset under its fingerprinted name and update the manifest.
+
+    Fingerprinted files that are no longer current are deleted once they
+    have been retired for ``retention`` seconds. Returns (published,
+    unchanged, removed) lists of public paths.
+    """
+    now = time.time() if now is None else now
+    entries = load_site_manifest(SITE_MANIFEST)
+    retired = load_retired()
+
+    published, unchanged = [], []
+    live = set()
+    for source in _assets(fingerprinted=False):
+        logical = public_path(source)
+        live.add(logical)
+        current = public_path(publish(source))
+        if entries.get(logical) == current:
+            unchanged.append(logical)
+            continue
+        entries[logical] = current
+        retired.pop(current, None)
+        published.append(logical)
+        print(f"  ✓ {logical} -> {current}")
+
+    # Forget assets that were deleted; their names age out like any other
+    for logical in [logical for logical in entries if logical not in live]:
+        del entries[logical]
+
+    current = set(entries.values())
+    removed = []
+    for path in _assets(fingerprinted=True):
+        name = public_path(path)
+        if name in current:
+            retired.pop(name, None)
+            continue
+        since = retired.setdefault(name, int(now))
+        if now - since >= retention:
+            path.unlink()
+            del retired[name]
+            removed.append(name)
+            print(f"  - {name}: retired {(now - since) / 86400:.0f} days ago, removed")
+
+    # Retired files someone else already removed
+    for name in list(retired):
+        if not file_for(name).exists():
+            del retired[name]
+
+    save_site_manifest(entries, SITE_MANIFEST)
+    save_deploy_ignore(entries)
+    save_retired(retired)
+    return published, unchanged, removed
+
+
+def add_fingerprint_argument(parser):
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="Publish changed assets under content-hash names after the batch "
+             "(after --quantize and --transcode)",
+    )
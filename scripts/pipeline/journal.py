@@ -0,0 +1,94 @@
+"""
+Durable journal of submitted long-running operations (Veo videos).
+
+A Veo job is paid for at submit time and its result stays retrievable on the
+server for two days, but the operation name only lives in the submitting
+process. The journal writes every operation name to SQLite under
+``STATE_DIR`` as soon as it is returned, together with the job key it was
+submitted for, so a run that crashed or lost its network can re-attach to
+the operation and download the result instead of paying for it again.
+
+Statuses move ``submitted`` -> ``done`` -> ``saved``, or end in ``failed``
+(the operation finished without a result) or ``expired`` (the server no
+longer knows the operation).
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from .paths import STATE_DIR
+
+SUBMITTED = "submitted"
+DONE = "done"
+SAVED = "saved"
+FAILED = "failed"
+EXPIRED = "expired"
+
+# Operations can be fetched for two days; stay an hour clear of the edge
+OPERATION_TTL = 47 * 3600
+
+DEFAULT_STATE_FILE = STATE_DIR / "operations.sqlite"
+
+
+class OperationJournal:
+    """Operation names and statuses keyed by job key, persisted in SQLite."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get("GENAI_JOURNAL_DB", DEFAULT_STATE_FILE))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS operations ("
+                " operation TEXT PRIMARY KEY,"
+                " name TEXT NOT NULL,"
+                " job_key TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " submitted REAL NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS operations_job_key ON operations (job_key, submitted)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def submitted(self, operation, name, key):
+        """Record a freshly submitted operation for job ``key``."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO operations"
+                " (operation, name, job_key, status, submitted, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (operation, name, key, SUBMITTED, now, now),
+            )
+
+    def update(self, operation, status):
+        """Move ``operation`` to ``status``."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE operations SET status = ?, updated = ? WHERE operation = ?",
+                (status, time.time(), operation),
+            )
+
+    def live(self, key):
+        """Newest operation for ``key`` that is running or finished but unsaved.
+
+        Returns the operation name, or None if the job has to be submitted.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT operation FROM operations"
+                " WHERE job_key = ? AND status IN (?, ?) AND submitted > ?"
+                " ORDER BY submitted DESC LIMIT 1",
+                (key, SUBMITTED, DONE, time.time() - OPERATION_TTL),
+            ).fetchone()
+        return row[0] if row else None
+
+    def prune(self, max_age=7 * 24 * 3600):
+        """Forget operations older than ``max_age`` seconds."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM operations WHERE submitted < ?", (time.time() - max_age,))
@@ -0,0 +1,309 @@
+"""
+Spread generation across several API keys (one per Google Cloud project).
+
+Quotas are per project, so a single key caps the whole pipeline at one
+project's requests per minute. ``KeyPool`` holds one client per key and
+stands in for both the client and the ``RateLimiter`` in the batch scripts:
+
+- ``acquire`` / ``reserve`` take a token from whichever key has the most
+  budget left (each key has its own ``<model>@<key id>`` bucket) and route
+  the calling thread's next request to it. A helper thread sending a
+  request for a token its parent reserved takes the parent's key with
+  ``pinned`` / ``pin``.
+- ``backoff`` after a 429 blocks only the key that was rejected, until its
+  Retry-After window has passed; the other keys keep serving.
+- Operations, batch jobs and uploaded files live in the project that
+  created them, so follow-up calls (polls, downloads, deletes, batches that
+  reference an upload) go back to the owning key. Names the pool has not
+  seen (operations resumed from the journal) are tried against every key.
+- A context cache is created once per key. Requests naming it read the
+  copy in the project their token came from, so the budget and the traffic
+  stay spread over the keys.
+
+Keys are identified in bucket names and log lines by a short hash, never by
+the key itself.
+"""
+
+import hashlib
+import threading
+import time
+
+from .client import create_client
+from .ratelimit import RateLimiter
+
+
+def key_id(api_key):
+    """Short stable identifier for a key, safe to log."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:8]
+
+
+class _Key:
+    def __init__(self, api_key, client):
+        self.id = key_id(api_key)
+        self.client = client
+
+
+def _is_not_found(error):
+    return getattr(error, "code", None) == 404
+
+
+class KeyPool:
+    """Clients for several API keys with per-key budgets.
+
+    Usable wherever the scripts expect a client (``models``, ``operations``,
+    ``files``, ``batches``, ``caches``) and a limiter (``acquire``,
+    ``reserve``, ``backoff``, ``time_scale``). ``client_factory`` builds the
+    client for one key (``create_client`` by default).
+    """
+
+    def __init__(self, api_keys, limiter=None, client_factory=create_client):
+        if not api_keys:
+            raise ValueError("KeyPool needs at least one API key")
+        self.limiter = limiter or RateLimiter()
+        self.keys = [_Key(api_key, client_factory(api_key)) for api_key in api_keys]
+        self._local = threading.local()
+        self._owners = {}  # operation / batch / cache / file name or URI -> _Key
+        self._replicas = {}  # context cache name -> {key id: that key's copy}
+        self._lock = threading.Lock()
+
+        self.models = _Models(self)
+        self.operations = _Operations(self)
+        self.files = _Files(self)
+        self.batches = _Batches(self)
+        self.caches = _Caches(self)
+
+    @property
+    def clients(self):
+        return [key.client for key in self.keys]
+
+    @property
+    def time_scale(self):
+        return self.limiter.time_scale
+
+    def _bucket(self, model, key):
+        return f"{model}@{key.id}"
+
+    def _ranked(self, model):
+        """Keys by budget: unblocked first, then most tokens left."""
+        budgets = {key.id: self.limiter.remaining(self._bucket(model, key)) for key in self.keys}
+        return sorted(self.keys, key=lambda key: (budgets[key.id][0], -budgets[key.id][1]))
+
+    # -- limiter interface ---------------------------------------------------
+
+    def reserve(self, model):
+        """Take a token from the key with most budget left; otherwise return seconds to wait.
+
+        On success the calling thread's next request goes to that key.
+        """
+        waits = []
+        for key in self._ranked(model):
+            wait = self.limiter.reserve(self._bucket(model, key))
+            if not wait:
+                self._local.key = key
+                return 0.0
+            waits.append(wait)
+        return min(waits)
+
+    def acquire(self, model):
+        """Block until some key may send a request to ``model``. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self.reserve(model)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def backoff(self, model, error, attempt):
+        """Take the key that just got a 429 out of rotation for ``model``.
+
+        Returns seconds until any key can serve ``model`` again, which is
+        zero while other keys still have budget.
+        """
+        key = self._current()
+        delay = self.limiter.backoff(self._bucket(model, key), error, attempt)
+        if len(self.keys) > 1:
+            print(f"    Key {key.id} rate limited for {model}, paused {delay:.0f}s")
+        return min(self.limiter.remaining(self._bucket(model, other))[0] for other in self.keys)
+
+    # -- routing -------------------------------------------------------------
+
+    def _current(self):
+        """Key chosen by this thread's last reserve(), else the first key."""
+        key = getattr(self._local, "key", None)
+        return key if key is not None else self.keys[0]
+
+    def pinned(self):
+        """The key this thread's next request goes to; hand it to ``pin``."""
+        return self._current()
+
+    def pin(self, key):
+        """Route this thread's next request to ``key`` (reserved by another thread)."""
+        self._local.key = key
+
+    def _owner(self, name):
+        with self._lock:
+            return self._owners.get(name) if name else None
+
+    def _own(self, key, *names):
+        with self._lock:
+            for name in names:
+                if name:
+                    self._owners[name] = key
+
+    def _replica(self, name, key):
+        """``key``'s copy of context cache ``name``, if the pool created it."""
+        with self._lock:
+            return self._replicas.get(name, {}).get(key.id) if name else None
+
+    def _call(self, key, call):
+        self._local.key = key
+        return call(key.client)
+
+    def _call_owner(self, name, call):
+        """Send ``call`` to the key that owns ``name``, searching if unknown."""
+        key = self._owner(name)
+        if key is not None:
+            return self._call(key, call)
+        error = None
+        for key in self.keys:
+            try:
+                result = self._call(key, call)
+            except Exception as e:
+                if not _is_not_found(e):
+                    raise
+                error = e
+                continue
+            self._own(key, name)
+            return result
+        raise error
+
+
+class _Models:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def generate_content(self, model, contents, config=None):
+        key = self._pool._current()
+        cached_content = getattr(config, "cached_content", None)
+        replica = self._pool._replica(cached_content, key)
+        if replica:
+            config = config.model_copy(update={"cached_content": replica})
+        elif cached_content:
+            # A cache made outside the pool only exists in its own project
+            key = self._pool._owner(cached_content) or key
+        return self._pool._call(
+            key, lambda client: client.models.generate_content(model=model, contents=contents, config=config)
+        )
+
+    def generate_videos(self, model, **kwargs):
+        key = self._pool._current()
+        operation = self._pool._call(key, lambda client: client.models.generate_videos(model=model, **kwargs))
+        self._pool._own(key, operation.name)
+        return operation
+
+
+class _Operations:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def get(self, operation, config=None):
+        result = self._pool._call_owner(
+            operation.name, lambda client: client.operations.get(operation, config=config)
+        )
+        response = result.result or getattr(result, "response", None)
+        if result.done and response and response.generated_videos:
+            # Generated videos are downloaded with the key that made them
+            key = self._pool._owner(operation.name)
+            self._pool._own(key, *(video.video.uri for video in response.generated_videos if video.video))
+        return result
+
+
+class _Files:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def upload(self, file, config=None):
+        key = self._pool._current()
+        uploaded = self._pool._call(key, lambda client: client.files.upload(file=file, config=config))
+        self._pool._own(key, uploaded.name, uploaded.uri)
+        return uploaded
+
+    def download(self, file, config=None, **kwargs):
+        key = self._pool._owner(getattr(file, "uri", None)) or self._pool._current()
+        return self._pool._call(
+            key, lambda client: client.files.download(file=file, config=config, **kwargs)
+        )
+
+
+class _Batches:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def create(self, model, src, config=None):
+        # Requests that point at uploaded files must run in the uploading project
+        uris = [
+            part.file_data.file_uri
+            for request in src if not isinstance(request, dict)
+            for content in request.contents or [] if hasattr(content, "parts")
+            for part in content.parts or [] if getattr(part, "file_data", None)
+        ]
+        key = next((self._pool._owner(uri) for uri in uris if self._pool._owner(uri)), None)
+        key = key or self._pool._current()
+        batch = self._pool._call(key, lambda client: client.batches.create(model=model, src=src, config=config))
+        self._pool._own(key, batch.name)
+        return batch
+
+    def get(self, name, config=None):
+        return self._pool._call_owner(name, lambda client: client.batches.get(name=name, config=config))
+
+    def cancel(self, name, config=None):
+        return self._pool._call_owner(name, lambda client: client.batches.cancel(name=name, config=config))
+
+
+class _Caches:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def create(self, model, config=None):
+        """Create the cache in every key's project; returns the first key's copy.
+
+        If any key cannot create it, the copies made so far are deleted and
+        the error is raised (callers then send the prefix inline).
+        """
+        caches = []
+        try:
+            for key in self._pool.keys:
+                cache = self._pool._call(key, lambda client: client.caches.create(model=model, config=config))
+                self._pool._own(key, cache.name)
+                caches.append(cache)
+        except Exception:
+            for cache in caches:
+                try:
+                    self.delete(cache.name)
+                except Exception:
+                    pass
+            raise
+        with self._pool._lock:
+            self._pool._replicas[caches[0].name] = {
+                key.id: cache.name for key, cache in zip(self._pool.keys, caches)
+            }
+        return caches[0]
+
+    def _copies(self, name):
+        with self._pool._lock:
+            return list(self._pool._replicas.get(name, {}).values()) or [name]
+
+    def update(self, name, config=None):
+        results = [
+            self._pool._call_owner(copy, lambda client, copy=copy: client.caches.update(name=copy, config=config))
+            for copy in self._copies(name)
+        ]
+        return results[0]
+
+    def delete(self, name, config=None):
+        copies = self._copies(name)
+        for copy in copies:
+            self._pool._call_owner(copy, lambda client, copy=copy: client.caches.delete(name=copy, config=config))
+        with self._pool._lock:
+            self._pool._replicas.pop(name, None)
@@ -0,0 +1,180 @@
+"""
+Content-addressed generation manifest.
+
+Every generated asset is recorded with a key: a SHA-256 over everything that
+went into the request (model, prompt, generation settings and the bytes of any
+reference images). A batch run compares each spec's current key with the one
+recorded for its output and regenerates only the assets whose inputs changed.
+
+Manifests are small JSON files kept under ``STATE_DIR/manifests/``. They are
+local state, like the journal: a machine that has not generated an asset
+sees its existing output as untracked and records it without regenerating.
+
+File digests are remembered in ``STATE_DIR/digests.json`` by path, mtime and
+size, so planning a run where nothing changed costs a stat per file.
+
+Reference files rewritten by the brand-palette quantizer (``pipeline.palette``)
+enter keys under the digest of the file they replaced, so optimizing a
+reference or start frame does not invalidate what was generated from it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .output import write_atomic
+from .paths import STATE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+MANIFESTS_DIR = STATE_DIR / "manifests"
+IMAGES_MANIFEST = MANIFESTS_DIR / "images.json"
+VIDEOS_MANIFEST = MANIFESTS_DIR / "videos.json"
+PALETTE_MANIFEST = MANIFESTS_DIR / "palette.json"
+DIGEST_CACHE = STATE_DIR / "digests.json"
+
+# Status values returned by Manifest.status()
+FRESH = "fresh"          # output exists and was generated from the current inputs
+MISSING = "missing"      # output does not exist yet
+STALE = "stale"          # output exists but its inputs have changed
+UNTRACKED = "untracked"  # output exists but was never recorded
+
+
+_digests = None  # path -> [mtime_ns, size, digest], loaded from DIGEST_CACHE
+_digests_lock = threading.Lock()
+
+
+def _digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_digests():
+    try:
+        with open(DIGEST_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, memoized per (path, mtime, size) across runs."""
+    global _digests
+    stat = os.stat(path)
+    name = os.path.abspath(path)
+    with _digests_lock:
+        if _digests is None:
+            _digests = _load_digests()
+        cached = _digests.get(name)
+    if cached and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+        return cached[2]
+
+    digest = _digest(path)
+    with _digests_lock:
+        _digests[name] = [stat.st_mtime_ns, stat.st_size, digest]
+        data = json.dumps(_digests, sort_keys=True)
+        try:
+            write_atomic(DIGEST_CACHE, (data + "\n").encode())
+        except OSError:
+            pass  # Read-only state dir: digests are just recomputed next run
+    return digest
+
+
+_aliases = (None, {})  # (palette manifest mtime, {quantized digest: original digest})
+
+
+def _original_digest(digest):
+    """Digest of the file a quantized file replaced, or ``digest`` itself."""
+    global _aliases
+    try:
+        mtime = os.stat(PALETTE_MANIFEST).st_mtime_ns
+    except FileNotFoundError:
+        return digest
+    if _aliases[0] != mtime:
+        with open(PALETTE_MANIFEST) as f:
+            entries = json.load(f).get("entries", {})
+        _aliases = (mtime, {e["digest"]: e["source"] for e in entries.values() if e.get("digest")})
+    return _aliases[1].get(digest, digest)
+
+
+def job_key(inputs, files=None):
+    """Hash a job's inputs into a stable cache key.
+
+    ``inputs`` is a JSON-serialisable dict of settings; ``files`` maps a label
+    to a reference file whose bytes are part of the job (``None`` for a
+    reference that is absent, which is itself part of the key).
+    """
+    payload = dict(inputs)
+    for label, path in sorted((files or {}).items()):
+        payload[f"file:{label}"] = (
+            _original_digest(file_digest(path)) if path and Path(path).exists() else None
+        )
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@contextmanager
+def _directory_lock(path):
+    """Exclusive lock on ``path``'s directory, shared by every process."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+class Manifest:
+    """Output name -> generation key, persisted as JSON.
+
+    Safe to update from worker threads and from several processes (workers
+    sharing a queue); every ``record()`` merges what others have written and
+    rewrites the file atomically so an interrupted run keeps what it finished.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return {}
+        with open(self.path) as f:
+            return json.load(f).get("entries", {})
+
+    def status(self, output_path, key):
+        output_path = Path(output_path)
+        if not output_path.exists():
+            return MISSING
+        entry = self.entries.get(output_path.name)
+        if entry is None:
+            return UNTRACKED
+        return FRESH if entry["key"] == key else STALE
+
+    def record(self, output_path, key):
+        with self._lock, _directory_lock(self.path):
+            self.entries = {**self.entries, **self._load()}
+            self.entries[Path(output_path).name] = {
+                "key": key,
+                "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            self._save()
+
+    def _save(self):
+        data = json.dumps({"version": 1, "entries": self.entries}, indent=2, sort_keys=True)
+        write_atomic(self.path, (data + "\n").encode())
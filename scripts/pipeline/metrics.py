@@ -0,0 +1,242 @@
+"""
+Per-job timing and throughput metrics for the generation scripts.
+
+Every image or video job gets a ``JobMetrics`` record with:
+
+- ``queue_wait``: seconds from being queued until its first request went out
+  (worker pool, rate limiter and start-frame dependency all count)
+- ``submit_latency``: round trip of the call that started a Veo operation
+- ``generation_time``: seconds the model spent producing the asset (the
+  image request itself, or submit-to-done for a Veo operation)
+- ``polls``: ``operations.get`` calls for the job
+- ``download_time`` / ``bytes``: fetching and writing the asset
+- ``retries`` and the final ``status``
+
+``RunMetrics`` appends each finished job as one JSON line to
+``STATE_DIR/metrics/<script>-<timestamp>.jsonl`` (directory overridable with
+``GENAI_METRICS_DIR``), prints p50/p95/max per model and aspect ratio at the
+end of the run, and, when ``GENAI_METRICS_TEXTFILE`` is set, writes the same
+summary in Prometheus text format for node_exporter's textfile collector.
+Each script gets its own file next to that path, named after it
+(``genai.prom`` -> ``genai-generate-batch.prom``), so one script's run does
+not replace another's metrics.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from .output import write_atomic
+from .paths import STATE_DIR
+
+METRICS_DIR = Path(os.environ.get("GENAI_METRICS_DIR", STATE_DIR / "metrics"))
+
+# Timing fields summarised per model / aspect ratio
+TIMINGS = ("total", "queue_wait", "submit_latency", "generation_time", "download_time")
+
+PROMETHEUS_HELP = {
+    "genai_job_seconds": "Per-job timings of the last generation run.",
+    "genai_jobs": "Jobs finished in the last generation run by status.",
+    "genai_job_retries": "Retries in the last generation run.",
+    "genai_job_polls": "Operation polls in the last generation run.",
+    "genai_job_bytes": "Bytes written in the last generation run.",
+    "genai_run_timestamp_seconds": "When the last generation run finished.",
+}
+
+
+def textfile_for(textfile, script):
+    """Per-script Prometheus textfile derived from ``GENAI_METRICS_TEXTFILE``."""
+    path = Path(textfile)
+    return path.with_name(f"{path.stem}-{script}{path.suffix or '.prom'}")
+
+
+def start_run(script):
+    """``RunMetrics`` writing to a fresh timestamped JSONL file for ``script``."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return RunMetrics(script, METRICS_DIR / f"{script}-{stamp}.jsonl")
+
+
+class JobMetrics:
+    """Measurements for one job; created by ``RunMetrics.job``."""
+
+    def __init__(self, name, model, aspect_ratio=None):
+        self.name = name
+        self.model = model
+        self.aspect_ratio = aspect_ratio
+        self.queued = time.monotonic()
+        self.queue_wait = None
+        self.submit_latency = None
+        self.generation_time = None
+        self.polls = 0
+        self.download_time = None
+        self.bytes = None
+        self.retries = 0
+        self.status = None
+        self.total = None
+        self._generation_started = None
+
+    def started(self):
+        """Mark the first request going out (later calls are ignored)."""
+        if self.queue_wait is None:
+            self.queue_wait = time.monotonic() - self.queued
+
+    @contextmanager
+    def timed(self, field):
+        """Add the duration of the ``with`` block to ``field``."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            setattr(self, field, (getattr(self, field) or 0.0) + time.monotonic() - start)
+
+    def generation_started(self):
+        self._generation_started = time.monotonic()
+
+    def generation_finished(self):
+        if self._generation_started is not None:
+            self.generation_time = time.monotonic() - self._generation_started
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "model": self.model,
+            "aspect_ratio": self.aspect_ratio,
+            "status": self.status,
+            "total": _round(self.total),
+            "queue_wait": _round(self.queue_wait),
+            "submit_latency": _round(self.submit_latency),
+            "generation_time": _round(self.generation_time),
+            "polls": self.polls,
+            "download_time": _round(self.download_time),
+            "bytes": self.bytes,
+            "retries": self.retries,
+        }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class RunMetrics:
+    """Collects ``JobMetrics`` for a run and exports them.
+
+    With ``path=None`` records are only kept in memory; ``start_run`` gives
+    the usual per-run JSONL file. Thread-safe: image jobs finish on worker
+    threads.
+    """
+
+    def __init__(self, script, path=None, textfile=None):
+        self.script = script
+        self.path = Path(path) if path else None
+        if textfile is None and os.environ.get("GENAI_METRICS_TEXTFILE"):
+            textfile = textfile_for(os.environ["GENAI_METRICS_TEXTFILE"], script)
+        self.textfile = textfile
+        self.jobs = []
+        self._lock = threading.Lock()
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def job(self, name, model, aspect_ratio=None):
+        """Start tracking a job (its queue wait starts now)."""
+        return JobMetrics(name, model, aspect_ratio)
+
+    def finish(self, job, status, output_path=None):
+        """Record the final status of ``job`` and append it to the JSONL file."""
+        job.status = status
+        job.total = time.monotonic() - job.queued
+        if output_path is not None and job.bytes is None:
+            try:
+                job.bytes = Path(output_path).stat().st_size
+            except OSError:
+                pass
+
+        line = json.dumps({"script": self.script, "time": time.time(), **job.as_dict()})
+        with self._lock:
+            self.jobs.append(job)
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(line + "\n")
+
+    def summary(self):
+        """{(model, aspect_ratio): {"count", "ok", field: (p50, p95, max), ...}}."""
+        groups = {}
+        with self._lock:
+            jobs = list(self.jobs)
+        for job in jobs:
+            groups.setdefault((job.model, job.aspect_ratio or "-"), []).append(job)
+
+        summary = {}
+        for group, members in sorted(groups.items()):
+            stats = {
+                "count": len(members),
+                "ok": sum(1 for job in members if job.status == "ok"),
+                "retries": sum(job.retries for job in members),
+                "polls": sum(job.polls for job in members),
+                "bytes": sum(job.bytes or 0 for job in members),
+            }
+            for field in TIMINGS:
+                values = [getattr(job, field) for job in members if getattr(job, field) is not None]
+                if values:
+                    stats[field] = (percentile(values, 0.5), percentile(values, 0.95), max(values))
+            summary[group] = stats
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"\nTimings (p50 / p95 / max seconds):")
+        for (model, aspect_ratio), stats in summary.items():
+            print(f"  {model} {aspect_ratio}: {stats['ok']}/{stats['count']} ok, "
+                  f"{stats['retries']} retries, {stats['polls']} polls")
+            for field in TIMINGS:
+                if field in stats:
+                    p50, p95, high = stats[field]
+                    print(f"    {field:<16} {p50:8.1f} {p95:8.1f} {high:8.1f}")
+        if self.path:
+            print(f"  Per-job metrics: {self.path}")
+
+    def write_textfile(self):
+        """Write the run summary in Prometheus text exposition format."""
+        if not self.textfile:
+            return None
+        # Samples of one metric family must be contiguous
+        families = {name: [] for name in PROMETHEUS_HELP}
+        for (model, aspect_ratio), stats in self.summary().items():
+            labels = f'script="{self.script}",model="{model}",aspect_ratio="{aspect_ratio}"'
+            for field in TIMINGS:
+                if field in stats:
+                    for quantile, value in zip(("0.5", "0.95", "1"), stats[field]):
+                        families["genai_job_seconds"].append(
+                            f'{{{labels},stage="{field}",quantile="{quantile}"}} {value:.3f}'
+                        )
+            families["genai_jobs"] += [
+                f'{{{labels},status="ok"}} {stats["ok"]}',
+                f'{{{labels},status="failed"}} {stats["count"] - stats["ok"]}',
+            ]
+            families["genai_job_retries"].append(f"{{{labels}}} {stats['retries']}")
+            families["genai_job_polls"].append(f"{{{labels}}} {stats['polls']}")
+            families["genai_job_bytes"].append(f"{{{labels}}} {stats['bytes']}")
+        families["genai_run_timestamp_seconds"].append(f'{{script="{self.script}"}} {time.time():.0f}')
+
+        lines = []
+        for name, samples in families.items():
+            lines += [f"# HELP {name} {PROMETHEUS_HELP[name]}", f"# TYPE {name} gauge"]
+            lines += [name + sample for sample in samples]
+        return write_atomic(Path(self.textfile), ("\n".join(lines) + "\n").encode())
+
+    def close(self):
+        """Print the summary and write the Prometheus textfile, if configured."""
+        self.print_summary()
+        self.write_textfile()
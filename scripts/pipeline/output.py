@@ -0,0 +1,88 @@
+"""
+Crash-safe output writing for generated assets.
+
+Assets are written to a hidden temporary file in the target directory,
+fsynced, and atomically renamed into place, so a run killed mid-write never
+leaves a truncated file under the final name. Bytes from the API are written
+as-is: no decode/re-encode round trip through PIL.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+TEMP_SUFFIX = ".partial"
+
+DEFAULT_MODE = 0o644
+
+# Leftover temp files older than this are from dead runs and safe to delete
+STALE_TEMP_AGE = 3600
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories cannot be opened
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def open_atomic(path, mode="wb"):
+    """Open a binary file that only appears at ``path`` once fully written.
+
+    ``mode`` may be ``"w+b"`` to read back what was written before it lands;
+    the file's ``name`` is the temporary path, for tools that need one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=TEMP_SUFFIX)
+    os.close(fd)
+    try:
+        with open(tmp, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the usual mode for served assets
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = DEFAULT_MODE
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` atomically. Returns ``path``."""
+    with open_atomic(path) as f:
+        f.write(data)
+    return Path(path)
+
+
+def clean_partial(directory, max_age=STALE_TEMP_AGE):
+    """Remove temp files left behind by runs that died mid-write."""
+    cutoff = time.time() - max_age
+    for tmp in Path(directory).glob(f".*{TEMP_SUFFIX}"):
+        try:
+            if tmp.stat().st_mtime < cutoff:
+                tmp.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def save_image_part(part, path):
+    """Write an image part's inline bytes exactly as the model returned them."""
+    return write_atomic(path, part.inline_data.data)
+
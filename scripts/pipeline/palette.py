@@ -0,0 +1,294 @@
+"""
+Brand-palette quantization of the flat-vector images in ``public/images``.
+
+The illustrations are drawn from a handful of brand colours (``BRAND_COLORS``)
+plus black outlines, but arrive from the model as 24-bit PNGs full of
+near-duplicate shades. ``quantize_image`` rewrites one as an indexed 8-bit
+PNG, using NumPy over the image's distinct colours rather than per pixel:
+
+- colours within ``SNAP_DISTANCE`` (RGB Euclidean) of a brand colour are
+  snapped to its exact hex value, so every image shares the same Van Blue,
+  Cream, Mustard, Coral and Sage;
+- the remaining colours (anti-aliased edges, shading) get an adaptive
+  palette that fills the rest of the 256 entries: weighted k-means over a
+  5-bit-per-channel colour histogram, seeded with its busiest bins;
+- the result is measured against the original (PSNR over every pixel) and
+  refused, leaving the source untouched, below ``MIN_PSNR`` dB.
+
+Images with partial transparency keep it (the palette carries alpha; only
+opaque pixels snap to brand colours).
+
+``STATE_DIR/manifests/palette.json`` records each quantized file's digest and
+the digest of the file it replaced. Refused images get an entry too
+(``"refused": true``). An image is redone or retried only when its bytes no
+longer match (e.g. it was regenerated) or the settings changed, and
+generation keys treat a quantized file like its original
+(``pipeline.manifest``), so quantizing a reference or start frame does not
+make everything generated from it stale.
+"""
+
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .fingerprint import is_fingerprinted
+from .manifest import PALETTE_MANIFEST, file_digest
+from .output import write_atomic
+from .paths import IMAGES_DIR
+
+BRAND_COLORS = {
+    "van-blue": "#2872A6",
+    "cream": "#F5F0D7",
+    "mustard": "#E0C06A",
+    "coral": "#E07A5F",
+    "sage": "#81B29A",
+    "black": "#000000",
+}
+
+MAX_COLORS = 256
+SNAP_DISTANCE = 16.0
+MIN_PSNR = 32.0
+
+# Adaptive palette: histogram bits per channel and k-means rounds
+HISTOGRAM_BITS = 5
+KMEANS_ROUNDS = 8
+
+# Rows per block when matching colours to the palette (bounds memory)
+MATCH_BLOCK = 1 << 15
+
+
+class PaletteError(Exception):
+    """The quantized image is too far from the original to replace it."""
+
+    def __init__(self, message, psnr=None):
+        super().__init__(message)
+        self.psnr = psnr
+
+
+def brand_rgb():
+    """Brand colours as a list of (r, g, b) tuples, in ``BRAND_COLORS`` order."""
+    return [tuple(int(value[i:i + 2], 16) for i in (1, 3, 5)) for value in BRAND_COLORS.values()]
+
+
+def settings_hash(snap_distance=SNAP_DISTANCE, min_psnr=MIN_PSNR):
+    encoded = json.dumps({
+        "brand": BRAND_COLORS, "max_colors": MAX_COLORS, "snap": snap_distance,
+        "min_psnr": min_psnr, "bits": HISTOGRAM_BITS, "rounds": KMEANS_ROUNDS,
+    }, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def _nearest(colors, palette):
+    """Index of the nearest ``palette`` row for each row of ``colors``, and its distance."""
+    import numpy as np
+
+    index = np.empty(len(colors), dtype=np.intp)
+    distance = np.empty(len(colors), dtype=np.float32)
+    palette_sq = (palette * palette).sum(axis=1)
+    for start in range(0, len(colors), MATCH_BLOCK):
+        block = colors[start:start + MATCH_BLOCK]
+        # |c - p|^2 = |c|^2 - 2 c.p + |p|^2, without a (block, palette, channels) array
+        d2 = (block * block).sum(axis=1)[:, None] - 2 * block @ palette.T + palette_sq
+        index[start:start + MATCH_BLOCK] = d2.argmin(axis=1)
+        distance[start:start + MATCH_BLOCK] = np.sqrt(np.maximum(d2.min(axis=1), 0))
+    return index, distance
+
+
+def _adaptive_palette(colors, counts, size):
+    """Up to ``size`` weighted k-means centres for ``colors`` (float rows)."""
+    import numpy as np
+
+    if len(colors) <= size:
+        return colors
+
+    # Collapse to a coarse histogram: k-means over bins, not every shade
+    shift = 8 - HISTOGRAM_BITS
+    bins = colors.astype(np.int64) >> shift
+    bin_key = np.zeros(len(colors), dtype=np.int64)
+    for channel in range(colors.shape[1]):
+        bin_key = (bin_key << HISTOGRAM_BITS) | bins[:, channel]
+    _, bin_of, = np.unique(bin_key, return_inverse=True)
+    weights = np.bincount(bin_of, weights=counts)
+    means = np.stack([
+        np.bincount(bin_of, weights=colors[:, c] * counts) / weights
+        for c in range(colors.shape[1])
+    ], axis=1)
+    if len(means) <= size:
+        return means
+
+    centres = means[np.argsort(weights)[::-1][:size]].copy()
+    for _ in range(KMEANS_ROUNDS):
+        assigned, _ = _nearest(means, centres)
+        totals = np.bincount(assigned, weights=weights, minlength=size)
+        used = totals > 0
+        for c in range(means.shape[1]):
+            sums = np.bincount(assigned, weights=means[:, c] * weights, minlength=size)
+            centres[used, c] = sums[used] / totals[used]
+    return centres
+
+
+def quantize_image(source, snap_distance=SNAP_DISTANCE, min_psnr=MIN_PSNR):
+    """Rewrite one PNG as an indexed brand-palette PNG (runs in a worker process).
+
+    Returns the manifest entry; raises PaletteError if the result would be
+    below ``min_psnr``. A result that is not smaller leaves the file as is.
+    """
+    import numpy as np
+    from PIL import Image
+
+    source = Path(source)
+    original = source.read_bytes()
+    with Image.open(io.BytesIO(original)) as image:
+        image.load()
+    rgba = np.asarray(image.convert("RGBA"))
+    height, width = rgba.shape[:2]
+    alpha = bool((rgba[..., 3] < 255).any())
+    channels = 4 if alpha else 3
+    pixels = rgba[..., :channels].reshape(-1, channels)
+
+    # Work on distinct colours; flat art has far fewer of them than pixels
+    packed = np.zeros(len(pixels), dtype=np.uint32)
+    for c in range(channels):
+        packed = (packed << 8) | pixels[:, c]
+    unique, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+    colors = np.stack(
+        [(unique >> (8 * (channels - 1 - c))) & 0xFF for c in range(channels)], axis=1
+    ).astype(np.float32)
+
+    brand = np.array(brand_rgb(), dtype=np.float32)
+    if alpha:
+        brand = np.hstack([brand, np.full((len(brand), 1), 255, dtype=np.float32)])
+    brand_index, brand_distance = _nearest(colors[:, :3], brand[:, :3])
+    snapped = brand_distance <= snap_distance
+    if alpha:
+        snapped &= colors[:, 3] == 255
+
+    rest = ~snapped
+    adaptive = _adaptive_palette(colors[rest], counts[rest].astype(np.float64), MAX_COLORS - len(brand))
+    palette = np.vstack([brand, np.asarray(adaptive, dtype=np.float32).reshape(-1, channels)])
+    palette = np.clip(np.rint(palette), 0, 255)
+
+    index = np.where(snapped, brand_index, 0)
+    if rest.any():
+        index[rest] = _nearest(colors[rest], palette)[0]
+
+    # Drop entries nothing maps to, keeping brand colours first
+    used = np.unique(index)
+    remap = np.zeros(len(palette), dtype=np.intp)
+    remap[used] = np.arange(len(used))
+    palette, index = palette[used], remap[index]
+
+    error = ((colors - palette[index]) ** 2).sum(axis=1) @ counts / (len(pixels) * channels)
+    psnr = float("inf") if error == 0 else 10 * np.log10(255 ** 2 / error)
+    if psnr < min_psnr:
+        raise PaletteError(f"PSNR {psnr:.1f} dB is below {min_psnr:.1f} dB, left as is", psnr)
+
+    out = Image.fromarray(index[inverse].reshape(height, width).astype(np.uint8), "P")
+    out.putpalette(palette[:, :3].astype(np.uint8).tobytes())
+    save_options = {"optimize": True}
+    if alpha:
+        save_options["transparency"] = palette[:, 3].astype(np.uint8).tobytes()
+    buffer = io.BytesIO()
+    out.save(buffer, format="PNG", **save_options)
+    data = buffer.getvalue()
+
+    entry = {
+        "source": hashlib.sha256(original).hexdigest(),
+        "settings": settings_hash(snap_distance, min_psnr),
+        "colors": len(palette),
+        "psnr": round(psnr, 1) if psnr != float("inf") else None,
+        "brand_share": round(float(counts[snapped].sum()) / len(pixels), 3),
+        "bytes_before": len(original),
+        "bytes_after": min(len(data), len(original)),
+    }
+    if len(data) < len(original):
+        write_atomic(source, data)
+        entry["digest"] = hashlib.sha256(data).hexdigest()
+    else:
+        entry["digest"] = entry["source"]
+    return entry
+
+
+def load_palette_manifest(path=PALETTE_MANIFEST):
+    if Path(path).exists():
+        with open(path) as f:
+            return json.load(f).get("entries", {})
+    return {}
+
+
+def save_palette_manifest(entries, path=PALETTE_MANIFEST):
+    data = json.dumps({"version": 1, "entries": dict(sorted(entries.items()))}, indent=2)
+    write_atomic(path, (data + "\n").encode())
+
+
+def is_current(entry, source, settings):
+    """True if ``source`` is the file ``entry`` wrote, with ``settings``."""
+    return bool(entry) and entry.get("settings") == settings and entry.get("digest") == file_digest(source)
+
+
+def quantize_all(sources=None, workers=None, force=False, snap_distance=SNAP_DISTANCE,
+                 min_psnr=MIN_PSNR):
+    """Quantize ``sources`` (default: every PNG) that are not already done.
+
+    Returns (quantized, skipped, refused, failed) lists of source names.
+    Images refused for too much error are left untouched and not retried
+    until they change; ``refused`` lists them whether that happened in
+    this run or an earlier one.
+    """
+    settings = settings_hash(snap_distance, min_psnr)
+    all_sources = sorted(s for s in IMAGES_DIR.glob("*.png") if not is_fingerprinted(s))
+    sources = [Path(s) for s in sources] if sources else all_sources
+
+    entries = load_palette_manifest()
+    live = {s.name for s in all_sources}
+    for name in [name for name in entries if name not in live]:
+        del entries[name]
+
+    todo, skipped, refused = [], [], []
+    for source in sources:
+        entry = entries.get(source.name)
+        if force or not is_current(entry, source, settings):
+            todo.append(source)
+        elif entry.get("refused"):
+            refused.append(source.name)
+        else:
+            skipped.append(source.name)
+
+    quantized, failed = [], []
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {
+                pool.submit(quantize_image, source, snap_distance, min_psnr): source for source in todo
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    entry = future.result()
+                except PaletteError as e:
+                    print(f"  - {source.name}: refused, {e}")
+                    digest = file_digest(source)
+                    entry = {"source": digest, "settings": settings, "digest": digest,
+                             "refused": True, "psnr": round(e.psnr, 1)}
+                    refused.append(source.name)
+                except Exception as e:
+                    print(f"  ✗ {source.name}: {e}")
+                    failed.append(source.name)
+                    continue
+
+                previous = entries.get(source.name)
+                if previous and previous.get("digest") == entry["source"]:
+                    # Re-quantizing our own output: keep pointing at the original
+                    entry["source"] = previous["source"]
+                entries[source.name] = entry
+                if entry.get("refused"):
+                    continue
+                print(f"  ✓ {source.name}: {entry['bytes_before'] / 1024:.0f} KB -> "
+                      f"{entry['bytes_after'] / 1024:.0f} KB, {entry['colors']} colours, "
+                      f"{entry['psnr'] or 'lossless'} dB, {entry['brand_share']:.0%} brand")
+                quantized.append(source.name)
+
+    save_palette_manifest(entries)
+    return quantized, skipped, refused, failed
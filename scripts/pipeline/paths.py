@@ -0,0 +1,15 @@
+"""
+Common locations used by the generation scripts.
+"""
+
+import os
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+
+IMAGES_DIR = PROJECT_ROOT / "public" / "images"
+VIDEOS_DIR = PROJECT_ROOT / "public" / "videos"
+
+# Machine-local state shared by concurrent runs (rate limits, journals, ...)
+STATE_DIR = Path(os.environ.get("GENAI_STATE_DIR", PROJECT_ROOT / ".cache" / "genai"))
@@ -0,0 +1,159 @@
+"""
+History-driven polling for long-running Veo operations.
+
+A fixed poll interval is wrong both ways: a one-minute job is noticed up to
+a whole interval late, and a six-minute job burns a dozen ``operations.get``
+calls while nothing can have changed. Instead, every finished operation
+records how long it took in ``STATE_DIR/polls.sqlite`` (overridable with
+``GENAI_POLL_DB``), keyed by model, clip duration and resolution. Recent
+completions are fitted with a log-normal distribution and each new
+operation is polled on a schedule derived from it:
+
+- quiet until the expected completion window opens (the 5th percentile),
+- inside the window, at intervals set by how likely the job is to finish
+  next (``sqrt(2 * POLL_COST / hazard)``, the classic inspection-interval
+  rule): dense around the typical completion time, sparser away from it,
+- backing off geometrically once the job runs past the 95th percentile,
+  because then the server is clearly slow and polling harder will not
+  speed it up.
+
+Without enough history for a (model, duration, resolution) the fit falls
+back to all durations of the model, then to ``DEFAULT_FIT``.
+
+All times are in API seconds; ``time_scale`` converts them for the local
+stand-in, like the rate limiter does.
+"""
+
+import math
+import os
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+from .paths import STATE_DIR
+
+DEFAULT_STATE_FILE = STATE_DIR / "polls.sqlite"
+
+# Log-normal (median seconds, sigma) of completion times without history
+DEFAULT_FIT = (100.0, 0.5)
+
+# Recent completions considered, and how many make a fit trustworthy
+HISTORY_SIZE = 50
+MIN_SAMPLES = 5
+MIN_SIGMA = 0.1
+
+# Standard-normal quantiles that open and close the window (5th / 95th)
+WINDOW_Z = (-1.645, 1.645)
+
+# Detection delay (seconds) one poll is worth; higher means fewer polls
+POLL_COST = 1.0
+
+# Bounds on the interval, and the growth per poll past the window
+MIN_INTERVAL = 3.0
+MAX_INTERVAL = 60.0
+BACKOFF_FACTOR = 1.5
+
+
+class PollHistory:
+    """Completion times of finished operations, persisted in SQLite."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get("GENAI_POLL_DB", DEFAULT_STATE_FILE))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " model TEXT NOT NULL,"
+                " duration INTEGER NOT NULL,"
+                " resolution TEXT NOT NULL,"
+                " seconds REAL NOT NULL,"
+                " recorded REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS completions_model ON completions (model, recorded)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def record(self, model, duration, resolution, seconds):
+        """Remember that an operation took ``seconds`` from submission to done."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO completions (model, duration, resolution, seconds, recorded)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (model, duration, resolution, seconds, time.time()),
+            )
+
+    def fit(self, model, duration, resolution):
+        """Log-normal (median seconds, sigma) of recent completion times."""
+        with self._connect() as conn:
+            for where, params in (
+                ("model = ? AND duration = ? AND resolution = ?", (model, duration, resolution)),
+                ("model = ?", (model,)),
+            ):
+                logs = [math.log(max(row[0], 1.0)) for row in conn.execute(
+                    f"SELECT seconds FROM completions WHERE {where}"
+                    " ORDER BY recorded DESC LIMIT ?",
+                    (*params, HISTORY_SIZE),
+                )]
+                if len(logs) >= MIN_SAMPLES:
+                    return math.exp(statistics.fmean(logs)), max(statistics.stdev(logs), MIN_SIGMA)
+        return DEFAULT_FIT
+
+
+class PollSchedule:
+    """When to poll one operation next; advance it with ``polled()``."""
+
+    def __init__(self, fit, submitted, time_scale=1.0, quiet=True):
+        median, self.sigma = fit
+        self.mu = math.log(median)
+        self.opens, self.closes = (median * math.exp(z * self.sigma) for z in WINDOW_Z)
+        self.submitted = submitted
+        self.time_scale = time_scale
+        self._backoff = None
+        if quiet:
+            self.due_at = submitted + self.opens * time_scale
+        else:
+            # Re-attached operation of unknown age: poll now
+            self.due_at = submitted
+
+    def _hazard(self, elapsed):
+        """Chance per second of finishing now, given it has not finished yet."""
+        elapsed = max(elapsed, 1.0)
+        z = (math.log(elapsed) - self.mu) / self.sigma
+        density = math.exp(-z * z / 2) / (math.sqrt(2 * math.pi) * self.sigma * elapsed)
+        survival = 0.5 * math.erfc(z / math.sqrt(2))
+        return density / survival if survival > 0 else 0.0
+
+    def polled(self, now):
+        """Schedule the poll after one made at ``now`` found the job still running."""
+        elapsed = (now - self.submitted) / self.time_scale
+        if elapsed < self.opens:
+            interval = self.opens - elapsed
+        elif elapsed < self.closes:
+            hazard = self._hazard(elapsed)
+            interval = math.sqrt(2 * POLL_COST / hazard) if hazard > 0 else MAX_INTERVAL
+            self._backoff = interval = min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+        else:
+            # Past the window: the server is slow, so poll less, not more
+            self._backoff = min((self._backoff or MIN_INTERVAL) * BACKOFF_FACTOR, MAX_INTERVAL)
+            interval = self._backoff
+        self.due_at = now + interval * self.time_scale
+
+
+class PollPolicy:
+    """Builds a ``PollSchedule`` per operation and feeds completions back."""
+
+    def __init__(self, history=None, time_scale=1.0):
+        self.history = history or PollHistory()
+        self.time_scale = time_scale
+
+    def schedule(self, model, duration, resolution, submitted, quiet=True):
+        fit = self.history.fit(model, duration, resolution)
+        return PollSchedule(fit, submitted, self.time_scale, quiet=quiet)
+
+    def finished(self, model, duration, resolution, seconds):
+        """Record a completion seen ``seconds`` (in this process's time) after submission."""
+        self.history.record(model, duration, resolution, seconds / self.time_scale)
@@ -0,0 +1,338 @@
+"""
+Brand-compliance QA for generated images and videos.
+
+``ImageQA`` scores an image with NumPy on a copy downscaled to
+``ANALYSIS_SIDE`` pixels:
+
+- ``background``: RGB distance between the median colour of the outer
+  ``BORDER`` frame and Cream (#F5F0D7), checked when the prompt asks for a
+  cream background;
+- ``van_blue``: share of the foreground (pixels that differ from the
+  background) within ``COLOR_TOLERANCE`` of Van Blue, checked when the
+  prompt names Van Blue. The foreground stands in for the bus region; a bus
+  in the wrong colour leaves almost no Van Blue in it;
+- ``drift``: share of all pixels farther than ``COLOR_TOLERANCE`` from
+  every brand colour;
+- ``similarity``: intersection of the foreground colour histograms of the
+  image and ``hero-bus-front.png`` (1.0 for the same colour mix).
+
+The thresholds are set below what every image in ``public/images`` that
+was accepted by review scores, so a failure means something is clearly off.
+``QAReport.score`` ranks candidates of the same image: the mean margin of
+each check relative to its threshold.
+
+``VideoQA`` decodes a sparse sample of frames (``VIDEO_FPS`` per second at
+``VIDEO_SIDE`` pixels square) with ffmpeg and compares them with the clip's
+start frame:
+
+- ``start_ssim`` and ``start_phash``: structural similarity and
+  perceptual-hash distance (of 64 bits) between the first frame and the
+  start frame; a clip that ignores its start frame fails both;
+- ``palette``: largest colour-histogram distance (1 - intersection) of any
+  frame from the start frame, for clips that drift off-palette;
+- ``max_change``: largest mean absolute difference between consecutive
+  sampled frames; a hard cut to another scene scores about 0.2, while
+  the accepted clips move by at most 0.12.
+
+Text-to-video clips have no start frame and get only the cut check. Forbidden
+content (text, faces) is not something these statistics can see; the
+negative prompt remains the guard for that.
+
+``check`` raises ``RejectedOutputError`` for an asset that fails, so the retry
+policies regenerate it (``errors.REJECTED``). The best rejected candidate of
+each asset that ends up failing is kept in ``STATE_DIR/qa-rejected`` for
+review. A ``VideoQA`` with ``resubmit=False`` only flags failing clips and
+lets them through.
+"""
+
+import io
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+from .errors import RejectedOutputError
+from .output import write_atomic
+from .palette import BRAND_COLORS, brand_rgb
+from .paths import IMAGES_DIR, STATE_DIR
+
+REFERENCE_IMAGE = IMAGES_DIR / "hero-bus-front.png"
+REJECTS_DIR = STATE_DIR / "qa-rejected"
+
+ANALYSIS_SIDE = 256
+BORDER = 0.03
+
+# RGB distances: "is this brand colour" and "differs from the background"
+COLOR_TOLERANCE = 40.0
+FOREGROUND_DISTANCE = 40.0
+
+# Bits per channel of the similarity histogram
+HISTOGRAM_BITS = 3
+
+# Video frame sampling
+VIDEO_FPS = 2
+VIDEO_SIDE = 128
+
+# name: (threshold, higher is better, margin that counts as a full point)
+THRESHOLDS = {
+    "background": (24.0, False, 24.0),
+    "van_blue": (0.03, True, 0.2),
+    "drift": (0.55, False, 0.3),
+    "similarity": (0.25, True, 0.4),
+    "start_ssim": (0.35, True, 0.4),
+    "start_phash": (24, False, 16),
+    "palette": (0.75, False, 0.5),
+    "max_change": (0.15, False, 0.1),
+}
+
+# Prompt lines that turn on the colour-specific checks
+CREAM_BACKGROUND = re.compile(r"background.*" + BRAND_COLORS["cream"], re.IGNORECASE)
+VAN_BLUE = re.compile(BRAND_COLORS["van-blue"], re.IGNORECASE)
+
+
+class QAReport:
+    """Measured value per check for one image, with pass/fail and an overall score."""
+
+    def __init__(self, values):
+        self.values = values
+
+    @property
+    def failures(self):
+        return [name for name, value in self.values.items() if not _passes(name, value)]
+
+    @property
+    def passed(self):
+        return not self.failures
+
+    @property
+    def score(self):
+        margins = []
+        for name, value in self.values.items():
+            threshold, higher, scale = THRESHOLDS[name]
+            margin = (value - threshold) if higher else (threshold - value)
+            margins.append(max(-1.0, min(margin / scale, 1.0)))
+        return sum(margins) / len(margins)
+
+    def __str__(self):
+        return ", ".join(
+            f"{name} {value:.2f}{'' if _passes(name, value) else ' ✗'}"
+            for name, value in self.values.items()
+        )
+
+
+def _passes(name, value):
+    threshold, higher, _ = THRESHOLDS[name]
+    return value >= threshold if higher else value <= threshold
+
+
+def _pixels(image):
+    """Float RGB array of ``image`` (PIL) scaled down for analysis."""
+    import numpy as np
+
+    image = image.convert("RGB")
+    image.thumbnail((ANALYSIS_SIDE, ANALYSIS_SIDE))
+    return np.asarray(image, dtype=np.float32)
+
+
+def _background(pixels):
+    """Median colour of the outer frame."""
+    import numpy as np
+
+    height, width = pixels.shape[:2]
+    m = max(1, int(min(height, width) * BORDER))
+    frame = np.concatenate([
+        pixels[:m].reshape(-1, 3), pixels[-m:].reshape(-1, 3),
+        pixels[:, :m].reshape(-1, 3), pixels[:, -m:].reshape(-1, 3),
+    ])
+    return np.median(frame, axis=0)
+
+
+def _foreground(pixels, background):
+    import numpy as np
+
+    flat = pixels.reshape(-1, 3)
+    return flat[np.linalg.norm(flat - background, axis=1) > FOREGROUND_DISTANCE]
+
+
+def _histogram(colors):
+    import numpy as np
+
+    bins = colors.astype(np.int64) >> (8 - HISTOGRAM_BITS)
+    index = (bins[:, 0] << 2 * HISTOGRAM_BITS) | (bins[:, 1] << HISTOGRAM_BITS) | bins[:, 2]
+    counts = np.bincount(index, minlength=1 << 3 * HISTOGRAM_BITS).astype(np.float64)
+    return counts / max(counts.sum(), 1.0)
+
+
+class _Gate:
+    """Keeps the best rejected copy of each asset for review."""
+
+    def __init__(self, rejects_dir):
+        self.rejects_dir = Path(rejects_dir)
+        self._rejected = {}  # name -> best rejected score so far
+        self._lock = threading.Lock()
+
+    def _accept(self, name):
+        # An earlier rejected candidate is no longer worth reviewing
+        (self.rejects_dir / name).unlink(missing_ok=True)
+
+    def _reject(self, name, report, data):
+        with self._lock:
+            keep = report.score > self._rejected.get(name, float("-inf"))
+            if keep:
+                self._rejected[name] = report.score
+        if keep:
+            write_atomic(self.rejects_dir / name, data)
+        raise RejectedOutputError(f"Failed QA ({report})", report)
+
+
+class ImageQA(_Gate):
+    """Scores generated images; thread-safe, shared by a whole run."""
+
+    def __init__(self, reference=REFERENCE_IMAGE, rejects_dir=REJECTS_DIR):
+        super().__init__(rejects_dir)
+        self.reference = Path(reference)
+        self._reference_histogram = None
+
+    def _reference(self):
+        with self._lock:
+            if self._reference_histogram is None:
+                from PIL import Image
+
+                with Image.open(self.reference) as image:
+                    pixels = _pixels(image)
+                self._reference_histogram = _histogram(_foreground(pixels, _background(pixels)))
+            return self._reference_histogram
+
+    def score(self, data, prompt=""):
+        """QAReport for the encoded image ``data`` generated from ``prompt``."""
+        import numpy as np
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            pixels = _pixels(image)
+        brand = np.array(brand_rgb(), dtype=np.float32)
+        background = _background(pixels)
+        foreground = _foreground(pixels, background)
+        flat = pixels.reshape(-1, 3)
+        nearest = np.linalg.norm(flat[:, None, :] - brand[None], axis=2).min(axis=1)
+
+        values = {}
+        if CREAM_BACKGROUND.search(prompt):
+            values["background"] = float(np.linalg.norm(background - brand[1]))
+        if VAN_BLUE.search(prompt):
+            blue = np.linalg.norm(foreground - brand[0], axis=1) <= COLOR_TOLERANCE
+            values["van_blue"] = float(blue.mean()) if len(foreground) else 0.0
+        values["drift"] = float((nearest > COLOR_TOLERANCE).mean())
+        values["similarity"] = float(np.minimum(_histogram(foreground), self._reference()).sum())
+        return QAReport(values)
+
+    def check(self, name, data, prompt="", report=None):
+        """Return the QAReport of a passing image; raise RejectedOutputError otherwise.
+
+        ``report`` is a score already taken for ``data``, to avoid scoring twice.
+        """
+        report = report or self.score(data, prompt)
+        if not report.passed:
+            self._reject(name, report, data)
+        self._accept(name)
+        return report
+
+
+def _frames(clip):
+    """(frames, side, side, 3) float array sampled from ``clip`` with ffmpeg."""
+    import numpy as np
+
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(clip),
+         "-vf", f"fps={VIDEO_FPS},scale={VIDEO_SIDE}:{VIDEO_SIDE}:flags=area",
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:"],
+        check=True, capture_output=True,
+    )
+    frames = np.frombuffer(result.stdout, dtype=np.uint8)
+    return frames.reshape(-1, VIDEO_SIDE, VIDEO_SIDE, 3).astype(np.float32)
+
+
+def _gray(pixels):
+    import numpy as np
+
+    return pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _ssim(frames, reference, block=8):
+    """Mean SSIM over ``block``-pixel windows of each gray frame against ``reference``."""
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    n = VIDEO_SIDE // block
+
+    def windows(x):
+        return x.reshape(*x.shape[:-2], n, block, n, block)
+
+    a, b = windows(frames), windows(reference)[None]
+    mean_a, mean_b = a.mean(axis=(-3, -1)), b.mean(axis=(-3, -1))
+    var_a, var_b = a.var(axis=(-3, -1)), b.var(axis=(-3, -1))
+    centred_a = a - mean_a[..., :, None, :, None]
+    centred_b = b - mean_b[..., :, None, :, None]
+    cov = (centred_a * centred_b).mean(axis=(-3, -1))
+    ssim = ((2 * mean_a * mean_b + c1) * (2 * cov + c2)) / (
+        (mean_a ** 2 + mean_b ** 2 + c1) * (var_a + var_b + c2)
+    )
+    return ssim.mean(axis=(-2, -1))
+
+
+def _phash(gray, size=32, bits=8):
+    """64-bit perceptual hash (low DCT frequencies above their median) per gray frame."""
+    import numpy as np
+
+    k = VIDEO_SIDE // size
+    small = gray.reshape(*gray.shape[:-2], size, k, size, k).mean(axis=(-3, -1))
+    u, x = np.meshgrid(np.arange(size), np.arange(size), indexing="ij")
+    dct = np.cos(np.pi * (2 * x + 1) * u / (2 * size)).astype(np.float32)
+    low = (dct @ small @ dct.T)[..., :bits, :bits].reshape(*small.shape[:-2], bits * bits)
+    return low > np.median(low[..., 1:], axis=-1, keepdims=True)
+
+
+class VideoQA(_Gate):
+    """Scores generated clips against their start frames; thread-safe."""
+
+    def __init__(self, resubmit=True, rejects_dir=REJECTS_DIR):
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("ffmpeg not found on PATH (install it, e.g. `brew install ffmpeg`)")
+        super().__init__(rejects_dir)
+        self.resubmit = resubmit
+        self.flagged = {}  # name -> QAReport of clips let through despite failing
+
+    def score(self, clip, start_frame=None):
+        """QAReport for the clip file ``clip`` generated from image ``start_frame``."""
+        import numpy as np
+        from PIL import Image
+
+        frames = _frames(clip)
+        values = {}
+        if start_frame is not None and Path(start_frame).exists():
+            with Image.open(start_frame) as image:
+                still = image.convert("RGB").resize((VIDEO_SIDE, VIDEO_SIDE), Image.BOX)
+            still = np.asarray(still, dtype=np.float32)
+            gray, still_gray = _gray(frames[:1]), _gray(still)
+            values["start_ssim"] = float(_ssim(gray, still_gray)[0])
+            values["start_phash"] = int((_phash(gray)[0] != _phash(still_gray)).sum())
+            reference = _histogram(still.reshape(-1, 3))
+            values["palette"] = max(
+                1.0 - float(np.minimum(_histogram(frame.reshape(-1, 3)), reference).sum())
+                for frame in frames
+            )
+        change = np.abs(np.diff(frames, axis=0)).mean(axis=(1, 2, 3)) / 255
+        values["max_change"] = float(change.max()) if len(change) else 0.0
+        return QAReport(values)
+
+    def check(self, name, clip, start_frame=None):
+        """Return the clip's QAReport; a failing clip raises RejectedOutputError
+        (kept for review) or, without ``resubmit``, is only flagged."""
+        report = self.score(clip, start_frame)
+        if not report.passed:
+            if self.resubmit:
+                self._reject(f"{name}.mp4", report, Path(clip).read_bytes())
+            with self._lock:
+                self.flagged[name] = report
+        else:
+            self._accept(f"{name}.mp4")
+        return report
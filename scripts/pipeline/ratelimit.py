@@ -0,0 +1,220 @@
+"""
+Token-bucket rate limiter shared by every generation script.
+
+Each model gets its own requests-per-minute budget. Bucket state lives in a
+SQLite file under ``STATE_DIR`` so that several scripts running at once on the
+same machine draw from the same budget instead of each assuming it owns the
+whole quota.
+
+Budgets default to ``MODEL_BUDGETS`` and can be overridden per model with an
+environment variable named after the model, e.g.::
+
+    GENAI_RPM_GEMINI_2_5_FLASH_IMAGE=20
+    GENAI_RPM_VEO_3_1_GENERATE_PREVIEW=4
+
+Quotas belong to a project, so with several API keys (``pipeline.keypool``)
+each key gets its own bucket per model, named ``<model>@<key id>``; the
+budget is still looked up by the model name.
+"""
+
+import os
+import random
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from .paths import STATE_DIR
+
+# Requests per minute for each model we call (conservative free-tier values)
+MODEL_BUDGETS = {
+    "gemini-2.5-flash-image": 10,
+    "veo-3.1-generate-preview": 2,
+}
+DEFAULT_RPM = 10
+
+# Tokens a bucket can hold. The bucket refills at the full rate, so a bigger
+# burst lets up to BURST + RPM requests out in one 60-second window; with 1,
+# requests are spaced 60 / RPM seconds apart and a window never sees more
+# than RPM + 1.
+BURST = 1.0
+
+DEFAULT_STATE_FILE = STATE_DIR / "ratelimit.sqlite"
+
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+def budget_for(model):
+    """Requests per minute allowed for ``model`` (env override wins)."""
+    model = model.partition("@")[0]
+    env_name = "GENAI_RPM_" + re.sub(r"[^A-Za-z0-9]+", "_", model).upper()
+    value = os.environ.get(env_name)
+    if value:
+        return max(float(value), 0.1)
+    return float(MODEL_BUDGETS.get(model, DEFAULT_RPM))
+
+
+def is_rate_limited(error):
+    """True if an API error is a quota/rate-limit rejection."""
+    if getattr(error, "code", None) == 429:
+        return True
+    error_str = str(error)
+    return "429" in error_str or "RESOURCE_EXHAUSTED" in error_str
+
+
+def retry_after(error):
+    """Server-suggested wait in seconds for a rate-limited error, if any.
+
+    Looks at the HTTP ``Retry-After`` header first, then at the ``retryDelay``
+    field Gemini puts in its ``RetryInfo`` error details.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value:
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                pass
+
+    match = _RETRY_DELAY_RE.search(str(getattr(error, "details", None) or error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt, base=30.0, cap=600.0):
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RateLimiter:
+    """Per-model token buckets persisted in SQLite.
+
+    ``acquire()`` blocks until a request may be sent; ``reserve()`` is the
+    non-blocking form used by schedulers that have other work to do while
+    waiting. After a 429, ``backoff()`` pauses the model for every process
+    sharing the state file.
+
+    ``time_scale`` shrinks refill times and our own backoff delays (e.g. 0.01
+    for benchmarks against the stand-in).
+    """
+
+    def __init__(self, path=None, time_scale=1.0):
+        self.path = Path(path or os.environ.get("GENAI_RATELIMIT_DB", DEFAULT_STATE_FILE))
+        self.time_scale = time_scale
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " model TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " blocked_until REAL NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _update(self, model, take):
+        """Refill the bucket and optionally take a token, atomically.
+
+        Returns (seconds until a token is available, tokens left); the wait
+        is 0.0 if a token was taken.
+        """
+        rpm = budget_for(model)
+        capacity = BURST
+        rate = rpm / 60.0 / self.time_scale
+        now = time.time()
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated, blocked_until FROM buckets WHERE model = ?", (model,)
+            ).fetchone()
+            if row is None:
+                tokens, blocked_until = capacity, 0.0
+            else:
+                tokens, updated, blocked_until = row
+                tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+
+            if now < blocked_until:
+                wait = blocked_until - now
+            elif tokens >= 1.0:
+                wait = 0.0
+                if take:
+                    tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / rate
+
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (model, tokens, updated, blocked_until)"
+                " VALUES (?, ?, ?, ?)",
+                (model, tokens, now, blocked_until),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            # BEGIN itself may have failed (database locked); keep its error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return wait, tokens
+
+    def remaining(self, model):
+        """(seconds until a token is free, tokens in the bucket) without taking one."""
+        return self._update(model, take=False)
+
+    def reserve(self, model):
+        """Take a token if one is free; otherwise return seconds to wait."""
+        wait, _ = self._update(model, take=True)
+        # Jitter keeps concurrent processes from waking in lockstep
+        return wait + random.uniform(0, 0.25) * self.time_scale if wait else 0.0
+
+    def acquire(self, model):
+        """Block until a request to ``model`` is allowed. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self.reserve(model)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def backoff(self, model, error, attempt):
+        """Pause ``model`` for everyone after a rate-limit error.
+
+        Uses the server's Retry-After hint when present, jittered exponential
+        backoff otherwise. Returns the delay that was applied.
+        """
+        hint = retry_after(error)
+        if hint is not None:
+            delay = hint + random.uniform(0, 1) * self.time_scale
+        else:
+            delay = backoff_delay(attempt) * self.time_scale
+        until = time.time() + delay
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO buckets (model, tokens, updated, blocked_until)"
+                " VALUES (?, 0, ?, ?)"
+                " ON CONFLICT(model) DO UPDATE SET"
+                " tokens = 0, updated = excluded.updated,"
+                " blocked_until = MAX(blocked_until, excluded.blocked_until)",
+                (model, time.time(), until),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            # BEGIN itself may have failed (database locked); keep its error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return delay
@@ -0,0 +1,133 @@
+"""
+Encode-once reference images for generation requests.
+
+Reference images (the bus, the logo, video start frames) are read from disk
+once per run and the resulting bytes are reused for every request and retry
+that needs them. When no transform is requested the original file bytes are
+sent unchanged; with ``max_side`` set, larger images are downscaled once to
+that size before upload. For requests that must stay small (Batch API
+inline requests), ``as_uploaded_part`` uploads the bytes once through the
+Files API and refers to them by URI.
+"""
+
+import io
+import mimetypes
+import struct
+import threading
+from pathlib import Path
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _png_size(path):
+    """(width, height) from a PNG's IHDR chunk, or None for other formats."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if len(header) == 24 and header.startswith(_PNG_SIGNATURE) and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    return None
+
+
+class ReferenceAsset:
+    """One reference file, read (and optionally downscaled) exactly once."""
+
+    def __init__(self, path, max_side=None):
+        self.path = Path(path)
+        self.max_side = max_side
+        self._lock = threading.Lock()
+        self._data = None
+        self._mime_type = None
+        self._part = None
+        self._image = None
+        self._uploaded = None
+
+    def _load(self):
+        size = _png_size(self.path)
+        if size is None and self.max_side:
+            from PIL import Image
+            with Image.open(self.path) as image:
+                size = image.size
+
+        if not self.max_side or max(size) <= self.max_side:
+            # Pass the original bytes through untouched
+            self._data = self.path.read_bytes()
+            self._mime_type = mimetypes.guess_type(self.path.name)[0] or "image/png"
+            return
+
+        from PIL import Image
+        with Image.open(self.path) as image:
+            if image.mode == "P":
+                # Indexed (palette-quantized) images only resize with NEAREST
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", optimize=True)
+        self._data = buffer.getvalue()
+        self._mime_type = "image/png"
+
+    @property
+    def data(self):
+        with self._lock:
+            if self._data is None:
+                self._load()
+            return self._data
+
+    @property
+    def mime_type(self):
+        self.data
+        return self._mime_type
+
+    def as_part(self):
+        """``types.Part`` for ``generate_content`` contents (built once)."""
+        with self._lock:
+            cached = self._part
+        if cached is None:
+            from google.genai import types
+            cached = types.Part.from_bytes(data=self.data, mime_type=self.mime_type)
+            with self._lock:
+                self._part = cached
+        return cached
+
+    def as_uploaded_part(self, client):
+        """``types.Part`` pointing at a Files API upload (uploaded once).
+
+        Uploaded files expire server-side after 48 hours, far longer than a run.
+        """
+        with self._lock:
+            cached = self._uploaded
+        if cached is None:
+            from google.genai import types
+            uploaded = client.files.upload(
+                file=io.BytesIO(self.data),
+                config=types.UploadFileConfig(
+                    mime_type=self.mime_type, display_name=self.path.name,
+                ),
+            )
+            cached = types.Part.from_uri(file_uri=uploaded.uri, mime_type=self.mime_type)
+            with self._lock:
+                self._uploaded = cached
+        return cached
+
+    def as_image(self):
+        """``types.Image`` for ``generate_videos(image=...)`` (built once)."""
+        with self._lock:
+            cached = self._image
+        if cached is None:
+            from google.genai import types
+            cached = types.Image(image_bytes=self.data, mime_type=self.mime_type)
+            with self._lock:
+                self._image = cached
+        return cached
+
+
+def load_reference(path, max_side=None):
+    """Shared ``ReferenceAsset`` for ``path`` (one instance per run)."""
+    key = (str(Path(path).resolve()), max_side)
+    with _registry_lock:
+        asset = _registry.get(key)
+        if asset is None:
+            asset = _registry[key] = ReferenceAsset(path, max_side)
+        return asset
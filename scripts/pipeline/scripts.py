@@ -0,0 +1,29 @@
+"""
+Import the generation scripts as modules.
+
+The scripts have hyphenated filenames (``generate-batch.py``), so they cannot
+be imported with a plain ``import``. ``load_script`` loads one by name, once,
+so orchestration scripts can reuse its specs and functions.
+"""
+
+import importlib.util
+import sys
+
+from .paths import SCRIPTS_DIR
+
+
+def load_script(name):
+    """Load ``scripts/<name>.py`` as a module (cached in ``sys.modules``)."""
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
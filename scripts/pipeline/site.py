@@ -0,0 +1,38 @@
+"""
+Files the site reads: URL paths under ``public/`` and the JSON manifests in
+``src/lib`` that the post-processing stages write for it.
+
+A site manifest is a plain JSON object keyed by public path, written with
+sorted keys so reruns that change nothing leave the file byte-identical.
+"""
+
+import json
+from pathlib import Path
+
+from .output import write_atomic
+from .paths import PROJECT_ROOT
+
+PUBLIC_DIR = PROJECT_ROOT / "public"
+SITE_LIB_DIR = PROJECT_ROOT / "src" / "lib"
+
+
+def public_path(path):
+    """URL path for a file under ``public/``."""
+    return "/" + Path(path).relative_to(PUBLIC_DIR).as_posix()
+
+
+def file_for(public):
+    """File under ``public/`` for a URL path."""
+    return PUBLIC_DIR / public.lstrip("/")
+
+
+def load_site_manifest(path):
+    if Path(path).exists():
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_site_manifest(entries, path):
+    data = json.dumps(dict(sorted(entries.items())), indent=2)
+    write_atomic(path, (data + "\n").encode())
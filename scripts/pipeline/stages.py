@@ -0,0 +1,34 @@
+"""
+The post-generation stages the batch scripts run after a batch.
+
+``--quantize``, ``--transcode`` and ``--fingerprint`` run in that order
+(fingerprints cover the quantized images and the rebuilt renditions). They
+only touch files on disk, so they run without an API key when nothing is
+left to generate. Images the quantizer refuses are not failures.
+"""
+
+from .fingerprint import fingerprint_all
+
+
+def run_stages(quantize=False, transcode=False, fingerprint=False):
+    """Run the requested stages. Returns the names that failed."""
+    failed = []
+    # Imported only when asked for; they pull in the process pool machinery
+    if quantize:
+        from .palette import quantize_all
+
+        print("\nQuantizing images to the brand palette...")
+        failed.extend(quantize_all()[3])
+    if transcode:
+        from .transcode import transcode_all
+
+        print("\nTranscoding videos...")
+        try:
+            failed.extend(transcode_all()[2])
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            failed.append("transcode")
+    if fingerprint:
+        print("\nFingerprinting assets...")
+        fingerprint_all()
+    return failed
@@ -0,0 +1,245 @@
+"""
+Web-ready renditions of the Veo clips in ``public/videos``.
+
+Each source clip is transcoded with ffmpeg into a ladder of renditions (H.264
+with faststart for universal playback, plus VP9 or AV1 WebM for smaller
+files), audio is stripped from clips that only ever play as muted loops, and a
+small WebP poster is cut from the first frame. Outputs go to
+``public/videos/web/`` and are described in ``src/lib/video-renditions.json``
+for the site to build ``<source>`` lists from.
+
+Each manifest entry records the source SHA-256 and the settings used, so
+unchanged clips are skipped.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .fingerprint import is_fingerprinted
+from .manifest import file_digest
+from .output import clean_partial, open_atomic, write_atomic
+from .paths import VIDEOS_DIR
+from .site import SITE_LIB_DIR, file_for, load_site_manifest, public_path, save_site_manifest
+
+WEB_DIR = VIDEOS_DIR / "web"
+SITE_MANIFEST = SITE_LIB_DIR / "video-renditions.json"
+
+# Encoder settings per codec. CRF values come from CRF_LADDER.
+CODECS = {
+    "h264": {
+        "ext": "mp4",
+        "type": 'video/mp4; codecs="avc1.640028"',
+        "video": ["-c:v", "libx264", "-preset", "slow", "-pix_fmt", "yuv420p",
+                  "-movflags", "+faststart"],
+        "audio": ["-c:a", "aac", "-b:a", "96k"],
+    },
+    "vp9": {
+        "ext": "webm",
+        "type": 'video/webm; codecs="vp9"',
+        "video": ["-c:v", "libvpx-vp9", "-b:v", "0", "-row-mt", "1", "-deadline", "good",
+                  "-pix_fmt", "yuv420p"],
+        "audio": ["-c:a", "libopus", "-b:a", "64k"],
+    },
+    "av1": {
+        "ext": "webm",
+        "type": 'video/webm; codecs="av01.0.05M.08"',
+        "video": ["-c:v", "libaom-av1", "-b:v", "0", "-cpu-used", "6", "-row-mt", "1",
+                  "-pix_fmt", "yuv420p"],
+        "audio": ["-c:a", "libopus", "-b:a", "64k"],
+    },
+}
+
+# Renditions to produce: codec -> CRF values, best quality first
+CRF_LADDER = {
+    "h264": (23, 28),
+    "vp9": (36,),
+}
+
+# Clips whose soundtrack is actually played; everything else is a muted loop
+KEEP_AUDIO = set()
+
+POSTER_WIDTH = 640
+POSTER_QUALITY = 70
+
+
+def parse_ladder(spec):
+    """Parse ``"h264:23/28,vp9:36"`` into a CRF ladder dict."""
+    ladder = {}
+    for item in filter(None, spec.split(",")):
+        codec, _, crfs = item.partition(":")
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec {codec!r} (choose from {', '.join(CODECS)})")
+        ladder[codec] = tuple(int(c) for c in crfs.split("/") if c)
+    return ladder
+
+
+def settings_hash(ladder, keep_audio):
+    encoded = json.dumps({
+        "ladder": {codec: list(crfs) for codec, crfs in ladder.items()},
+        "codecs": {codec: CODECS[codec] for codec in ladder},
+        "keep_audio": keep_audio,
+        "poster": [POSTER_WIDTH, POSTER_QUALITY],
+    }, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def _ffmpeg(*args):
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args],
+        check=True, capture_output=True,
+    )
+
+
+def _transcode(source, target, codec, crf, keep_audio):
+    settings = CODECS[codec]
+    audio = settings["audio"] if keep_audio else ["-an"]
+    # The temp name ends in TEMP_SUFFIX, so name the muxer instead of letting
+    # ffmpeg guess it from the extension
+    with open_atomic(target) as f:
+        _ffmpeg("-i", str(source), *settings["video"], "-crf", str(crf), *audio,
+                "-f", settings["ext"], f.name)
+
+
+def _poster(source, target):
+    """Compress the clip's first frame into a small WebP poster."""
+    from PIL import Image
+
+    frame = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(source),
+         "-frames:v", "1", "-vf", f"scale={POSTER_WIDTH}:-2",
+         "-f", "image2pipe", "-c:v", "png", "-"],
+        check=True, capture_output=True,
+    ).stdout
+    with Image.open(io.BytesIO(frame)) as image:
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="WEBP", quality=POSTER_QUALITY, method=6)
+        size = image.size
+    write_atomic(target, buffer.getvalue())
+    return size
+
+
+def transcode_clip(source, ladder, keep_audio, settings):
+    """Produce every rendition and the poster for one clip (worker process).
+
+    Returns the manifest entry for the clip.
+    """
+    source = Path(source)
+    WEB_DIR.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "source": file_digest(source),
+        "settings": settings,
+        "audio": keep_audio,
+        "renditions": [],
+    }
+
+    for codec, crfs in ladder.items():
+        for crf in crfs:
+            target = WEB_DIR / f"{source.stem}.{codec}.crf{crf}.{CODECS[codec]['ext']}"
+            _transcode(source, target, codec, crf, keep_audio)
+            entry["renditions"].append({
+                "path": public_path(target),
+                "type": CODECS[codec]["type"],
+                "codec": codec,
+                "crf": crf,
+                "bytes": target.stat().st_size,
+            })
+
+    poster = WEB_DIR / f"{source.stem}.poster.webp"
+    width, height = _poster(source, poster)
+    entry["poster"] = {
+        "path": public_path(poster),
+        "width": width,
+        "height": height,
+        "bytes": poster.stat().st_size,
+    }
+    return entry
+
+
+def _entry_files(entry):
+    paths = [r["path"] for r in entry.get("renditions", [])]
+    if entry.get("poster"):
+        paths.append(entry["poster"]["path"])
+    return [file_for(p) for p in paths]
+
+
+def is_current(entry, source, settings):
+    if not entry or entry.get("settings") != settings:
+        return False
+    if entry.get("source") != file_digest(source):
+        return False
+    return all(path.exists() for path in _entry_files(entry))
+
+
+def transcode_all(sources=None, ladder=None, keep_audio=(), workers=None, force=False):
+    """Bring renditions of ``sources`` (default: every MP4) up to date.
+
+    Returns (built, skipped, failed) lists of clip names.
+    """
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("ffmpeg not found on PATH (install it, e.g. `brew install ffmpeg`)")
+
+    clean_partial(WEB_DIR)
+    ladder = ladder or CRF_LADDER
+    keep_audio = set(keep_audio) | KEEP_AUDIO
+    all_sources = sorted(s for s in VIDEOS_DIR.glob("*.mp4") if not is_fingerprinted(s))
+    sources = [Path(s) for s in sources] if sources else all_sources
+    entries = load_site_manifest(SITE_MANIFEST)
+
+    # Drop entries (and files) for clips that no longer exist
+    live = {public_path(s) for s in all_sources}
+    for key in [k for k in entries if k not in live]:
+        for path in _entry_files(entries.pop(key)):
+            path.unlink(missing_ok=True)
+
+    todo, skipped = [], []
+    for source in sources:
+        settings = settings_hash(ladder, source.stem in keep_audio)
+        if not force and is_current(entries.get(public_path(source)), source, settings):
+            skipped.append(source.name)
+        else:
+            todo.append((source, settings))
+
+    built, failed = [], []
+    if todo:
+        # ffmpeg threads internally, so a couple of clips at a time saturates most machines
+        workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(transcode_clip, source, ladder, source.stem in keep_audio, settings): source
+                for source, settings in todo
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    entry = future.result()
+                except subprocess.CalledProcessError as e:
+                    print(f"  ✗ {source.name}: ffmpeg failed: {e.stderr.decode(errors='replace').strip()}")
+                    failed.append(source.name)
+                    continue
+                except Exception as e:
+                    print(f"  ✗ {source.name}: {e}")
+                    failed.append(source.name)
+                    continue
+
+                old = entries.get(public_path(source))
+                if old:
+                    keep = set(_entry_files(entry))
+                    for path in _entry_files(old):
+                        if path not in keep:
+                            path.unlink(missing_ok=True)
+                entries[public_path(source)] = entry
+
+                smallest = min(r["bytes"] for r in entry["renditions"])
+                print(f"  ✓ {source.name}: {len(entry['renditions'])} renditions "
+                      f"(smallest {smallest / 1024:.0f} KB, was {source.stat().st_size / 1024:.0f} KB), "
+                      f"poster {entry['poster']['bytes'] / 1024:.0f} KB")
+                built.append(source.name)
+
+    save_site_manifest(entries, SITE_MANIFEST)
+    return built, skipped, failed
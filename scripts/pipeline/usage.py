@@ -0,0 +1,134 @@
+"""
+Which assets in ``public/images`` and ``public/videos`` the site actually uses.
+
+``scan_sources`` indexes every ``"/images/..."`` and ``"/videos/..."`` string in
+the TypeScript and TSX under ``src/`` (query strings dropped), data modules in
+``src/lib`` included. Tests and comment lines are skipped; their paths are
+examples.
+Template literals such as ``/videos/case-${study.id}.mp4`` become glob patterns
+(``/videos/case-*.mp4``) that match every file they could name.
+
+``usage_report`` cross-references the index with the files on disk and the
+generation specs (``IMAGES_TO_GENERATE``, ``VIDEOS``):
+
+- referenced: files the site points at;
+- missing: references that match no file;
+- orphaned: files nothing references and no spec produces or reads. Other
+  tools and docs may still use them, so ``prune`` only deletes the ones it
+  is given by name;
+- unused specs: spec outputs nothing references. These are reported rather
+  than pruned, since the next batch would only regenerate them; drop the
+  spec to stop paying for them.
+
+Images a spec reads (the reference images, video start frames) count as used.
+Only the logical files are considered: web renditions and fingerprinted
+names follow their source and are cleaned up by their stages.
+"""
+
+import fnmatch
+import re
+from pathlib import Path
+
+from .fingerprint import EXTENSIONS, is_fingerprinted
+from .paths import IMAGES_DIR, PROJECT_ROOT, VIDEOS_DIR
+from .site import file_for, public_path
+
+SOURCE_DIRS = (PROJECT_ROOT / "src",)
+SOURCE_PATTERNS = ("*.ts", "*.tsx")
+
+REFERENCE = re.compile(r"""["'`](/(?:images|videos)/[^"'`?#\n]+?)[?#"'`]""")
+TEMPLATE_FIELD = re.compile(r"\$\{[^}]*\}")
+COMMENT = ("//", "/*", "*")
+
+
+def scan_sources(source_dirs=SOURCE_DIRS):
+    """Index of public path (or glob pattern) -> ["file:line", ...]."""
+    index = {}
+    for directory in source_dirs:
+        for pattern in SOURCE_PATTERNS:
+            for source in sorted(Path(directory).rglob(pattern)):
+                if "__tests__" in source.parts or ".test." in source.name:
+                    continue
+                location = source.relative_to(PROJECT_ROOT).as_posix()
+                for number, line in enumerate(source.read_text().splitlines(), 1):
+                    if line.lstrip().startswith(COMMENT):
+                        continue
+                    for match in REFERENCE.finditer(line):
+                        path = TEMPLATE_FIELD.sub("*", match.group(1))
+                        index.setdefault(path, []).append(f"{location}:{number}")
+    return index
+
+
+def site_assets():
+    """Public paths of the logical assets on disk."""
+    return sorted(
+        public_path(path)
+        for directory in (IMAGES_DIR, VIDEOS_DIR)
+        for path in directory.iterdir()
+        if path.is_file() and path.suffix in EXTENSIONS
+        and not path.name.startswith(".") and not is_fingerprinted(path)
+    )
+
+
+def spec_outputs(image_specs, video_specs):
+    """Public path -> spec kind, for every asset the batch scripts generate."""
+    outputs = {public_path(IMAGES_DIR / filename): "image" for filename, *_ in image_specs}
+    for video in video_specs:
+        outputs[public_path(VIDEOS_DIR / f"{video['name']}.mp4")] = "video"
+    return outputs
+
+
+def spec_inputs(input_images, video_specs):
+    """Public path -> what reads it, for images the specs take as input."""
+    inputs = {public_path(path): "reference image" for path in input_images}
+    for video in video_specs:
+        if video.get("start_frame"):
+            inputs.setdefault(
+                public_path(IMAGES_DIR / video["start_frame"]), f"start frame of {video['name']}"
+            )
+    return inputs
+
+
+def usage_report(index, assets, outputs, inputs):
+    """Cross-reference the source index with the assets and specs.
+
+    Returns a dict of ``referenced`` (path -> locations), ``missing``
+    (reference -> locations, for references no file on disk satisfies),
+    ``orphaned`` and ``unused_specs`` (lists of public paths).
+    """
+    # Spec outputs not generated yet can still be referenced
+    candidates = sorted(set(assets) | set(outputs))
+    on_disk = set(assets)
+    referenced, missing = {}, {}
+    for reference, locations in index.items():
+        matches = fnmatch.filter(candidates, reference) if "*" in reference else (
+            [reference] if reference in candidates else []
+        )
+        if not on_disk.intersection(matches):
+            missing[reference] = locations
+        for path in matches:
+            referenced.setdefault(path, []).extend(locations)
+
+    return {
+        "referenced": referenced,
+        "missing": missing,
+        "orphaned": [
+            path for path in assets
+            if path not in referenced and path not in outputs and path not in inputs
+        ],
+        "unused_specs": sorted(
+            path for path in outputs if path not in referenced and path not in inputs
+        ),
+    }
+
+
+def prune(paths):
+    """Delete the given public paths. Returns the ones removed."""
+    removed = []
+    for path in paths:
+        try:
+            file_for(path).unlink()
+        except FileNotFoundError:
+            continue
+        removed.append(path)
+    return removed
@@ -0,0 +1,247 @@
+"""
+Lease-based job queue so several batch processes can share one spec.
+
+Without it, two copies of a batch script see the same missing files and pay
+for the same assets twice. With a queue (``--queue PATH`` or
+``GENAI_QUEUE_DB``, a SQLite file on storage every worker can reach), a
+worker must claim a job before sending its first request:
+
+- ``claim`` gives the job to this worker under a lease of ``lease_seconds``.
+  Jobs already leased to a live worker, or already done with the same job
+  key, are refused, so each asset is paid for once. A done job whose output
+  file has since been deleted is claimed again.
+- While a job is held, a background thread renews its lease (heartbeat).
+  A worker that dies stops renewing, and once the lease runs out any other
+  worker can reclaim the job.
+- ``complete`` marks a job done; ``release`` hands it back after a failure.
+  A job that has failed ``max_attempts`` times is left alone for
+  ``failed_expiry`` seconds (``JobFailed``, which callers count as a
+  failure), then claimed again with its attempts reset.
+- Veo operation names are stored with the job (``attach``), so a worker that
+  reclaims a video from a dead one re-attaches to the running operation
+  instead of submitting it again.
+
+A changed spec (new job key) resets the job, like the manifest does.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_LEASE = 120
+DEFAULT_MAX_ATTEMPTS = 3
+
+# How long a job that used up its attempts stays failed before it is retried
+DEFAULT_FAILED_EXPIRY = 15 * 60
+
+
+class JobTaken(Exception):
+    """Another worker holds the job or has finished it."""
+
+
+class JobFailed(JobTaken):
+    """The job failed ``max_attempts`` times recently; not retried yet."""
+
+
+class WorkQueue:
+    """Jobs keyed by (kind, name), leased to one worker at a time."""
+
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 worker=None, failed_expiry=DEFAULT_FAILED_EXPIRY):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.failed_expiry = failed_expiry
+        self.worker = worker or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " kind TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " job_key TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " owner TEXT,"
+                " lease_until REAL NOT NULL DEFAULT 0,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " operation TEXT,"
+                " updated REAL NOT NULL,"
+                " PRIMARY KEY (kind, name))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _transaction(self, statements):
+        """Run ``statements(conn)`` inside BEGIN IMMEDIATE; returns its result."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            result = statements(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            # BEGIN itself may have failed (database locked); keep its error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def claim(self, kind, name, key, output=None):
+        """Lease job ``name`` to this worker.
+
+        ``output`` is the file the job produces; a done job is claimed again
+        if it is missing. Returns the Veo operation another worker attached
+        and left running (or None; this worker knows its own). Raises
+        JobTaken if the job is not ours to run, JobFailed if it recently
+        used up its attempts.
+        """
+        def statements(conn):
+            now = time.time()
+            row = conn.execute(
+                "SELECT job_key, status, owner, lease_until, attempts, operation, updated"
+                " FROM jobs WHERE kind = ? AND name = ?",
+                (kind, name),
+            ).fetchone()
+            if row is None or row[0] != key:
+                # New job, or the spec changed since it was queued
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs"
+                    " (kind, name, job_key, status, owner, lease_until, attempts, operation, updated)"
+                    " VALUES (?, ?, ?, ?, ?, ?, 0, NULL, ?)",
+                    (kind, name, key, LEASED, self.worker, now + self.lease_seconds, now),
+                )
+                return None
+
+            _, status, owner, lease_until, attempts, operation, updated = row
+            if status == DONE and (output is None or Path(output).exists()):
+                raise JobTaken(f"{name} was already generated by {owner}")
+            if status == FAILED and now - updated < self.failed_expiry:
+                raise JobFailed(f"{name} failed {attempts} times, not retrying "
+                                f"for {(updated + self.failed_expiry - now) / 60:.0f} min")
+            if status == LEASED and owner != self.worker and lease_until > now:
+                raise JobTaken(f"{name} is being generated by {owner}")
+            if status == LEASED and owner != self.worker:
+                print(f"  Reclaiming {name} from {owner} (lease expired)")
+            if status in (DONE, FAILED):
+                # Output deleted, or the failures are old: start over
+                attempts, operation = 0, None
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, attempts = ?,"
+                " operation = ?, updated = ? WHERE kind = ? AND name = ?",
+                (LEASED, self.worker, now + self.lease_seconds, attempts, operation, now, kind, name),
+            )
+            return operation if owner != self.worker else None
+
+        operation = self._transaction(statements)
+        with self._lock:
+            self._held.add((kind, name))
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(
+                    target=self._renew_leases, name="workqueue-heartbeat", daemon=True,
+                )
+                self._heartbeat.start()
+        return operation
+
+    def attach(self, kind, name, operation):
+        """Store the operation running for a held job, for whoever reclaims it."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET operation = ?, updated = ? WHERE kind = ? AND name = ? AND owner = ?",
+                (operation, time.time(), kind, name, self.worker),
+            )
+
+    def complete(self, kind, name):
+        """Mark a held job done."""
+        self._finish(kind, name, DONE, failed=False)
+
+    def release(self, kind, name, failed=True):
+        """Hand a held job back; ``failed`` counts it towards ``max_attempts``."""
+        self._finish(kind, name, PENDING, failed)
+
+    def _finish(self, kind, name, status, failed):
+        def statements(conn):
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE kind = ? AND name = ? AND owner = ?",
+                (kind, name, self.worker),
+            ).fetchone()
+            if row is None:
+                return
+            attempts = row[0] + (1 if failed else 0)
+            final = FAILED if status == PENDING and attempts >= self.max_attempts else status
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, lease_until = 0,"
+                " operation = CASE WHEN ? THEN NULL ELSE operation END, updated = ?"
+                " WHERE kind = ? AND name = ?",
+                (final, attempts, final != PENDING or failed, time.time(), kind, name),
+            )
+
+        with self._lock:
+            self._held.discard((kind, name))
+        self._transaction(statements)
+
+    def _renew_leases(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                held = list(self._held)
+            if not held:
+                continue
+            now = time.time()
+            with self._connect() as conn:
+                for kind, name in held:
+                    renewed = conn.execute(
+                        "UPDATE jobs SET lease_until = ?, updated = ?"
+                        " WHERE kind = ? AND name = ? AND owner = ? AND status = ?",
+                        (now + self.lease_seconds, now, kind, name, self.worker, LEASED),
+                    ).rowcount
+                    if not renewed:
+                        print(f"  Warning: lost the lease on {name} to another worker")
+                        with self._lock:
+                            self._held.discard((kind, name))
+
+    def counts(self):
+        """{status: number of jobs} across the queue."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self):
+        """Stop heartbeats and hand back anything still held (without a failure)."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        with self._lock:
+            held = list(self._held)
+        for kind, name in held:
+            self.release(kind, name, failed=False)
+
+
+def open_queue(path=None):
+    """``WorkQueue`` at ``path`` (or ``GENAI_QUEUE_DB``); None when neither is set."""
+    path = path or os.environ.get("GENAI_QUEUE_DB")
+    if not path:
+        return None
+    return WorkQueue(path, lease_seconds=float(os.environ.get("GENAI_QUEUE_LEASE", DEFAULT_LEASE)))
+
+
+def add_queue_argument(parser):
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        default=None,
+        help="Share the batch with other workers through this SQLite job queue "
+             "(on storage every worker can reach; default: $GENAI_QUEUE_DB, or no queue)",
+    )
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Rewrite the images in public/images as indexed 8-bit brand-palette PNGs.
+
+Near-brand colours are snapped to the exact brand hex values and the rest
+get an adaptive palette (see pipeline/palette.py). Images that would lose
+too much (PSNR below --min-psnr) are reported as refused and left
+untouched; refusals do not fail the run. The results, refusals included,
+are recorded in .cache/genai/manifests/palette.json, so only images that changed
+since the last run are processed.
+
+Requirements:
+    pip install -U "Pillow>=11.3" numpy
+
+Usage:
+    python scripts/quantize-images.py [--workers N] [--force] [--min-psnr DB] [image.png ...]
+"""
+
+import argparse
+
+from pipeline.palette import MIN_PSNR, SNAP_DISTANCE, quantize_all
+from pipeline.paths import IMAGES_DIR
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Quantize images to the brand palette.")
+    parser.add_argument("images", nargs="*", help="Image filenames to process (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--min-psnr", type=float, default=MIN_PSNR,
+                        help=f"Refuse results below this PSNR in dB (default: {MIN_PSNR})")
+    parser.add_argument("--snap-distance", type=float, default=SNAP_DISTANCE,
+                        help="Snap colours this close (RGB distance) to a brand colour "
+                             f"(default: {SNAP_DISTANCE})")
+    parser.add_argument("--force", action="store_true", help="Redo images already quantized")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sources = [IMAGES_DIR / name for name in args.images]
+    missing = [s.name for s in sources if not s.exists()]
+    if missing:
+        print(f"Error: Image(s) not found: {', '.join(missing)}")
+        return 1
+
+    print("Quantizing images to the brand palette...")
+    quantized, skipped, refused, failed = quantize_all(
+        sources or None, workers=args.workers, force=args.force,
+        snap_distance=args.snap_distance, min_psnr=args.min_psnr,
+    )
+
+    print(f"\n{'='*50}")
+    print(f"Quantized: {len(quantized)}, up to date: {len(skipped)}, "
+          f"refused: {len(refused)}, failed: {len(failed)}")
+    if refused:
+        print(f"Refused (kept as is): {', '.join(sorted(refused))}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The pipeline package lives next to the scripts, which are not installed
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep rate limits, journals and poll history out of the real state directory
+os.environ["GENAI_STATE_DIR"] = tempfile.mkdtemp(prefix="genai-tests-")
+os.environ.pop("GENAI_METRICS_TEXTFILE", None)
+os.environ.pop("GENAI_QUEUE_DB", None)
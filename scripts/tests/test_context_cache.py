@@ -0,0 +1,66 @@
+import time
+
+from google.genai import types
+
+from pipeline.context_cache import SharedContext, shared_lines, strip_lines
+from pipeline.fake_genai import FakeClient, _server_error
+from pipeline.keypool import KeyPool
+from pipeline.ratelimit import RateLimiter
+
+MODEL = "gemini-2.5-flash-image"
+PARTS = [types.Part(text="reference")]
+
+
+def recording(client):
+    """Record the caches calls ``client`` receives as (method, name)."""
+    calls = []
+    for method in ("update", "delete"):
+        original = getattr(client.caches, method)
+
+        def record(name, config=None, method=method, original=original):
+            calls.append((method, name))
+            return original(name=name, config=config)
+
+        setattr(client.caches, method, record)
+    return calls
+
+
+def test_shared_lines_are_the_requirements_every_prompt_repeats():
+    prompts = ["Bus\n- flat vector\n- thick outlines\n- cream", "Van\n- thick outlines\n- flat vector"]
+    assert shared_lines(prompts) == ["- flat vector", "- thick outlines"]
+    assert strip_lines(prompts[0], shared_lines(prompts)) == "Bus\n- cream"
+
+
+def test_the_ttl_is_extended_until_the_run_ends_then_the_cache_is_deleted():
+    client = FakeClient("instant")
+    calls = recording(client)
+    with SharedContext(client, MODEL, PARTS, ttl_seconds=0.02) as shared:
+        time.sleep(0.1)
+    assert set(calls[:-1]) == {("update", shared.name)}
+    assert len(calls) > 2 and calls[-1] == ("delete", shared.name)
+
+
+def test_requests_go_inline_when_the_cache_cannot_be_created():
+    client = FakeClient("instant")
+
+    def unavailable(model, config=None):
+        raise _server_error()
+
+    client.caches.create = unavailable
+    with SharedContext(client, MODEL, PARTS) as shared:
+        assert shared.name is None
+
+
+def test_a_key_pool_refreshes_and_deletes_every_key_s_copy(tmp_path):
+    pool = KeyPool(["key-a", "key-b"], RateLimiter(tmp_path / "ratelimit.sqlite"),
+                   client_factory=lambda key: FakeClient("instant", api_key=key))
+    calls = [recording(key.client) for key in pool.keys]
+    with SharedContext(pool, MODEL, PARTS, ttl_seconds=0.02):
+        time.sleep(0.1)
+    assert not pool._replicas
+    names = []
+    for key_calls in calls:
+        assert {method for method, _ in key_calls} == {"update", "delete"} and key_calls[-1][0] == "delete"
+        names.append({name for _, name in key_calls})
+    # Each key only ever touched its own copy
+    assert all(len(key_names) == 1 for key_names in names) and names[0] != names[1]
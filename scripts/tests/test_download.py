@@ -0,0 +1,104 @@
+import io
+
+import pytest
+from google.genai import types
+
+from pipeline import download
+from pipeline.download import probe_mp4, save_video
+from pipeline.errors import IncompleteDownloadError
+from pipeline.fake_genai import canned_mp4
+
+
+def probe(data):
+    return probe_mp4(io.BytesIO(data), len(data))
+
+
+def test_probe_reads_the_duration():
+    assert probe(canned_mp4(duration=8.0)) == 8.0
+
+
+@pytest.mark.parametrize("data, message", [
+    (canned_mp4()[:-100], "runs past the end"),
+    (canned_mp4()[:4], "Truncated box header"),
+    (b"\x00\x00\x00\x08free" + canned_mp4(), "no leading ftyp"),
+    (b"\x00" * 64, "No valid box"),
+])
+def test_probe_rejects_truncated_or_malformed_files(data, message):
+    with pytest.raises(IncompleteDownloadError, match=message):
+        probe(data)
+
+
+class DroppingFiles:
+    """Files API stand-in that cuts the first transfer short."""
+
+    def __init__(self, data, cut):
+        self.data, self.cut, self.ranges = data, cut, []
+
+    def download(self, file, destination, config=None):
+        start = int(((config or {}).get("http_options") or {}).get("headers", {})
+                    .get("Range", "bytes=0-")[len("bytes="):].rstrip("-"))
+        self.ranges.append(start)
+        if len(self.ranges) == 1:
+            destination.write(self.data[:self.cut])
+            raise ConnectionResetError("Connection reset by peer")
+        destination.write(self.data[start:])
+
+
+class Client:
+    def __init__(self, files):
+        self.files = files
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(download, "RETRY_DELAY", 0)
+
+
+def test_a_dropped_transfer_resumes_from_the_last_byte(tmp_path):
+    data = canned_mp4(duration=4.0)
+    files = DroppingFiles(data, cut=1000)
+    path = save_video(Client(files), types.Video(uri="https://fake.invalid/v.mp4"), tmp_path / "v.mp4",
+                      duration=4)
+    assert files.ranges == [0, 1000]
+    assert path.read_bytes() == data
+
+
+def test_a_truncated_clip_never_replaces_the_file(tmp_path):
+    path = tmp_path / "v.mp4"
+    path.write_bytes(b"previous clip")
+    video = types.Video(video_bytes=canned_mp4()[:-100])
+    with pytest.raises(IncompleteDownloadError):
+        save_video(Client(None), video, path, attempts=2)
+    assert path.read_bytes() == b"previous clip"
+    assert [p.name for p in tmp_path.iterdir()] == ["v.mp4"]
+
+
+def test_a_clip_of_the_wrong_length_is_rejected(tmp_path):
+    video = types.Video(video_bytes=canned_mp4(duration=4.0))
+    with pytest.raises(IncompleteDownloadError, match="expected 8s"):
+        save_video(Client(None), video, tmp_path / "v.mp4", duration=8)
+
+
+class InMemoryFiles:
+    """Files API of an SDK that returns the clip instead of streaming it."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def download(self, file):
+        return self.data
+
+
+def test_sdks_without_streaming_download_in_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "_sdk_streams", lambda: False)
+    data = canned_mp4(duration=4.0)
+    path = save_video(Client(InMemoryFiles(data)), types.Video(uri="https://fake.invalid/v.mp4"),
+                      tmp_path / "v.mp4", duration=4)
+    assert path.read_bytes() == data
+
+
+def test_a_type_error_from_the_download_is_not_swallowed(tmp_path):
+    # A bug in the call must not be mistaken for an old SDK
+    with pytest.raises(TypeError):
+        save_video(Client(InMemoryFiles(canned_mp4())), types.Video(uri="https://fake.invalid/v.mp4"),
+                   tmp_path / "v.mp4")
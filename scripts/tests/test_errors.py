@@ -0,0 +1,43 @@
+import pytest
+
+from pipeline.errors import (
+    FATAL,
+    FILTERED,
+    REJECTED,
+    RETRYABLE,
+    BatchEntryError,
+    ContentFilteredError,
+    EmptyResponseError,
+    GenerationError,
+    IncompleteDownloadError,
+    RejectedOutputError,
+    classify,
+)
+from pipeline.fake_genai import _auth_error, _not_found, _rate_limit_error, _server_error
+
+
+@pytest.mark.parametrize("error, kind", [
+    (_rate_limit_error(1.0), RETRYABLE),
+    (_server_error(), RETRYABLE),
+    (TimeoutError("read timed out"), RETRYABLE),
+    (ConnectionResetError("reset by peer"), RETRYABLE),
+    (EmptyResponseError("no image"), RETRYABLE),
+    (IncompleteDownloadError("truncated"), RETRYABLE),
+    (BatchEntryError(503, "overloaded"), RETRYABLE),
+    (ContentFilteredError("IMAGE_SAFETY"), FILTERED),
+    (BatchEntryError(400, "Blocked: PROHIBITED_CONTENT"), FILTERED),
+    (RejectedOutputError("Failed QA"), REJECTED),
+    (_auth_error(), FATAL),
+    (_not_found("operations/1"), FATAL),
+    (BatchEntryError(403, "permission denied"), FATAL),
+    (BatchEntryError(409, "conflict"), FATAL),
+    (KeyError("inline_data"), FATAL),
+    (TypeError("unexpected keyword argument"), FATAL),
+    (ValueError("malformed response"), FATAL),
+])
+def test_classify(error, kind):
+    assert classify(error) == kind
+
+
+def test_classify_keeps_the_class_of_a_job_that_gave_up():
+    assert classify(GenerationError("gave up", FILTERED)) == FILTERED
@@ -0,0 +1,52 @@
+import functools
+import json
+
+import pytest
+
+from pipeline import fingerprint, site
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def public(tmp_path, monkeypatch):
+    public = tmp_path / "public"
+    (public / "images").mkdir(parents=True)
+    (public / "videos").mkdir()
+    monkeypatch.setattr(site, "PUBLIC_DIR", public)
+    monkeypatch.setattr(fingerprint, "IMAGES_DIR", public / "images")
+    monkeypatch.setattr(fingerprint, "VIDEOS_DIR", public / "videos")
+    monkeypatch.setattr(fingerprint, "SITE_MANIFEST", tmp_path / "asset-manifest.json")
+    retired = tmp_path / "fingerprints.json"
+    monkeypatch.setattr(fingerprint, "load_retired", functools.partial(fingerprint.load_retired, path=retired))
+    monkeypatch.setattr(fingerprint, "save_retired", functools.partial(fingerprint.save_retired, path=retired))
+    monkeypatch.setattr(fingerprint, "save_deploy_ignore", functools.partial(
+        fingerprint.save_deploy_ignore, path=tmp_path / ".vercelignore",
+    ))
+    return public
+
+
+def test_publish_retire_and_remove(public, tmp_path):
+    image = public / "images" / "hero.png"
+    image.write_bytes(b"first")
+    published, _, _ = fingerprint.fingerprint_all(now=0)
+    first = json.loads((tmp_path / "asset-manifest.json").read_text())["/images/hero.png"]
+    assert published == ["/images/hero.png"]
+    assert fingerprint.is_fingerprinted(first) and site.file_for(first).read_bytes() == b"first"
+    assert "/public/images/hero.png" in (tmp_path / ".vercelignore").read_text().splitlines()
+
+    # Regenerated: the old name stays published for the retention window
+    image.write_bytes(b"second, longer")
+    fingerprint.fingerprint_all(now=DAY)
+    second = json.loads((tmp_path / "asset-manifest.json").read_text())["/images/hero.png"]
+    assert second != first and site.file_for(first).exists()
+
+    assert fingerprint.fingerprint_all(now=DAY + fingerprint.RETENTION - 1)[2] == []
+    assert fingerprint.fingerprint_all(now=DAY + fingerprint.RETENTION) == ([], ["/images/hero.png"], [first])
+    assert not site.file_for(first).exists() and site.file_for(second).exists()
+
+
+def test_only_hashed_names_look_fingerprinted():
+    assert fingerprint.is_fingerprinted("hero-bus-animated.0a1b2c3d4e.mp4")
+    assert not fingerprint.is_fingerprinted("hero-bus-animated.mp4")
+    assert not fingerprint.is_fingerprinted("hero.h264.crf23.mp4")
@@ -0,0 +1,36 @@
+import time
+
+from pipeline import journal as journal_module
+from pipeline.journal import DONE, EXPIRED, FAILED, SAVED, OperationJournal
+
+
+def test_live_returns_the_newest_unsaved_operation(tmp_path):
+    journal = OperationJournal(tmp_path / "operations.sqlite")
+    assert journal.live("key") is None
+    journal.submitted("operations/1", "hero", "key")
+    journal.submitted("operations/2", "hero", "key")
+    journal.submitted("operations/3", "hero", "other key")
+    assert journal.live("key") == "operations/2"
+    # Finished but not saved yet: still worth re-attaching to
+    journal.update("operations/2", DONE)
+    assert journal.live("key") == "operations/2"
+
+
+def test_saved_failed_and_expired_operations_are_not_resumed(tmp_path):
+    journal = OperationJournal(tmp_path / "operations.sqlite")
+    for status in (SAVED, FAILED, EXPIRED):
+        journal.submitted(f"operations/{status}", "hero", status)
+        journal.update(f"operations/{status}", status)
+        assert journal.live(status) is None
+
+
+def test_operations_past_the_server_ttl_are_not_resumed(tmp_path, monkeypatch):
+    journal = OperationJournal(tmp_path / "operations.sqlite")
+    submitted = time.time() - journal_module.OPERATION_TTL - 60
+    monkeypatch.setattr(journal_module.time, "time", lambda: submitted)
+    journal.submitted("operations/old", "hero", "key")
+    monkeypatch.undo()
+    assert journal.live("key") is None
+    journal.prune(max_age=0)
+    with journal._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM operations").fetchone() == (0,)
@@ -0,0 +1,87 @@
+import pytest
+
+from pipeline.fake_genai import FakeClient, _rate_limit_error
+from pipeline.keypool import KeyPool
+from pipeline.ratelimit import RateLimiter
+
+MODEL = "gemini-2.5-flash-image"
+
+
+@pytest.fixture
+def pool(tmp_path):
+    limiter = RateLimiter(path=tmp_path / "ratelimit.sqlite")
+    return KeyPool(["key-a", "key-b"], limiter, client_factory=lambda key: FakeClient("instant", api_key=key))
+
+
+def requests_per_key(pool):
+    return [sum(kind == "request" for _, kind, _ in key.client.events) for key in pool.keys]
+
+
+def test_reserve_spreads_requests_over_the_keys(pool):
+    for _ in range(2):
+        assert pool.reserve(MODEL) == 0
+        pool.models.generate_content(model=MODEL, contents=["bus"])
+    assert requests_per_key(pool) == [1, 1]
+
+
+def test_backoff_blocks_only_the_rate_limited_key(pool):
+    pool.pin(pool.keys[0])
+    assert pool.backoff(MODEL, _rate_limit_error(60.0), 0) == 0
+    for _ in range(2):
+        if not pool.reserve(MODEL):
+            pool.models.generate_content(model=MODEL, contents=["bus"])
+    assert requests_per_key(pool)[0] == 0
+
+
+def test_pin_routes_a_helper_thread_to_the_reserved_key(pool):
+    pool.pin(pool.keys[1])
+    key = pool.pinned()
+    pool.pin(pool.keys[0])
+    pool.pin(key)
+    pool.models.generate_content(model=MODEL, contents=["bus"])
+    assert requests_per_key(pool) == [0, 1]
+
+
+def test_follow_up_calls_go_to_the_owning_key(pool):
+    pool.pin(pool.keys[1])
+    operation = pool.models.generate_videos(model="veo", prompt="bus")
+    pool.pin(pool.keys[0])
+    pool.operations.get(operation)
+    polls = [sum(kind == "poll" for _, kind, _ in key.client.events) for key in pool.keys]
+    assert polls == [0, 1]
+
+
+def test_each_key_reads_its_own_copy_of_a_context_cache(pool):
+    from google.genai import types
+
+    seen = []
+    for key in pool.keys:
+        generate = key.client.models.generate_content
+
+        def spy(model, contents, config=None, generate=generate, key=key):
+            seen.append((key.id, config.cached_content))
+            return generate(model=model, contents=contents, config=config)
+
+        key.client.models.generate_content = spy
+    cache = pool.caches.create(model=MODEL)
+    for _ in range(2):
+        assert pool.reserve(MODEL) == 0
+        pool.models.generate_content(
+            model=MODEL, contents=["bus"], config=types.GenerateContentConfig(cached_content=cache.name),
+        )
+    copies = pool._replicas[cache.name]
+    assert sorted(seen) == sorted(copies.items())
+    assert len(set(copies.values())) == 2
+    pool.caches.delete(cache.name)
+    assert cache.name not in pool._replicas
+
+
+def test_unknown_names_are_tried_against_every_key(pool):
+    operation = pool.keys[1].client.models.generate_videos(model="veo", prompt="bus")
+    assert pool.operations.get(operation).name == operation.name
+    assert pool._owner(operation.name) is pool.keys[1]
+
+
+def test_a_pool_needs_a_key():
+    with pytest.raises(ValueError):
+        KeyPool([])
@@ -0,0 +1,34 @@
+import json
+
+from pipeline.manifest import FRESH, MISSING, STALE, UNTRACKED, Manifest, job_key
+
+
+def test_status_follows_the_recorded_key(tmp_path):
+    manifest = Manifest(tmp_path / "images.json")
+    output = tmp_path / "hero.png"
+    key = job_key({"prompt": "The bus"})
+    assert manifest.status(output, key) == MISSING
+    output.write_bytes(b"png")
+    assert manifest.status(output, key) == UNTRACKED
+    manifest.record(output, key)
+    assert manifest.status(output, key) == FRESH
+    assert manifest.status(output, job_key({"prompt": "The bus at dusk"})) == STALE
+
+
+def test_record_keeps_what_other_processes_wrote(tmp_path):
+    path = tmp_path / "images.json"
+    first, second = Manifest(path), Manifest(path)
+    first.record(tmp_path / "a.png", "key-a")
+    second.record(tmp_path / "b.png", "key-b")
+    entries = json.loads(path.read_text())["entries"]
+    assert {name: entry["key"] for name, entry in entries.items()} == {"a.png": "key-a", "b.png": "key-b"}
+
+
+def test_job_key_covers_reference_bytes(tmp_path):
+    reference = tmp_path / "front.png"
+    reference.write_bytes(b"one")
+    before = job_key({"prompt": "The bus"}, {"reference": reference})
+    assert job_key({"prompt": "The bus"}, {"reference": reference}) == before
+    reference.write_bytes(b"two!")
+    assert job_key({"prompt": "The bus"}, {"reference": reference}) != before
+    assert job_key({"prompt": "The bus"}, {"reference": None}) != before
@@ -0,0 +1,58 @@
+import functools
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pipeline import palette
+from pipeline.palette import PaletteError, quantize_image
+
+
+def flat_art(path):
+    """Van Blue and Cream, a shade off, with a near-black outline."""
+    pixels = np.zeros((64, 64, 3), dtype=np.uint8)
+    pixels[:] = (0x2A, 0x70, 0xA8)
+    pixels[:32] = (0xF3, 0xF1, 0xD5)
+    pixels[30:34] = (10, 10, 12)
+    Image.fromarray(pixels).save(path)
+
+
+def noise(path):
+    pixels = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+
+
+def test_near_brand_colours_snap_to_the_exact_values(tmp_path):
+    path = tmp_path / "flat.png"
+    flat_art(path)
+    entry = quantize_image(path)
+    with Image.open(path) as image:
+        assert image.mode == "P"
+        colors = {rgb for _, rgb in image.convert("RGB").getcolors()}
+    assert colors == {(0x28, 0x72, 0xA6), (0xF5, 0xF0, 0xD7), (10, 10, 12)}
+    assert entry["bytes_after"] < entry["bytes_before"]
+
+
+def test_an_image_that_would_lose_too_much_is_refused_untouched(tmp_path):
+    path = tmp_path / "noise.png"
+    noise(path)
+    before = path.read_bytes()
+    with pytest.raises(PaletteError) as refused:
+        quantize_image(path)
+    assert refused.value.psnr < palette.MIN_PSNR
+    assert path.read_bytes() == before
+
+
+def test_refusals_are_remembered_and_not_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(palette, "IMAGES_DIR", tmp_path)
+    manifest = tmp_path / "palette.json"
+    monkeypatch.setattr(palette, "load_palette_manifest",
+                        functools.partial(palette.load_palette_manifest, path=manifest))
+    monkeypatch.setattr(palette, "save_palette_manifest",
+                        functools.partial(palette.save_palette_manifest, path=manifest))
+    flat_art(tmp_path / "flat.png")
+    noise(tmp_path / "noise.png")
+
+    assert palette.quantize_all(workers=1) == (["flat.png"], [], ["noise.png"], [])
+    # Neither is redone until it changes
+    assert palette.quantize_all(workers=1) == ([], ["flat.png"], ["noise.png"], [])
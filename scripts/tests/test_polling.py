@@ -0,0 +1,52 @@
+import pytest
+
+from pipeline.polling import (
+    DEFAULT_FIT, MAX_INTERVAL, MIN_INTERVAL, MIN_SAMPLES, PollHistory, PollPolicy, PollSchedule,
+)
+
+MODEL = "veo-3.1-generate-preview"
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PollHistory(tmp_path / "polls.sqlite")
+
+
+def test_history_falls_back_until_it_has_enough_samples(history):
+    for _ in range(MIN_SAMPLES - 1):
+        history.record(MODEL, 8, "720p", 60.0)
+    assert history.fit(MODEL, 8, "720p") == DEFAULT_FIT
+    history.record(MODEL, 8, "720p", 60.0)
+    median, sigma = history.fit(MODEL, 8, "720p")
+    assert median == pytest.approx(60.0)
+    # Other durations borrow the model's history
+    assert history.fit(MODEL, 4, "720p")[0] == pytest.approx(60.0)
+
+
+def test_a_schedule_stays_quiet_until_the_window_opens():
+    schedule = PollSchedule((100.0, 0.5), submitted=0.0)
+    assert schedule.due_at == pytest.approx(schedule.opens)
+    schedule.polled(10.0)
+    assert schedule.due_at == pytest.approx(schedule.opens)
+
+
+def test_polls_inside_the_window_are_bounded_and_back_off_past_it():
+    schedule = PollSchedule((100.0, 0.5), submitted=0.0)
+    schedule.polled(100.0)
+    assert MIN_INTERVAL <= schedule.due_at - 100.0 <= MAX_INTERVAL
+    intervals = []
+    for now in (300.0, 400.0, 500.0):
+        schedule.polled(now)
+        intervals.append(schedule.due_at - now)
+    assert intervals == sorted(intervals) and intervals[-1] <= MAX_INTERVAL
+
+
+def test_a_re_attached_operation_is_polled_at_once(history):
+    assert PollPolicy(history).schedule(MODEL, 8, "720p", submitted=5.0, quiet=False).due_at == 5.0
+
+
+def test_completions_are_recorded_in_unscaled_seconds(history):
+    policy = PollPolicy(history, time_scale=0.01)
+    for _ in range(MIN_SAMPLES):
+        policy.finished(MODEL, 8, "720p", 0.9)
+    assert history.fit(MODEL, 8, "720p")[0] == pytest.approx(90.0)
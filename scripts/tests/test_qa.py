@@ -0,0 +1,112 @@
+import io
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pipeline.errors import RejectedOutputError
+from pipeline.qa import ImageQA, VideoQA
+
+PROMPT = "The bus in Van Blue (#2872A6) on a cream background (#F5F0D7)"
+
+
+def illustration(body=(0x28, 0x72, 0xA6), background=(0xF5, 0xF0, 0xD7)):
+    """A 'bus' rectangle with an outline on a flat background."""
+    pixels = np.zeros((200, 300, 3), dtype=np.uint8)
+    pixels[:] = background
+    pixels[60:150, 50:250] = 0
+    pixels[64:146, 54:246] = body
+    return pixels
+
+
+def png(pixels):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def qa(tmp_path):
+    reference = tmp_path / "hero-bus-front.png"
+    reference.write_bytes(png(illustration()))
+    return ImageQA(reference, rejects_dir=tmp_path / "rejected")
+
+
+def test_an_on_brand_image_passes(qa):
+    report = qa.check("hero.png", png(illustration()), PROMPT)
+    assert report.passed and set(report.values) == {"background", "van_blue", "drift", "similarity"}
+
+
+def test_a_bus_in_the_wrong_colours_is_rejected_and_kept_for_review(qa, tmp_path):
+    data = png(illustration(body=(200, 30, 40), background=(30, 90, 40)))
+    with pytest.raises(RejectedOutputError):
+        qa.check("hero.png", data, PROMPT)
+    assert (tmp_path / "rejected" / "hero.png").read_bytes() == data
+    # A later pass clears the kept reject
+    qa.check("hero.png", png(illustration()), PROMPT)
+    assert not (tmp_path / "rejected" / "hero.png").exists()
+
+
+def test_the_score_ranks_candidates(qa):
+    good = qa.score(png(illustration()), PROMPT)
+    off = qa.score(png(illustration(body=(0x81, 0xB2, 0x9A))), PROMPT)
+    assert good.score > off.score
+    assert "van_blue" in off.failures
+
+
+def test_colour_checks_follow_the_prompt(qa):
+    assert set(qa.score(png(illustration()), "The bus").values) == {"drift", "similarity"}
+
+
+def clip_of(path, *frames):
+    """Clip showing each of ``frames`` (arrays) for a second."""
+    import subprocess
+
+    stills = []
+    for i, pixels in enumerate(frames):
+        stills.append(path.with_name(f"{path.stem}-{i}.png"))
+        Image.fromarray(pixels).save(stills[-1])
+    inputs = [arg for still in stills for arg in ("-loop", "1", "-t", "1", "-i", str(still))]
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", *inputs,
+         "-filter_complex", f"concat=n={len(stills)}:v=1:a=0", "-pix_fmt", "yuv420p", "-y", str(path)],
+        check=True,
+    )
+    return path
+
+
+video = pytest.mark.skipif(not shutil.which("ffmpeg"), reason="needs ffmpeg")
+
+
+@video
+def test_a_clip_that_starts_on_its_start_frame_passes(tmp_path):
+    start_frame = tmp_path / "start.png"
+    Image.fromarray(illustration()).save(start_frame)
+    clip = clip_of(tmp_path / "hero.mp4", illustration(), illustration())
+    assert VideoQA(rejects_dir=tmp_path / "rejected").check("hero", clip, start_frame).passed
+
+
+@video
+def test_a_clip_that_ignores_its_start_frame_is_resubmitted_or_flagged(tmp_path):
+    start_frame = tmp_path / "start.png"
+    Image.fromarray(illustration()).save(start_frame)
+    other = np.zeros((200, 300, 3), dtype=np.uint8)
+    other[::20] = 255
+    clip = clip_of(tmp_path / "hero.mp4", other, other)
+
+    with pytest.raises(RejectedOutputError):
+        VideoQA(rejects_dir=tmp_path / "rejected").check("hero", clip, start_frame)
+    assert (tmp_path / "rejected" / "hero.mp4").exists()
+
+    flagging = VideoQA(resubmit=False, rejects_dir=tmp_path / "flagged")
+    assert not flagging.check("hero", clip, start_frame).passed
+    assert "hero" in flagging.flagged
+
+
+@video
+def test_a_hard_cut_fails_the_change_check(tmp_path):
+    cut = illustration(body=(0, 0, 0), background=(255, 255, 255))
+    clip = clip_of(tmp_path / "cut.mp4", illustration(), cut)
+    report = VideoQA(rejects_dir=tmp_path / "rejected").score(clip)
+    assert set(report.values) == {"max_change"} and report.failures == ["max_change"]
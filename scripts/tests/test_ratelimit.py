@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+from pipeline.ratelimit import RateLimiter, budget_for, is_rate_limited, retry_after
+from pipeline.workqueue import WorkQueue
+
+
+def locked_out(target, path, monkeypatch):
+    """Make ``target`` give up at once on a database someone else is writing."""
+    monkeypatch.setattr(target, "_connect", lambda: sqlite3.connect(path, timeout=0, isolation_level=None))
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    return holder
+
+
+def test_a_failed_begin_surfaces_the_lock_error(tmp_path, monkeypatch):
+    path = tmp_path / "ratelimit.sqlite"
+    limiter = RateLimiter(path)
+    holder = locked_out(limiter, path, monkeypatch)
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        limiter.reserve("veo-3.1-generate-preview")
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        limiter.backoff("veo-3.1-generate-preview", Exception("429"), 0)
+    holder.rollback()
+
+
+def test_a_failed_begin_surfaces_the_lock_error_in_the_queue(tmp_path, monkeypatch):
+    path = tmp_path / "queue.sqlite"
+    queue = WorkQueue(path)
+    holder = locked_out(queue, path, monkeypatch)
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        queue.claim("image", "hero", "key")
+    holder.rollback()
+
+
+def test_requests_are_spaced_by_the_budget(tmp_path):
+    limiter = RateLimiter(tmp_path / "ratelimit.sqlite")
+    assert limiter.reserve("veo-3.1-generate-preview") == 0
+    # 2 RPM: the next token is 30 seconds away (plus jitter)
+    assert 29 < limiter.reserve("veo-3.1-generate-preview") < 31
+    assert limiter.reserve("gemini-2.5-flash-image") == 0
+
+
+def test_backoff_pauses_every_process_sharing_the_state(tmp_path):
+    path = tmp_path / "ratelimit.sqlite"
+    first, second = RateLimiter(path), RateLimiter(path)
+    error = Exception("429 RESOURCE_EXHAUSTED {'retryDelay': '40s'}")
+    assert is_rate_limited(error) and retry_after(error) == 40.0
+    assert 40 <= first.backoff("gemini-2.5-flash-image", error, 0) <= 41
+    assert second.reserve("gemini-2.5-flash-image") > 39
+    assert second.reserve("gemini-2.5-flash-image@key-b") == 0
+
+
+def test_budgets_can_be_overridden_per_model(monkeypatch):
+    monkeypatch.setenv("GENAI_RPM_VEO_3_1_GENERATE_PREVIEW", "4")
+    assert budget_for("veo-3.1-generate-preview@key-a") == 4.0
+    assert budget_for("some-new-model") == 10.0
@@ -0,0 +1,37 @@
+from pipeline import usage
+
+
+def test_scan_sources_reads_ts_and_tsx_but_not_tests_or_comments(tmp_path, monkeypatch):
+    monkeypatch.setattr(usage, "PROJECT_ROOT", tmp_path)
+    src = tmp_path / "src"
+    (src / "lib").mkdir(parents=True)
+    (src / "app").mkdir()
+    (src / "__tests__").mkdir()
+    (src / "lib" / "constants.ts").write_text(
+        'export const bus = "/images/hero-bus-back.png";\n'
+        "// e.g. \"/images/example.png\"\n"
+    )
+    (src / "app" / "page.tsx").write_text(
+        '<PreloadVideo src="/videos/hero.mp4?v=2" />\n'
+        "<video src={`/videos/case-${study.id}.mp4`} />\n"
+    )
+    (src / "__tests__" / "assets.test.ts").write_text('asset("/images/made-up.png");\n')
+
+    assert usage.scan_sources((src,)) == {
+        "/images/hero-bus-back.png": ["src/lib/constants.ts:1"],
+        "/videos/hero.mp4": ["src/app/page.tsx:1"],
+        "/videos/case-*.mp4": ["src/app/page.tsx:2"],
+    }
+
+
+def test_report_sorts_assets_into_referenced_orphaned_and_missing():
+    index = {"/images/a.png": ["page.tsx:1"], "/videos/case-*.mp4": ["page.tsx:2"],
+             "/images/gone.png": ["page.tsx:3"]}
+    assets = ["/images/a.png", "/images/b.png", "/images/frame.png", "/videos/case-1.mp4"]
+    report = usage.usage_report(
+        index, assets, {"/images/spec.png": "image"}, {"/images/frame.png": "start frame"},
+    )
+    assert sorted(report["referenced"]) == ["/images/a.png", "/videos/case-1.mp4"]
+    assert report["orphaned"] == ["/images/b.png"]
+    assert report["unused_specs"] == ["/images/spec.png"]
+    assert list(report["missing"]) == ["/images/gone.png"]
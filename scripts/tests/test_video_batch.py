@@ -0,0 +1,97 @@
+import pytest
+
+from pipeline.fake_genai import FakeClient, _auth_error
+from pipeline.journal import FAILED, OperationJournal
+from pipeline.manifest import Manifest
+from pipeline.metrics import RunMetrics
+from pipeline.polling import PollHistory, PollPolicy
+from pipeline.ratelimit import RateLimiter
+from pipeline.scripts import load_script
+from pipeline.workqueue import WorkQueue
+
+videos = load_script("generate-videos-batch")
+
+TIME_SCALE = 0.001
+
+
+class FilterFirst(FakeClient):
+    """Fake whose first video is blocked by the safety filter."""
+
+    def __init__(self):
+        super().__init__("instant", time_scale=TIME_SCALE)
+        generate_videos = self.models.generate_videos
+
+        def first_filtered(*args, **kwargs):
+            self.settings["filtered_rate"] = 1.0 if not self.submits else 0.0
+            self.submits += 1
+            return generate_videos(*args, **kwargs)
+
+        self.submits = 0
+        self.models.generate_videos = first_filtered
+
+
+class PollsRefused(FakeClient):
+    """Fake whose key is revoked once the video has been submitted."""
+
+    def __init__(self):
+        super().__init__("instant", time_scale=TIME_SCALE)
+
+        def refused(operation, config=None):
+            self.polls += 1
+            raise _auth_error()
+
+        self.polls = 0
+        self.operations.get = refused
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.setattr(videos, "VIDEOS_DIR", tmp_path)
+
+    def run(work_queue=None, client=None):
+        client = client or FilterFirst()
+        success, failed = videos.run_batch(
+            client, RateLimiter(tmp_path / "ratelimit.sqlite", time_scale=TIME_SCALE),
+            Manifest(tmp_path / "videos.json"), [{"name": "hero", "prompt": "The bus"}],
+            journal=OperationJournal(tmp_path / "operations.sqlite"),
+            metrics=RunMetrics("test"), work_queue=work_queue,
+            poller=PollPolicy(PollHistory(tmp_path / "polls.sqlite"), time_scale=TIME_SCALE),
+        )
+        return client, success, failed
+
+    return run
+
+
+def test_a_filtered_video_is_resubmitted(run, tmp_path):
+    client, success, failed = run()
+    assert (client.submits, success, failed) == (2, 1, [])
+    assert (tmp_path / "hero.mp4").exists()
+
+
+def test_a_filtered_video_is_resubmitted_under_a_work_queue(run, tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    client, success, failed = run(queue)
+    queue.close()
+    # Not re-attached to the filtered operation as if another worker left it
+    assert (client.submits, success, failed) == (2, 1, [])
+    assert queue.counts() == {"done": 1}
+
+
+def test_a_fatal_poll_error_gives_up_on_the_video(run, tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    client, success, failed = run(queue, PollsRefused())
+    queue.close()
+    assert (client.polls, success, failed) == (1, 0, ["hero"])
+    with OperationJournal(tmp_path / "operations.sqlite")._connect() as conn:
+        assert conn.execute("SELECT status FROM operations").fetchall() == [(FAILED,)]
+    assert queue.counts() == {"pending": 1}
+
+
+def test_an_interrupted_run_re_attaches_to_its_journalled_operation(run, tmp_path):
+    client = FakeClient("instant", time_scale=TIME_SCALE)
+    config = {"name": "hero", "prompt": "The bus"}
+    operation = client.models.generate_videos(model=videos.MODEL, prompt="The bus")
+    OperationJournal(tmp_path / "operations.sqlite").submitted(operation.name, "hero", videos.video_key(config))
+    _, success, failed = run(client=client)
+    submits = sum(kind == "request" and model == videos.MODEL for _, kind, model in client.events)
+    assert (submits, success, failed) == (1, 1, [])
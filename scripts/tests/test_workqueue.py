@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from pipeline.workqueue import DONE, FAILED, LEASED, JobFailed, JobTaken, WorkQueue
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "queue.sqlite"
+
+
+def worker(path, name, **kwargs):
+    queue = WorkQueue(path, worker=name, **kwargs)
+    queue._stop.set()  # No heartbeat: leases only move when a test says so
+    return queue
+
+
+def test_a_live_lease_is_refused(path):
+    a, b = worker(path, "a"), worker(path, "b")
+    a.claim("image", "logo.png", "k1")
+    with pytest.raises(JobTaken, match="being generated by a"):
+        b.claim("image", "logo.png", "k1")
+
+
+def test_an_expired_lease_is_reclaimed(path):
+    a, b = worker(path, "a", lease_seconds=0.05), worker(path, "b")
+    a.claim("video", "hero", "k1")
+    a.attach("video", "hero", "operations/42")
+    time.sleep(0.1)
+    # The new holder re-attaches to the running operation
+    assert b.claim("video", "hero", "k1") == "operations/42"
+    assert b.counts() == {LEASED: 1}
+
+
+def test_a_changed_job_key_resets_the_job(path):
+    a, b = worker(path, "a"), worker(path, "b")
+    a.claim("image", "logo.png", "k1")
+    a.complete("image", "logo.png")
+    assert b.claim("image", "logo.png", "k2") is None
+
+
+def test_a_done_job_is_reclaimed_when_its_output_is_missing(path, tmp_path):
+    output = tmp_path / "logo.png"
+    a, b = worker(path, "a"), worker(path, "b")
+    a.claim("image", "logo.png", "k1", output)
+    a.complete("image", "logo.png")
+    output.write_bytes(b"png")
+    with pytest.raises(JobTaken, match="already generated"):
+        b.claim("image", "logo.png", "k1", output)
+
+    output.unlink()
+    b.claim("image", "logo.png", "k1", output)
+    assert b.counts() == {LEASED: 1}
+
+
+def test_failed_jobs_are_refused_until_they_expire(path):
+    a = worker(path, "a", max_attempts=2, failed_expiry=0.1)
+    for _ in range(2):
+        a.claim("image", "logo.png", "k1")
+        a.release("image", "logo.png")
+    assert a.counts() == {FAILED: 1}
+
+    b = worker(path, "b", failed_expiry=0.1)
+    with pytest.raises(JobFailed, match="failed 2 times"):
+        b.claim("image", "logo.png", "k1")
+    time.sleep(0.15)
+    b.claim("image", "logo.png", "k1")
+    # The retry starts with a fresh attempt budget
+    b.release("image", "logo.png")
+    assert b.counts() == {"pending": 1}
+
+
+def test_close_hands_back_held_jobs_without_a_failure(path):
+    a = worker(path, "a")
+    a.claim("image", "logo.png", "k1")
+    a.close()
+    b = worker(path, "b")
+    b.claim("image", "logo.png", "k1")
+    b.complete("image", "logo.png")
+    assert b.counts() == {DONE: 1}
+
+
+def test_only_another_workers_operation_is_handed_back(path):
+    a, b = worker(path, "a"), worker(path, "b")
+    a.claim("video", "hero", "k1")
+    a.attach("video", "hero", "operations/7")
+    a.release("video", "hero", failed=False)
+    # This worker knows what it submitted; nothing to re-attach to
+    assert a.claim("video", "hero", "k1") is None
+    a.release("video", "hero", failed=False)
+    assert b.claim("video", "hero", "k1") == "operations/7"
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Transcode the clips in public/videos into web-ready renditions.
+
+Writes faststart H.264 and VP9/AV1 renditions at a CRF ladder plus a WebP
+poster per clip to public/videos/web/, and the manifest the site reads at
+src/lib/video-renditions.json. Audio is stripped unless a clip is listed with
+--keep-audio. Clips that have not changed since the last run are skipped.
+
+Requirements:
+    ffmpeg (with libx264, libvpx-vp9 and optionally libaom-av1) on PATH
+    pip install -U Pillow
+
+Usage:
+    python scripts/transcode-videos.py [--ladder h264:23/28,vp9:36] [--force] [clip.mp4 ...]
+"""
+
+import argparse
+
+from pipeline.paths import VIDEOS_DIR
+from pipeline.transcode import CRF_LADDER, parse_ladder, transcode_all
+
+DEFAULT_LADDER = ",".join(
+    f"{codec}:{'/'.join(map(str, crfs))}" for codec, crfs in CRF_LADDER.items()
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Transcode videos into web renditions.")
+    parser.add_argument("clips", nargs="*", help="Clip filenames to process (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Clips transcoded at once (default: half the CPUs)")
+    parser.add_argument("--ladder", default=DEFAULT_LADDER,
+                        help=f"codec:crf[/crf...] list (default: {DEFAULT_LADDER})")
+    parser.add_argument("--keep-audio", action="append", default=[], metavar="NAME",
+                        help="Keep the audio track for this clip (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        ladder = parse_ladder(args.ladder)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    sources = [VIDEOS_DIR / name for name in args.clips]
+    missing = [s.name for s in sources if not s.exists()]
+    if missing:
+        print(f"Error: Clip(s) not found: {', '.join(missing)}")
+        return 1
+
+    print("Transcoding videos...")
+    try:
+        built, skipped, failed = transcode_all(
+            sources or None, ladder=ladder, keep_audio=args.keep_audio,
+            workers=args.workers, force=args.force,
+        )
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"\n{'='*50}")
+    print(f"Transcoded: {len(built)}, up to date: {len(skipped)}, failed: {len(failed)}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
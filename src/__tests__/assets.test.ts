@@ -0,0 +1,25 @@
+import { describe, it, expect } from 'vitest';
+import { asset, type AssetManifest } from '@/lib/assets';
+
+const manifest: AssetManifest = {
+  '/images/hero-bus-front.png': '/images/hero-bus-front.3f9a1c2b4d.png',
+  '/videos/web/hero.h264.crf23.mp4': '/videos/web/hero.h264.crf23.0a1b2c3d4e.mp4',
+};
+
+describe('asset', () => {
+  it('resolves a logical path to its fingerprinted name', () => {
+    expect(asset('/images/hero-bus-front.png', manifest)).toBe('/images/hero-bus-front.3f9a1c2b4d.png');
+    expect(asset('/videos/web/hero.h264.crf23.mp4', manifest)).toBe(
+      '/videos/web/hero.h264.crf23.0a1b2c3d4e.mp4'
+    );
+  });
+
+  it('returns assets that were never fingerprinted unchanged', () => {
+    expect(asset('/images/unknown.png', manifest)).toBe('/images/unknown.png');
+    expect(asset('/videos/hero.mp4?v=2', manifest)).toBe('/videos/hero.mp4?v=2');
+  });
+
+  it('drops a cache-busting query once the asset is fingerprinted', () => {
+    expect(asset('/images/hero-bus-front.png?v=2', manifest)).toBe('/images/hero-bus-front.3f9a1c2b4d.png');
+  });
+});
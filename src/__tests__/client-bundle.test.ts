@@ -0,0 +1,28 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+
+const SRC = path.resolve(__dirname, '..');
+
+// Modules that read the asset or rendition manifests; importing them from a
+// client component would ship the JSON to every visitor
+const SERVER_ONLY = /^import\s+(?!type\b)[^;]*from\s+["']@\/lib\/(assets|video-renditions)["']/m;
+const MANIFEST = /from\s+["'][^"']*(asset-manifest|video-renditions)\.json["']/;
+
+function sourceFiles(dir: string): string[] {
+  return fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const file = path.join(dir, entry.name);
+    if (entry.isDirectory()) return entry.name === '__tests__' ? [] : sourceFiles(file);
+    return /\.tsx?$/.test(entry.name) ? [file] : [];
+  });
+}
+
+describe('client components', () => {
+  it('receive resolved asset paths instead of importing the manifests', () => {
+    const offenders = sourceFiles(SRC).filter((file) => {
+      const source = fs.readFileSync(file, 'utf8');
+      return /^["']use client["']/.test(source) && (SERVER_ONLY.test(source) || MANIFEST.test(source));
+    });
+    expect(offenders.map((file) => path.relative(SRC, file))).toEqual([]);
+  });
+});
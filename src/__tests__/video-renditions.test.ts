@@ -0,0 +1,56 @@
+import { describe, it, expect } from 'vitest';
+import {
+  getVideoPoster,
+  getVideoSources,
+  type VideoRenditionManifest,
+} from '@/lib/video-renditions';
+
+const manifest: VideoRenditionManifest = {
+  '/videos/hero.mp4': {
+    source: 'abc123',
+    settings: 'def456',
+    audio: false,
+    renditions: [
+      { path: '/videos/web/hero.h264.crf28.mp4', type: 'video/mp4', codec: 'h264', crf: 28, bytes: 100 },
+      { path: '/videos/web/hero.h264.crf23.mp4', type: 'video/mp4', codec: 'h264', crf: 23, bytes: 200 },
+      { path: '/videos/web/hero.vp9.crf36.webm', type: 'video/webm', codec: 'vp9', crf: 36, bytes: 90 },
+    ],
+    poster: { path: '/videos/web/hero.poster.webp', width: 640, height: 360, bytes: 9000 },
+  },
+};
+
+describe('getVideoSources', () => {
+  it('orders codecs by efficiency and picks the best quality by default', () => {
+    expect(getVideoSources('/videos/hero.mp4', 'high', manifest)).toEqual([
+      { src: '/videos/web/hero.vp9.crf36.webm', type: 'video/webm' },
+      { src: '/videos/web/hero.h264.crf23.mp4', type: 'video/mp4' },
+    ]);
+  });
+
+  it('picks the smallest rendition per codec for low quality', () => {
+    expect(getVideoSources('/videos/hero.mp4', 'low', manifest)[1]).toEqual({
+      src: '/videos/web/hero.h264.crf28.mp4',
+      type: 'video/mp4',
+    });
+  });
+
+  it('ignores query strings when looking up a clip', () => {
+    expect(getVideoSources('/videos/hero.mp4?v=2', 'high', manifest)).toHaveLength(2);
+  });
+
+  it('falls back to the original clip when not transcoded', () => {
+    expect(getVideoSources('/videos/other.mp4', 'high', manifest)).toEqual([
+      { src: '/videos/other.mp4', type: 'video/mp4' },
+    ]);
+  });
+});
+
+describe('getVideoPoster', () => {
+  it('returns the extracted poster path', () => {
+    expect(getVideoPoster('/videos/hero.mp4', manifest)).toBe('/videos/web/hero.poster.webp');
+  });
+
+  it('returns undefined for clips without a poster', () => {
+    expect(getVideoPoster('/videos/other.mp4', manifest)).toBeUndefined();
+  });
+});
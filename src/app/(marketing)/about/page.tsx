@@ -4,6 +4,7 @@ import Image from "next/image";
 import { Button } from "@/components/ui/button";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { Wrench, BarChart3, Sparkles, User } from "lucide-react";
+import { asset } from "@/lib/assets";
 
 export const metadata: Metadata = {
   title: "About",
@@ -29,7 +30,7 @@ export default function AboutPage() {
           </div>
           <div className="mx-auto mt-12 max-w-2xl">
             <Image
-              src="/images/about-team-bus.png"
+              src={asset("/images/about-team-bus.png")}
               alt="The AI Struggle Bus team - Multiple buses working together"
               width={800}
               height={450}
@@ -70,7 +71,7 @@ export default function AboutPage() {
             </div>
             <div>
               <Image
-                src="/images/about-origin.png"
+                src={asset("/images/about-origin.png")}
                 alt="The beginning of the AI Struggle Bus journey"
                 width={500}
                 height={500}
@@ -139,7 +140,7 @@ export default function AboutPage() {
           <div className="grid items-center gap-12 lg:grid-cols-2">
             <div className="order-2 lg:order-1 overflow-hidden rounded-2xl">
               <Image
-                src="/images/about-different.png"
+                src={asset("/images/about-different.png")}
                 alt="AI Struggle Bus taking a different route while others are stuck"
                 width={800}
                 height={533}
@@ -6,6 +6,7 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { ContactForm } from "@/components/forms/contact-form";
 import { Map, ClipboardList, DollarSign, Zap, Telescope, Handshake } from "lucide-react";
+import { asset } from "@/lib/assets";
 
 export const metadata: Metadata = {
   title: "AI Readiness Assessment",
@@ -39,7 +40,7 @@ export default function AssessmentPage() {
             </div>
             <div>
               <Image
-                src="/images/assessment-map.png"
+                src={asset("/images/assessment-map.png")}
                 alt="AI Struggle Bus with roadmap - Your path to AI success"
                 width={500}
                 height={500}
@@ -124,7 +125,7 @@ export default function AssessmentPage() {
           <div className="grid items-center gap-12 lg:grid-cols-2">
             <div>
               <Image
-                src="/images/quiz-compass.png"
+                src={asset("/images/quiz-compass.png")}
                 alt="AI Struggle Bus with compass helping navigate the right direction"
                 width={600}
                 height={400}
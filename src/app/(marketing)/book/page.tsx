@@ -2,6 +2,7 @@ import type { Metadata } from "next";
 import Image from "next/image";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { ContactForm } from "@/components/forms/contact-form";
+import { asset } from "@/lib/assets";
 
 export const metadata: Metadata = {
   title: "Book a Call",
@@ -46,7 +47,7 @@ export default function BookPage() {
             </div>
             <div>
               <Image
-                src="/images/book-phone.png"
+                src={asset("/images/book-phone.png")}
                 alt="AI Struggle Bus with open door, welcoming visitors"
                 width={500}
                 height={500}
@@ -4,6 +4,7 @@ import Image from "next/image";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { WavyDivider } from "@/components/ui/section-divider";
+import { asset } from "@/lib/assets";
 
 export const metadata: Metadata = {
   title: "Governance & Safety",
@@ -31,7 +32,7 @@ export default function GovernancePage() {
             </div>
             <div>
               <Image
-                src="/images/governance-shield.png"
+                src={asset("/images/governance-shield.png")}
                 alt="AI Struggle Bus with protective shield"
                 width={500}
                 height={500}
@@ -107,7 +108,7 @@ export default function GovernancePage() {
           <div className="grid items-center gap-12 lg:grid-cols-2">
             <div className="order-2 lg:order-1">
               <Image
-                src="/images/governance-data.png"
+                src={asset("/images/governance-data.png")}
                 alt="Secure data vault with data flowing safely"
                 width={600}
                 height={400}
@@ -1,10 +1,9 @@
-"use client";
-
 import Link from "next/link";
 import Image from "next/image";
 import { Button } from "@/components/ui/button";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { PreloadVideo } from "@/components/ui/preload-video";
+import { asset } from "@/lib/assets";
 
 const integrations = {
   ecommerce: [
@@ -223,7 +222,7 @@ export default function IntegrationsPage() {
           <div className="grid items-center gap-12 lg:grid-cols-2">
             <div className="order-2 lg:order-1">
               <Image
-                src="/images/integrations-flow.png"
+                src={asset("/images/integrations-flow.png")}
                 alt="Data flowing between tools through the AI Struggle Bus"
                 width={600}
                 height={400}
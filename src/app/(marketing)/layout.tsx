@@ -1,5 +1,6 @@
 import { Header } from "@/components/layout/header";
 import { Footer } from "@/components/layout/footer";
+import { asset } from "@/lib/assets";
 
 export default function MarketingLayout({
   children,
@@ -8,7 +9,7 @@ export default function MarketingLayout({
 }) {
   return (
     <div className="flex min-h-screen flex-col">
-      <Header />
+      <Header logoSrc={asset("/images/logo.png")} />
       <main className="flex-1">{children}</main>
       <Footer />
     </div>
@@ -5,6 +5,7 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { Ban, Flag, Video, Mail, BarChart3 } from "lucide-react";
+import { asset } from "@/lib/assets";
 
 export const metadata: Metadata = {
   title: "Resources",
@@ -61,7 +62,7 @@ export default function ResourcesPage() {
             </div>
             <div>
               <Image
-                src="/images/resource-quiz.png"
+                src={asset("/images/resource-quiz.png")}
                 alt="AI Struggle Bus with checklist and compass"
                 width={500}
                 height={500}
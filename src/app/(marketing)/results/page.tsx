@@ -1,11 +1,10 @@
-"use client";
-
 import Link from "next/link";
 import Image from "next/image";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { PreloadVideo } from "@/components/ui/preload-video";
+import { asset } from "@/lib/assets";
 
 const caseStudies = [
   {
@@ -100,7 +99,7 @@ export default function ResultsPage() {
           </div>
           <div className="mx-auto mt-12 max-w-2xl">
             <Image
-              src="/images/results-postcards.png"
+              src={asset("/images/results-postcards.png")}
               alt="Collection of postcards showing business success stories"
               width={800}
               height={450}
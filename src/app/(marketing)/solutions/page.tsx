@@ -4,6 +4,7 @@ import Image from "next/image";
 import { Button } from "@/components/ui/button";
 import { WavyDivider } from "@/components/ui/section-divider";
 import { ImagePlaceholder } from "@/components/sections/image-placeholder";
+import { asset } from "@/lib/assets";
 
 export const metadata: Metadata = {
   title: "Solutions",
@@ -94,7 +95,7 @@ export default function SolutionsPage() {
             </div>
             <div>
               <Image
-                src="/images/solution-marketing.png"
+                src={asset("/images/solution-marketing.png")}
                 alt="AI Struggle Bus with megaphone broadcasting content"
                 width={500}
                 height={500}
@@ -113,7 +114,7 @@ export default function SolutionsPage() {
           <div className="grid items-start gap-12 lg:grid-cols-2">
             <div className="order-2 lg:order-1">
               <Image
-                src="/images/solution-customer-service.png"
+                src={asset("/images/solution-customer-service.png")}
                 alt="AI Struggle Bus as a customer service station with headset"
                 width={500}
                 height={500}
@@ -238,7 +239,7 @@ export default function SolutionsPage() {
             </div>
             <div>
               <Image
-                src="/images/solution-operations.png"
+                src={asset("/images/solution-operations.png")}
                 alt="AI Struggle Bus with charts and dashboards - operations automation"
                 width={500}
                 height={500}
@@ -257,7 +258,7 @@ export default function SolutionsPage() {
           <div className="grid items-start gap-12 lg:grid-cols-2">
             <div className="order-2 lg:order-1">
               <Image
-                src="/images/solution-knowledge.png"
+                src={asset("/images/solution-knowledge.png")}
                 alt="AI Struggle Bus as a mobile library with books and documents"
                 width={500}
                 height={500}
@@ -382,7 +383,7 @@ export default function SolutionsPage() {
             </div>
             <div>
               <Image
-                src="/images/solution-product.png"
+                src={asset("/images/solution-product.png")}
                 alt="AI Struggle Bus with rocket boosters and blueprints"
                 width={500}
                 height={500}
@@ -401,7 +402,7 @@ export default function SolutionsPage() {
           <div className="grid items-start gap-12 lg:grid-cols-2">
             <div className="order-2 lg:order-1">
               <Image
-                src="/images/solution-rescue.png"
+                src={asset("/images/solution-rescue.png")}
                 alt="AI Struggle Bus as a tow truck helping another vehicle"
                 width={500}
                 height={500}
@@ -1,5 +1,3 @@
-"use client";
-
 import Link from "next/link";
 import Image from "next/image";
 import { Button } from "@/components/ui/button";
@@ -8,6 +6,7 @@ import { WavyDivider } from "@/components/ui/section-divider";
 import { ContactForm } from "@/components/forms/contact-form";
 import { PreloadVideo } from "@/components/ui/preload-video";
 import { Settings, BarChart3, Shield, BookOpen, Map, Handshake } from "lucide-react";
+import { asset } from "@/lib/assets";
 
 export default function SprintPage() {
   return (
@@ -253,7 +252,7 @@ export default function SprintPage() {
           <div className="grid items-center gap-12 lg:grid-cols-2">
             <div>
               <Image
-                src="/images/sprint-finish.png"
+                src={asset("/images/sprint-finish.png")}
                 alt="AI Struggle Bus crossing finish line with celebration"
                 width={600}
                 height={400}
@@ -1,6 +1,7 @@
 import type { Metadata } from "next";
 import { Poppins, Open_Sans } from "next/font/google";
 import { Analytics } from "@vercel/analytics/next";
+import { asset } from "@/lib/assets";
 import "./globals.css";
 
 const poppins = Poppins({
@@ -32,8 +33,8 @@ export const metadata: Metadata = {
   ],
   authors: [{ name: "The AI Struggle Bus" }],
   icons: {
-    icon: "/images/logo.png",
-    apple: "/images/logo.png",
+    icon: asset("/images/logo.png"),
+    apple: asset("/images/logo.png"),
   },
   openGraph: {
     type: "website",
@@ -45,7 +46,7 @@ export const metadata: Metadata = {
       "We help entrepreneurs, startups, and SMBs put AI to work behind the scenes. Embedded AI workflows that deliver measurable ROI in 30 days.",
     images: [
       {
-        url: "/images/og-image.png",
+        url: asset("/images/og-image.png"),
         width: 1200,
         height: 630,
         alt: "The AI Struggle Bus - Vintage VW bus with AI logo",
@@ -57,7 +58,7 @@ export const metadata: Metadata = {
     title: "The AI Struggle Bus | AI Workflows for Small Business",
     description:
       "We help entrepreneurs, startups, and SMBs put AI to work behind the scenes.",
-    images: ["/images/og-image.png"],
+    images: [asset("/images/og-image.png")],
   },
   robots: {
     index: true,
@@ -7,7 +7,12 @@ import { Button } from "@/components/ui/button";
 import { Sheet, SheetContent, SheetTrigger } from "@/components/ui/sheet";
 import { mainNavItems } from "@/lib/constants";
 
-export function Header() {
+interface HeaderProps {
+  /** Resolved logo path (the layout resolves it, keeping the asset manifest server-side) */
+  logoSrc: string;
+}
+
+export function Header({ logoSrc }: HeaderProps) {
   const [isOpen, setIsOpen] = useState(false);
 
   return (
@@ -15,7 +20,7 @@ export function Header() {
       <div className="container mx-auto flex h-16 items-center justify-between px-4">
         <Link href="/" className="flex items-center gap-3">
           <Image
-            src="/images/logo.png"
+            src={logoSrc}
             alt="AI Struggle Bus Logo"
             width={36}
             height={36}
@@ -67,7 +72,7 @@ export function Header() {
           <SheetContent side="right" className="w-[300px]">
             <div className="mb-6 flex items-center gap-3">
               <Image
-                src="/images/logo.png"
+                src={logoSrc}
                 alt="AI Struggle Bus Logo"
                 width={32}
                 height={32}
@@ -1,7 +1,6 @@
-"use client";
-
-import { useState, useRef, useEffect } from "react";
-import Image from "next/image";
+import { asset } from "@/lib/assets";
+import { getVideoPoster, getVideoSources } from "@/lib/video-renditions";
+import { PreloadVideoPlayer } from "@/components/ui/preload-video-player";
 
 interface PreloadVideoProps {
   src: string;
@@ -14,67 +13,19 @@ interface PreloadVideoProps {
   bgColor?: string;
 }
 
-export function PreloadVideo({
-  src,
-  poster,
-  alt,
-  width,
-  height,
-  className = "",
-  priority = false,
-  bgColor = "transparent",
-}: PreloadVideoProps) {
-  const [videoReady, setVideoReady] = useState(false);
-  const videoRef = useRef<HTMLVideoElement>(null);
-
-  useEffect(() => {
-    const video = videoRef.current;
-    if (video) {
-      video.load();
-
-      const handleCanPlay = () => {
-        setVideoReady(true);
-        video.play().catch(() => {
-          // Autoplay blocked, still show video
-          setVideoReady(true);
-        });
-      };
-
-      video.addEventListener("canplaythrough", handleCanPlay);
-      return () => video.removeEventListener("canplaythrough", handleCanPlay);
-    }
-  }, []);
-
+/**
+ * Video that shows its poster until it can play through. Resolves paths on
+ * the server: use it from server components only.
+ */
+export function PreloadVideo({ src, poster, ...props }: PreloadVideoProps) {
+  // Prefer transcoded renditions and the compressed poster when they exist,
+  // under their fingerprinted names once published
+  const sources = getVideoSources(src).map((source) => ({ ...source, src: asset(source.src) }));
   return (
-    <div
-      className={`relative overflow-hidden rounded-2xl ${className}`}
-      style={{ aspectRatio: `${width}/${height}`, backgroundColor: bgColor }}
-    >
-      {/* Static image shown until video is ready */}
-      <Image
-        src={poster}
-        alt={alt}
-        width={width}
-        height={height}
-        priority={priority}
-        className={`absolute inset-0 w-full h-full object-cover transition-opacity duration-300 ${
-          videoReady ? "opacity-0 pointer-events-none" : "opacity-100"
-        }`}
-      />
-      {/* Video preloaded and shown when ready - scaled slightly to crop black edges */}
-      <video
-        ref={videoRef}
-        loop
-        muted
-        playsInline
-        preload="auto"
-        className={`absolute inset-0 w-full h-full object-cover transition-opacity duration-300 ${
-          videoReady ? "opacity-100" : "opacity-0"
-        }`}
-        style={{ transform: "scale(1.04)" }}
-      >
-        <source src={src} type="video/mp4" />
-      </video>
-    </div>
+    <PreloadVideoPlayer
+      sources={sources}
+      poster={asset(getVideoPoster(src) ?? poster)}
+      {...props}
+    />
   );
 }
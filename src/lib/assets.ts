@@ -0,0 +1,26 @@
+/**
+ * Fingerprinted asset paths, published by scripts/fingerprint-assets.py.
+ *
+ * The manifest maps a logical public path (e.g. "/images/hero-bus-front.png")
+ * to a copy named after its content hash
+ * ("/images/hero-bus-front.3f9a1c2b4d.png"), which is served with
+ * `Cache-Control: immutable` (see next.config.ts). Assets without an entry
+ * have not been fingerprinted yet and are served from their logical path,
+ * with any cache-busting query the caller added; once an asset has an entry
+ * its hashed name replaces the query.
+ *
+ * Resolve in server components and pass the result to client components as
+ * a plain string; importing this module from a client component bundles the
+ * whole manifest into its JavaScript.
+ */
+
+import assetManifest from "./asset-manifest.json";
+
+export type AssetManifest = Record<string, string>;
+
+const defaultManifest = assetManifest as AssetManifest;
+
+/** Fingerprinted path for a public asset, or `src` unchanged. */
+export function asset(src: string, manifest: AssetManifest = defaultManifest): string {
+  return manifest[src.split("?")[0]] ?? src;
+}
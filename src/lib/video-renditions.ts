@@ -0,0 +1,86 @@
+/**
+ * Web renditions of the clips in public/videos, built by
+ * scripts/transcode-videos.py.
+ *
+ * The manifest maps a clip path (e.g. "/videos/hero-bus-animated.mp4") to its
+ * transcoded renditions and a compressed poster frame. Clips without an entry
+ * have not been transcoded yet and should be served from their original path.
+ * Like `@/lib/assets`, resolve in server components only.
+ */
+
+import videoRenditions from "./video-renditions.json";
+
+export type VideoCodec = "av1" | "vp9" | "h264";
+
+export interface VideoRendition {
+  path: string;
+  type: string;
+  codec: VideoCodec;
+  crf: number;
+  bytes: number;
+}
+
+export interface VideoPoster {
+  path: string;
+  width: number;
+  height: number;
+  bytes: number;
+}
+
+export interface VideoRenditionEntry {
+  source: string;
+  settings: string;
+  audio: boolean;
+  renditions: VideoRendition[];
+  poster?: VideoPoster;
+}
+
+export type VideoRenditionManifest = Record<string, VideoRenditionEntry>;
+
+export interface VideoSource {
+  src: string;
+  type: string;
+}
+
+const defaultManifest = videoRenditions as VideoRenditionManifest;
+
+// Most efficient codec first; browsers play the first <source> they support
+const CODEC_ORDER: VideoCodec[] = ["av1", "vp9", "h264"];
+
+// Manifest keys are bare paths; callers may add cache-busting queries
+function stripQuery(src: string): string {
+  return src.split("?")[0];
+}
+
+/**
+ * `<source>` list for a clip: one rendition per codec, ordered by efficiency.
+ * "high" picks each codec's lowest CRF, "low" its highest.
+ * Falls back to the original file when the clip has not been transcoded.
+ */
+export function getVideoSources(
+  src: string,
+  quality: "high" | "low" = "high",
+  manifest: VideoRenditionManifest = defaultManifest
+): VideoSource[] {
+  const entry = manifest[stripQuery(src)];
+  if (!entry?.renditions.length) return [{ src, type: "video/mp4" }];
+
+  const sources: VideoSource[] = [];
+  for (const codec of CODEC_ORDER) {
+    const renditions = entry.renditions
+      .filter((rendition) => rendition.codec === codec)
+      .sort((a, b) => a.crf - b.crf);
+    if (!renditions.length) continue;
+    const pick = quality === "high" ? renditions[0] : renditions[renditions.length - 1];
+    sources.push({ src: pick.path, type: pick.type });
+  }
+  return sources;
+}
+
+/** Compressed poster frame for a clip, if one has been extracted. */
+export function getVideoPoster(
+  src: string,
+  manifest: VideoRenditionManifest = defaultManifest
+): string | undefined {
+  return manifest[stripQuery(src)]?.poster?.path;
+}